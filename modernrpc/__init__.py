@@ -1,8 +1,10 @@
 from modernrpc.constants import Protocol
 from modernrpc.core import RpcRequestContext
+from modernrpc.files import FileResult
 from modernrpc.server import RpcNamespace, RpcServer
 
 __all__ = [
+    "FileResult",
     "Protocol",
     "RpcNamespace",
     "RpcRequestContext",
@@ -0,0 +1,113 @@
+import logging
+import timeit
+from collections.abc import Callable, Hashable, Sequence
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from modernrpc.config import settings
+from modernrpc.helpers import make_hashable
+from modernrpc.types import DictStrAny
+
+logger = logging.getLogger(__name__)
+
+# Special value for the "class" of a backend setting, to select the backend automatically
+AUTO_BACKEND = "auto"
+
+# Number of probe operations timed (3 times) for each candidate, when calibration is enabled
+CALIBRATION_NUMBER = 200
+
+# Dotted path of the backend selected for each (candidates, kwargs, calibration) combination. This way, the selection
+# is done only once per process, even when multiple servers (and so multiple handlers) are instantiated
+_selected_backends: dict[Hashable, str] = {}
+
+
+@dataclass(frozen=True)
+class BackendProbe:
+    """A representative operation, used to check the conformance of a candidate backend (and optionally time it)"""
+
+    # Run the operation on a backend instance
+    run: Callable[[Any], Any]
+    # Return True if the result of the operation is the expected one
+    check: Callable[[Any], bool]
+
+
+def load_backend(config: DictStrAny | str, candidates: Sequence[str], probe: BackendProbe) -> Any:
+    """
+    Instantiate the backend configured by a ``MODERNRPC_*_DESERIALIZER`` or ``MODERNRPC_*_SERIALIZER`` setting.
+
+    When the "class" of the setting (or the setting itself) is "auto", the backend is chosen among given candidates.
+    See select_backend() for details.
+    """
+    if isinstance(config, str):
+        config = {"class": config}
+
+    dotted_path: str = config["class"]
+    kwargs: DictStrAny = config.get("kwargs", {})
+    if dotted_path == AUTO_BACKEND:
+        dotted_path = select_backend(candidates, kwargs, probe)
+
+    return import_string(dotted_path)(**kwargs)
+
+
+def select_backend(candidates: Sequence[str], kwargs: DictStrAny, probe: BackendProbe) -> str:
+    """
+    Return the dotted path of the best backend among given candidates. Candidates which can't be imported (because
+    the corresponding library is not installed) or which don't pass conformance checks are ignored.
+
+    By default, the first remaining candidate is selected, so candidates must be sorted from the fastest to the
+    slowest. When MODERNRPC_BACKENDS_CALIBRATION is enabled, all remaining candidates are timed on the probe operation
+    and the fastest one is selected.
+    """
+    calibrate: bool = settings.MODERNRPC_BACKENDS_CALIBRATION
+    try:
+        key = (tuple(candidates), make_hashable(kwargs), calibrate)
+    except TypeError:
+        # Kwargs containing unhashable values (like sets) can't be part of the cache key, the selection is not cached
+        return _select_backend(candidates, kwargs, probe, calibrate)
+    if key not in _selected_backends:
+        _selected_backends[key] = _select_backend(candidates, kwargs, probe, calibrate)
+    return _selected_backends[key]
+
+
+def _select_backend(candidates: Sequence[str], kwargs: DictStrAny, probe: BackendProbe, calibrate: bool) -> str:
+    timings: dict[str, float] = {}
+
+    for dotted_path in candidates:
+        try:
+            backend = import_string(dotted_path)(**kwargs)
+        except ImportError:
+            logger.debug("Backend %s is not available, ignored", dotted_path)
+            continue
+        except TypeError:
+            logger.warning("Backend %s doesn't accept configured kwargs, ignored", dotted_path)
+            continue
+
+        try:
+            conform = probe.check(probe.run(backend))
+        except Exception:
+            conform = False
+        if not conform:
+            logger.warning("Backend %s doesn't pass conformance checks, ignored", dotted_path)
+            continue
+
+        if not calibrate:
+            logger.info("Backend %s auto-selected", dotted_path)
+            return dotted_path
+
+        runs = timeit.repeat(partial(probe.run, backend), number=CALIBRATION_NUMBER, repeat=3)
+        timings[dotted_path] = min(runs) / CALIBRATION_NUMBER
+
+    if not timings:
+        raise ImproperlyConfigured(f"Unable to auto-select a backend, none of these is available: {list(candidates)}")
+
+    selected = min(timings, key=timings.__getitem__)
+    logger.info(
+        "Backend %s auto-selected after calibration (%s)",
+        selected,
+        ", ".join(f"{dotted_path}: {duration * 1e6:.2f}µs" for dotted_path, duration in timings.items()),
+    )
+    return selected
@@ -0,0 +1,103 @@
+import io
+import json
+from collections.abc import Iterable
+from functools import cached_property
+from typing import Any
+
+import cbor2
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from modernrpc.exceptions import RPCMarshallingError, RPCParseError
+from modernrpc.jsonrpc.handler import JsonRpcRequest, JsonRpcResult, RawJSON
+from modernrpc.types import CustomKwargs
+
+
+def cbor_default(encoder: cbor2.CBOREncoder, obj: Any) -> None:
+    """
+    Encode objects not natively supported by cbor2. RawJSON content is parsed and encoded as any other value, other
+    types are converted like DjangoJSONEncoder does.
+    """
+    if isinstance(obj, RawJSON):
+        encoder.encode(json.loads(obj.data))
+    else:
+        encoder.encode(DjangoJSONEncoder().default(obj))
+
+
+def check_shared_containers(data: Any) -> None:
+    """
+    Raise ValueError when a list or a dict is found more than once in the given data. CBOR shared references (tags 28
+    and 29) can build cyclic structures, or structures exponentially larger once unmarshalled than the payload.
+    """
+    seen: set[int] = set()
+    pending = [data]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, list | dict):
+            if id(value) in seen:
+                raise ValueError("shared references are not supported")
+            seen.add(id(value))
+            pending.extend(value.values() if isinstance(value, dict) else value)
+
+
+class Cbor2Deserializer:
+    """cbor-rpc deserializer based on the third-party cbor2 library"""
+
+    def __init__(
+        self,
+        unmarshaller_klass="modernrpc.jsonrpc.backends.marshalling.Unmarshaller",
+        unmarshaller_kwargs: CustomKwargs = None,
+        load_kwargs: CustomKwargs = None,
+    ):
+        self.unmarshaller_klass = import_string(unmarshaller_klass)
+        self.unmarshaller_kwargs = unmarshaller_kwargs or {}
+
+        self.load_kwargs = load_kwargs or {}
+
+    @cached_property
+    def unmarshaller(self):
+        return self.unmarshaller_klass(**self.unmarshaller_kwargs)
+
+    def loads(self, data: bytes) -> JsonRpcRequest | list[JsonRpcRequest]:
+        stream = io.BytesIO(data)
+        try:
+            structured_data = cbor2.CBORDecoder(stream, **self.load_kwargs).decode()
+            check_shared_containers(structured_data)
+        except (cbor2.CBORDecodeError, ValueError) as exc:
+            raise RPCParseError(str(exc), data=exc) from exc
+
+        # Unlike cbor2.loads(), ensure the whole payload is a single data item
+        if stream.tell() != len(data):
+            raise RPCParseError(f"extra data after the request, at offset {stream.tell()}")
+
+        return self.unmarshaller.dict_to_request(structured_data)
+
+
+class Cbor2Serializer:
+    """cbor-rpc serializer based on the third-party cbor2 library"""
+
+    def __init__(
+        self,
+        marshaller_klass="modernrpc.jsonrpc.backends.marshalling.Marshaller",
+        marshaller_kwargs: CustomKwargs = None,
+        dump_kwargs: CustomKwargs = None,
+    ):
+        self.marshaller_klass = import_string(marshaller_klass)
+        self.marshaller_kwargs = marshaller_kwargs or {}
+
+        self.dump_kwargs = dump_kwargs or {}
+        # Naive datetimes are considered to be in the default time zone
+        self.dump_kwargs.setdefault("timezone", timezone.get_default_timezone())
+        self.dump_kwargs.setdefault("default", cbor_default)
+
+    @cached_property
+    def marshaller(self):
+        return self.marshaller_klass(**self.marshaller_kwargs)
+
+    def dumps(self, result: JsonRpcResult | Iterable[JsonRpcResult]) -> bytes:
+        structured_data = self.marshaller.result_to_dict(result)
+        try:
+            return cbor2.dumps(structured_data, **self.dump_kwargs)
+        except (cbor2.CBOREncodeError, TypeError, ValueError) as exc:
+            raise RPCMarshallingError(structured_data, exc) from exc
@@ -0,0 +1,26 @@
+from typing import ClassVar
+
+import cbor2
+
+from modernrpc.jsonrpc.handler import BinaryJsonRpcHandler, build_binary_probes
+
+# Representative data used to check (and calibrate) candidate backends, when a backend setting is "auto"
+DESERIALIZER_PROBE, SERIALIZER_PROBE = build_binary_probes(cbor2.dumps, cbor2.loads)
+
+
+class CborRpcHandler(BinaryJsonRpcHandler):
+    """
+    CBOR RPC handler. Requests and responses follow JSON-RPC 2.0 semantics (including batch requests and
+    notifications), but are encoded with CBOR (RFC 8949) instead of JSON.
+    """
+
+    valid_content_types: ClassVar[list[str]] = ["application/cbor"]
+    response_content_type = "application/cbor"
+
+    # Backends considered when MODERNRPC_CBOR_DESERIALIZER or MODERNRPC_CBOR_SERIALIZER is "auto"
+    deserializer_setting = "MODERNRPC_CBOR_DESERIALIZER"
+    serializer_setting = "MODERNRPC_CBOR_SERIALIZER"
+    deserializer_candidates: ClassVar[list[str]] = ["modernrpc.cbor.backends.cbor2.Cbor2Deserializer"]
+    serializer_candidates: ClassVar[list[str]] = ["modernrpc.cbor.backends.cbor2.Cbor2Serializer"]
+    deserializer_probe = DESERIALIZER_PROBE
+    serializer_probe = SERIALIZER_PROBE
@@ -4,7 +4,35 @@ MODERNRPC_DEFAULT_ENCODING = "utf-8"
 # Possible values are: '', 'rst' or 'md'
 MODERNRPC_DOC_FORMAT = ""
 
+# Default values of RpcServer async_multicall and multicall_workers arguments
 MODERNRPC_XMLRPC_ASYNC_MULTICALL = False
+MODERNRPC_XMLRPC_MULTICALL_WORKERS = 1
+
+# Default value of RpcServer max_request_size argument: maximum size of request bodies, in bytes. Can be set for each
+# content type using a dict ("*" key applies to other content types). None disables the limit
+MODERNRPC_MAX_REQUEST_SIZE = None
+
+# Request bodies larger than this size (in bytes), or sent without Content-Length, are written to a temporary file and
+# parsed from a memory-mapped buffer instead of being loaded in memory. Only applies to JSON-RPC and XML-RPC handlers.
+# None disables spooling
+MODERNRPC_SPOOL_REQUEST_BODY_SIZE = None
+
+# Maximum number of JSON-RPC batch calls executed concurrently by the async view, when the configured deserializer
+# parses batch requests incrementally. Also applies to calls sent to the NDJSON handler
+MODERNRPC_JSON_BATCH_WINDOW_SIZE = 50
+
+# Number of items serialized at once when the result of a generator procedure is streamed
+MODERNRPC_STREAMED_RESULT_CHUNK_SIZE = 100
+
+# Validity duration (in seconds) of URLs sent to clients when a procedure returns a FileResult
+MODERNRPC_FILE_RESULT_MAX_AGE = 300
+
+# Directory containing all files returned by procedures as FileResult. It must be set to return such results
+MODERNRPC_FILE_RESULT_ROOT = None
+
+# When a backend setting is "auto", time all available backends at startup and select the fastest one, instead of
+# selecting the first available backend in a predefined order
+MODERNRPC_BACKENDS_CALIBRATION = False
 
 # List of handler classes used by default in any ``RpcServer`` instance
 MODERNRPC_HANDLERS = [
@@ -16,3 +44,7 @@ MODERNRPC_XML_DESERIALIZER = {"class": "modernrpc.xmlrpc.backends.xmlrpc.PythonX
 MODERNRPC_XML_SERIALIZER = {"class": "modernrpc.xmlrpc.backends.xmlrpc.PythonXmlRpcSerializer", "kwargs": {}}
 MODERNRPC_JSON_DESERIALIZER = {"class": "modernrpc.jsonrpc.backends.json.PythonJsonDeserializer", "kwargs": {}}
 MODERNRPC_JSON_SERIALIZER = {"class": "modernrpc.jsonrpc.backends.json.PythonJsonSerializer", "kwargs": {}}
+MODERNRPC_MSGPACK_DESERIALIZER = {"class": "modernrpc.msgpack.backends.msgpack.MsgpackDeserializer", "kwargs": {}}
+MODERNRPC_MSGPACK_SERIALIZER = {"class": "modernrpc.msgpack.backends.msgpack.MsgpackSerializer", "kwargs": {}}
+MODERNRPC_CBOR_DESERIALIZER = {"class": "modernrpc.cbor.backends.cbor2.Cbor2Deserializer", "kwargs": {}}
+MODERNRPC_CBOR_SERIALIZER = {"class": "modernrpc.cbor.backends.cbor2.Cbor2Serializer", "kwargs": {}}
@@ -1,6 +1,7 @@
 from enum import Enum, Flag, auto
 
 SYSTEM_NAMESPACE_DOTTED_PATH = "modernrpc.system_procedures.system"
+ASYNC_SYSTEM_NAMESPACE_DOTTED_PATH = "modernrpc.system_procedures.async_system"
 
 
 class Protocol(Flag):
@@ -78,6 +78,9 @@ class ProcedureWrapper:
         protocol: Protocol = Protocol.ALL,
         auth: AuthPredicateType = NOT_SET,
         context_target: str | None = None,
+        idempotent: bool = False,
+        cacheable: bool = False,
+        cache_control: str | None = None,
     ) -> None:
         # Store the reference to the registered function
         self.func_or_coro = func_or_coro
@@ -87,6 +90,9 @@ class ProcedureWrapper:
         self.name: str = name or func_name
         self.protocol = protocol
         self.context_target = context_target
+        self.idempotent = idempotent
+        self.cacheable = cacheable
+        self.cache_control = cache_control
 
         self.auth = auth
 
@@ -112,6 +118,9 @@ class ProcedureWrapper:
             and self.name == other.name
             and self.protocol == other.protocol
             and self.auth == other.auth
+            and self.idempotent == other.idempotent
+            and self.cacheable == other.cacheable
+            and self.cache_control == other.cache_control
         )
 
     def __hash__(self) -> int:
@@ -0,0 +1,121 @@
+import mimetypes
+import os
+from dataclasses import asdict, dataclass, replace
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlencode
+
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+from django.http import FileResponse, HttpRequest, HttpResponse
+
+from modernrpc.config import settings
+
+# Name of the query string parameter holding the signed token, in URLs of file results
+FILE_QUERY_PARAM = "file"
+SIGNING_SALT = "modernrpc.files.FileResult"
+
+
+def get_files_root() -> Path:
+    """Return the directory containing all files returned as FileResult, from MODERNRPC_FILE_RESULT_ROOT setting"""
+    if not settings.MODERNRPC_FILE_RESULT_ROOT:
+        raise ImproperlyConfigured("MODERNRPC_FILE_RESULT_ROOT setting must be set to return FileResult instances")
+    return Path(settings.MODERNRPC_FILE_RESULT_ROOT).resolve()
+
+
+def get_signing_salt(endpoint: str) -> str:
+    """Return the salt used to sign tokens of the given endpoint, so they can't be used on other RPC endpoints"""
+    return f"{SIGNING_SALT}:{endpoint}"
+
+
+@dataclass
+class FileResult:
+    """
+    Result of a procedure returning a file stored on the server filesystem. Instead of the file content, RPC responses
+    contain a short-lived signed URL, pointing to the RPC endpoint itself. On a GET request to this URL, the file is
+    sent with a FileResponse, so it never passes through RPC serializers and can be sent by the WSGI server using
+    wsgi.file_wrapper (sendfile, when available).
+
+    The file must be stored in MODERNRPC_FILE_RESULT_ROOT directory, a relative path is relative to this directory. Only
+    the path relative to this directory is signed, and the token is only valid for the endpoint that returned it. The
+    token is not encrypted: this relative path is readable by clients.
+    """
+
+    path: str | os.PathLike[str]
+    filename: str | None = None
+    content_type: str | None = None
+    as_attachment: bool = True
+
+    def __post_init__(self) -> None:
+        self.path = os.fspath(self.path)
+
+    def get_filename(self) -> str:
+        return self.filename or Path(self.path).name
+
+    def get_content_type(self) -> str:
+        return self.content_type or mimetypes.guess_type(self.get_filename())[0] or "application/octet-stream"
+
+    def get_relative_path(self) -> str:
+        """
+        Return the path of the file, relative to MODERNRPC_FILE_RESULT_ROOT. Raise ValueError if the file is outside of
+        this directory.
+        """
+        root = get_files_root()
+        resolved_path = (root / self.path).resolve()
+        if not resolved_path.is_relative_to(root):
+            raise ValueError(f"File {self.get_filename()} is outside of MODERNRPC_FILE_RESULT_ROOT")
+        return resolved_path.relative_to(root).as_posix()
+
+    def sign(self, endpoint: str) -> str:
+        """Return a token referencing the file, valid on the given endpoint only"""
+        data = asdict(replace(self, path=self.get_relative_path()))
+        return signing.dumps(data, salt=get_signing_salt(endpoint), compress=True)
+
+    @classmethod
+    def from_token(cls, token: str, endpoint: str, max_age: int) -> "FileResult":
+        """
+        Return the FileResult signed in the given token, with a path relative to MODERNRPC_FILE_RESULT_ROOT. Raise
+        signing.BadSignature if the token is invalid or expired, or if it wasn't signed for the given endpoint.
+        """
+        return cls(**signing.loads(token, salt=get_signing_salt(endpoint), max_age=max_age))
+
+    def to_result_data(self, request: HttpRequest) -> dict[str, Any]:
+        """
+        Return the data sent to the client instead of the file. Raise FileNotFoundError if the file doesn't exist, or
+        ValueError if it is outside of MODERNRPC_FILE_RESULT_ROOT.
+        """
+        token = self.sign(request.path)
+        if not (get_files_root() / self.path).is_file():
+            raise FileNotFoundError(f"No such file: {self.get_filename()}")
+
+        query_string = urlencode({FILE_QUERY_PARAM: token})
+        return {
+            "url": request.build_absolute_uri(f"{request.path}?{query_string}"),
+            "filename": self.get_filename(),
+        }
+
+
+def build_file_response(request: HttpRequest) -> HttpResponse | FileResponse:
+    """Return a FileResponse for the file signed in the token of the given request, or an error response"""
+    try:
+        file_result = FileResult.from_token(
+            request.GET[FILE_QUERY_PARAM], request.path, max_age=settings.MODERNRPC_FILE_RESULT_MAX_AGE
+        )
+        # Signed paths are relative, this also rejects files moved out of the root directory by a symlink
+        relative_path = file_result.get_relative_path()
+    except (signing.BadSignature, ValueError):
+        return HttpResponse("Invalid or expired file URL", status=HTTPStatus.FORBIDDEN, content_type="text/plain")
+
+    try:
+        # Closed by FileResponse
+        file = (get_files_root() / relative_path).open("rb")
+    except OSError:
+        return HttpResponse("File not found", status=HTTPStatus.NOT_FOUND, content_type="text/plain")
+
+    return FileResponse(
+        file,
+        as_attachment=file_result.as_attachment,
+        filename=file_result.get_filename(),
+        content_type=file_result.get_content_type(),
+    )
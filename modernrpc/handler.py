@@ -1,17 +1,30 @@
+import asyncio
+import inspect
 import logging
 from abc import ABC, abstractmethod
+from collections.abc import AsyncGenerator, AsyncIterator, Generator, Hashable, Iterable, Iterator
+from dataclasses import replace
 from http import HTTPStatus
-from typing import Any, ClassVar, Generic
+from itertools import islice
+from typing import Any, ClassVar, Generic, TypeAlias, TypeGuard
 
-from django.http import HttpRequest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.http import HttpRequest, QueryDict
 
+from modernrpc.config import settings
 from modernrpc.constants import Protocol
 from modernrpc.core import RpcRequestContext
-from modernrpc.exceptions import RPCMethodNotFound
+from modernrpc.exceptions import RPCException, RPCMethodNotFound
+from modernrpc.files import FileResult
+from modernrpc.helpers import make_hashable
+from modernrpc.spooling import SpooledRequestBody, get_spooled_body_max_size, should_spool_body
 from modernrpc.types import RequestType, RpcErrorResult, RpcSuccessResult
 
 logger = logging.getLogger(__name__)
 
+# Request body, as returned by decode_request_body() and given to process_request()
+RequestBody: TypeAlias = str | bytes | Iterator[str] | SpooledRequestBody
+
 
 class RpcHandler(ABC, Generic[RequestType]):
     """Base class for concrete RPC Handlers. Provide an interface as well as some common methods implementations."""
@@ -21,6 +34,12 @@ class RpcHandler(ABC, Generic[RequestType]):
     response_content_type: str
     success_result_type: type[RpcSuccessResult[RequestType]]
     error_result_type: type[RpcErrorResult[RequestType]]
+    # Protocol specific deserializer and serializer, set by concrete handlers
+    deserializer: Any
+    serializer: Any
+    # Opening, separator and closing delimiters of arrays in serialized responses. When set, results returned by
+    # generator procedures can be streamed (see stream_result() and get_streamed_envelope())
+    streamed_array_delimiters: ClassVar[tuple[str, str, str] | None] = None
 
     @classmethod
     def can_handle(cls, request: HttpRequest) -> bool:
@@ -31,6 +50,34 @@ class RpcHandler(ABC, Generic[RequestType]):
         """
         return getattr(request, "content_type", "").lower() in cls.valid_content_types
 
+    def decode_request_body(self, request: HttpRequest, default_encoding: str) -> RequestBody:
+        """
+        Return the body of the given request, as expected by process_request(). The default implementation decodes
+        it to str, handlers for binary protocols may return the raw bytes instead, and streaming handlers an iterator
+        reading the request stream lazily.
+
+        When MODERNRPC_SPOOL_REQUEST_BODY_SIZE is set, larger bodies are returned as a SpooledRequestBody instead.
+        Their size is limited by DATA_UPLOAD_MAX_MEMORY_SIZE when the server has no max_request_size.
+        """
+        encoding = request.encoding or default_encoding
+        if should_spool_body(request, settings.MODERNRPC_SPOOL_REQUEST_BODY_SIZE):
+            return SpooledRequestBody.from_request(request, encoding, max_size=get_spooled_body_max_size(request))
+        return request.body.decode(encoding)
+
+    def loads_request_body(self, request_body: RequestBody) -> Any:
+        """
+        Parse the given request body with the deserializer. A spooled body is passed as a memory-mapped buffer to
+        deserializers accepting it, and decoded to str for other ones. It is closed once parsed.
+        """
+        if not isinstance(request_body, SpooledRequestBody):
+            return self.deserializer.loads(request_body)
+
+        with request_body:
+            # Buffers are parsed as bytes, their encoding is always detected by parsers as utf-8 (or from XML prolog)
+            if request_body.is_utf8 and getattr(self.deserializer, "accepts_buffer", False):
+                return self.deserializer.loads(request_body.buffer)
+            return self.deserializer.loads(request_body.read_text())
+
     # @abc.abstractmethod
     def build_success_result(self, request: RequestType, data: Any) -> RpcSuccessResult[RequestType]:
         return self.success_result_type(request=request, data=data)
@@ -42,9 +89,14 @@ class RpcHandler(ABC, Generic[RequestType]):
         return self.error_result_type(request=request, code=code, message=message, data=data)
 
     def process_single_request(
-        self, rpc_request: RequestType, context: RpcRequestContext
+        self, rpc_request: RequestType, context: RpcRequestContext, streamable: bool = False
     ) -> RpcSuccessResult[RequestType] | RpcErrorResult[RequestType]:
-        """Check and call the remote procedure, based on the given request dict."""
+        """
+        Check and call the remote procedure, based on the given request dict.
+
+        When a procedure returns a generator, it is consumed into a list, unless streamable is True. In such case, a
+        (synchronous) generator is kept as is in the success result, the caller is responsible for consuming it.
+        """
 
         try:
             wrapper = context.server.get_procedure_wrapper(rpc_request.method_name, self.protocol)
@@ -57,6 +109,10 @@ class RpcHandler(ABC, Generic[RequestType]):
 
         try:
             result_data = wrapper.execute(context, rpc_request.args, getattr(rpc_request, "kwargs", None))
+            if not streamable or inspect.isasyncgen(result_data):
+                result_data = self.collect_generator(result_data)
+            if isinstance(result_data, FileResult):
+                result_data = result_data.to_result_data(context.request)
 
         except Exception as exc:
             rpc_exc = context.server.on_error(exc, context)
@@ -67,11 +123,12 @@ class RpcHandler(ABC, Generic[RequestType]):
         return self.build_success_result(rpc_request, result_data)
 
     async def aprocess_single_request(
-        self, rpc_request: RequestType, context: RpcRequestContext
+        self, rpc_request: RequestType, context: RpcRequestContext, streamable: bool = False
     ) -> RpcSuccessResult[RequestType] | RpcErrorResult[RequestType]:
         """
         Asynchronous version of process_single_request().
-        Check and call the remote procedure, based on the given request dict.
+        Check and call the remote procedure, based on the given request dict. When streamable is True, both
+        synchronous and asynchronous generators are kept as is in the success result.
         """
 
         try:
@@ -85,6 +142,10 @@ class RpcHandler(ABC, Generic[RequestType]):
 
         try:
             result_data = await wrapper.aexecute(context, rpc_request.args, getattr(rpc_request, "kwargs", None))
+            if not streamable:
+                result_data = await self.acollect_generator(result_data)
+            if isinstance(result_data, FileResult):
+                result_data = result_data.to_result_data(context.request)
 
         except Exception as exc:
             rpc_exc = context.server.on_error(exc, context)
@@ -94,10 +155,267 @@ class RpcHandler(ABC, Generic[RequestType]):
 
         return self.build_success_result(rpc_request, result_data)
 
+    @staticmethod
+    def collect_generator(data: Any) -> Any:
+        """If the given data is a (sync or async) generator, consume it and return a list of its items"""
+        if inspect.isgenerator(data):
+            return list(data)
+        if inspect.isasyncgen(data):
+            return async_to_sync(RpcHandler.acollect_generator)(data)
+        return data
+
+    @staticmethod
+    async def acollect_generator(data: Any) -> Any:
+        """Asynchronous version of collect_generator()"""
+        if inspect.isasyncgen(data):
+            return [item async for item in data]
+        if inspect.isgenerator(data):
+            return await sync_to_async(RpcHandler.collect_generator)(data)
+        return data
+
+    def get_call_key(self, rpc_request: RequestType, context: RpcRequestContext) -> Hashable | None:
+        """
+        Return a key identifying the call described by the given request, when it targets an idempotent procedure.
+        Two requests with the same key can share the same result. Return None if the call can't be deduplicated.
+        """
+        try:
+            wrapper = context.server.get_procedure_wrapper(rpc_request.method_name, self.protocol)
+        except RPCMethodNotFound:
+            return None
+
+        if not wrapper.idempotent:
+            return None
+
+        try:
+            return (
+                rpc_request.method_name,
+                make_hashable(rpc_request.args),
+                make_hashable(getattr(rpc_request, "kwargs", None) or {}),
+            )
+        except TypeError:
+            return None
+
+    @staticmethod
+    def fan_out_result(
+        result: RpcSuccessResult[RequestType] | RpcErrorResult[RequestType], rpc_request: RequestType
+    ) -> RpcSuccessResult[RequestType] | RpcErrorResult[RequestType]:
+        """Return the given result, bound to the given request"""
+        return result if result.request is rpc_request else replace(result, request=rpc_request)
+
+    @staticmethod
+    def log_deduplicated_calls(count: int) -> None:
+        if count:
+            logger.info("%d identical call(s) to idempotent procedures have been deduplicated", count)
+
+    def process_requests(
+        self, rpc_requests: Iterable[RequestType], context: RpcRequestContext
+    ) -> Iterator[RpcSuccessResult[RequestType] | RpcErrorResult[RequestType]]:
+        """
+        Process each given request with process_single_request() and yield the results in the same order.
+
+        Identical calls to idempotent procedures are executed only once, their result is yielded for each request.
+        """
+        known_results: dict[Hashable, RpcSuccessResult[RequestType] | RpcErrorResult[RequestType]] = {}
+        deduplicated = 0
+
+        try:
+            for rpc_request in rpc_requests:
+                key = self.get_call_key(rpc_request, context)
+                if key is None:
+                    yield self.process_single_request(rpc_request, context)
+                elif key in known_results:
+                    deduplicated += 1
+                    yield self.fan_out_result(known_results[key], rpc_request)
+                else:
+                    known_results[key] = self.process_single_request(rpc_request, context)
+                    yield known_results[key]
+        finally:
+            self.log_deduplicated_calls(deduplicated)
+
+    async def aprocess_requests(
+        self, rpc_requests: Iterable[RequestType], context: RpcRequestContext
+    ) -> list[RpcSuccessResult[RequestType] | RpcErrorResult[RequestType]]:
+        """
+        Asynchronous version of process_requests(). Requests are processed concurrently, using asyncio.gather().
+
+        Identical calls to idempotent procedures are executed only once, their result is returned for each request.
+        """
+        rpc_requests = list(rpc_requests)
+        known_tasks: dict[Hashable, asyncio.Future] = {}
+        tasks: list[asyncio.Future] = []
+
+        for rpc_request in rpc_requests:
+            key = self.get_call_key(rpc_request, context)
+            if key is None:
+                tasks.append(asyncio.ensure_future(self.aprocess_single_request(rpc_request, context)))
+            else:
+                if key not in known_tasks:
+                    known_tasks[key] = asyncio.ensure_future(self.aprocess_single_request(rpc_request, context))
+                tasks.append(known_tasks[key])
+
+        results = await asyncio.gather(*tasks)
+        self.log_deduplicated_calls(len(tasks) - len(set(tasks)))
+
+        return [self.fan_out_result(result, request) for result, request in zip(results, rpc_requests, strict=True)]
+
+    def is_streamed_result(
+        self, result: RpcSuccessResult[RequestType] | RpcErrorResult[RequestType]
+    ) -> TypeGuard[RpcSuccessResult[RequestType]]:
+        """Return True if the given result holds a generator to be streamed with stream_result()"""
+        return (
+            self.streamed_array_delimiters is not None
+            and isinstance(result, RpcSuccessResult)
+            and (inspect.isgenerator(result.data) or inspect.isasyncgen(result.data))
+        )
+
+    def get_streamed_envelope(self, result: RpcSuccessResult[RequestType], serialized: str) -> tuple[str, str]:
+        """
+        Return the parts of a response written before and after the result array. The given string is the
+        serialization of the same result, with a non-empty list as data.
+
+        Only called when streamed_array_delimiters is set, handlers setting it must override this method.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} doesn't support streamed results")
+
+    def extract_streamed_items(self, serialized: str, envelope: tuple[str, str]) -> str:
+        """Return the serialized items of the result array, from a response serialized with a non-empty list as data"""
+        prefix, suffix = envelope
+        if not serialized.startswith(prefix) or not serialized.endswith(suffix):
+            raise ValueError("Unexpected serialized response format, unable to stream the result")
+
+        opening, _, closing = self.streamed_array_delimiters or ("", "", "")
+        return serialized[len(prefix) : len(serialized) - len(suffix)].strip()[len(opening) : -len(closing)]
+
+    def dumps_streamed_items(
+        self, result: RpcSuccessResult[RequestType], chunk: list, envelope: tuple[str, str]
+    ) -> str:
+        return self.extract_streamed_items(self.serializer.dumps(replace(result, data=chunk)), envelope)
+
+    def dumps_streamed_error(self, rpc_request: RequestType, exc: BaseException, context: RpcRequestContext) -> str:
+        rpc_exc = context.server.on_error(exc, context)
+        return self.serializer.dumps(self.build_error_result(rpc_request, rpc_exc.code, rpc_exc.message, rpc_exc.data))
+
+    @staticmethod
+    def next_chunk(generator: Generator, size: int) -> list:
+        return list(islice(generator, size))
+
+    @staticmethod
+    async def anext_chunk(generator: AsyncGenerator, size: int) -> list:
+        chunk = []
+        async for item in generator:
+            chunk.append(item)
+            if len(chunk) >= size:
+                break
+        return chunk
+
+    def stream_result(self, result: RpcSuccessResult[RequestType], context: RpcRequestContext) -> str | Iterator[str]:
+        """
+        Serialize a result holding a generator, MODERNRPC_STREAMED_RESULT_CHUNK_SIZE items at a time.
+
+        The first chunk is consumed immediately: when the generator raises an exception or when it doesn't produce more
+        than a single chunk, a standard (error or success) response is returned. Else, an iterator of str chunks is
+        returned, to be sent as a streaming response. If an exception is raised after the first chunk, the response is
+        interrupted and left incomplete, so clients can't mistake it for a complete result.
+        """
+        generator = result.data
+        size = settings.MODERNRPC_STREAMED_RESULT_CHUNK_SIZE
+
+        try:
+            chunk = self.next_chunk(generator, size)
+            serialized = self.serializer.dumps(replace(result, data=chunk))
+            if len(chunk) < size:
+                return serialized
+            envelope = self.get_streamed_envelope(result, serialized)
+            first_items = self.extract_streamed_items(serialized, envelope)
+        except Exception as exc:
+            generator.close()
+            return self.dumps_streamed_error(result.request, exc, context)
+
+        return self.iter_streamed_result(result, envelope, first_items, context)
+
+    def iter_streamed_result(
+        self,
+        result: RpcSuccessResult[RequestType],
+        envelope: tuple[str, str],
+        first_items: str,
+        context: RpcRequestContext,
+    ) -> Iterator[str]:
+        generator = result.data
+        size = settings.MODERNRPC_STREAMED_RESULT_CHUNK_SIZE
+        opening, separator, closing = self.streamed_array_delimiters or ("", "", "")
+
+        try:
+            yield envelope[0] + opening + first_items
+            while chunk := self.next_chunk(generator, size):
+                yield separator + self.dumps_streamed_items(result, chunk, envelope)
+            yield closing + envelope[1]
+        except Exception as exc:
+            context.server.on_error(exc, context)
+            logger.warning('Streamed result of procedure "%s" has been interrupted', result.request.method_name)
+        finally:
+            generator.close()
+
+    async def astream_result(
+        self, result: RpcSuccessResult[RequestType], context: RpcRequestContext
+    ) -> str | AsyncIterator[str]:
+        """Asynchronous version of stream_result(). Synchronous generators are consumed in a thread."""
+        generator = result.data
+        size = settings.MODERNRPC_STREAMED_RESULT_CHUNK_SIZE
+
+        try:
+            chunk = await self.anext_generator_chunk(generator, size)
+            serialized = self.serializer.dumps(replace(result, data=chunk))
+            if len(chunk) < size:
+                return serialized
+            envelope = self.get_streamed_envelope(result, serialized)
+            first_items = self.extract_streamed_items(serialized, envelope)
+        except Exception as exc:
+            await self.aclose_generator(generator)
+            return self.dumps_streamed_error(result.request, exc, context)
+
+        return self.aiter_streamed_result(result, envelope, first_items, context)
+
+    async def aiter_streamed_result(
+        self,
+        result: RpcSuccessResult[RequestType],
+        envelope: tuple[str, str],
+        first_items: str,
+        context: RpcRequestContext,
+    ) -> AsyncIterator[str]:
+        generator = result.data
+        size = settings.MODERNRPC_STREAMED_RESULT_CHUNK_SIZE
+        opening, separator, closing = self.streamed_array_delimiters or ("", "", "")
+
+        try:
+            yield envelope[0] + opening + first_items
+            while chunk := await self.anext_generator_chunk(generator, size):
+                yield separator + self.dumps_streamed_items(result, chunk, envelope)
+            yield closing + envelope[1]
+        except Exception as exc:
+            context.server.on_error(exc, context)
+            logger.warning('Streamed result of procedure "%s" has been interrupted', result.request.method_name)
+        finally:
+            await self.aclose_generator(generator)
+
+    async def anext_generator_chunk(self, generator: Generator | AsyncGenerator, size: int) -> list:
+        if isinstance(generator, AsyncGenerator):
+            return await self.anext_chunk(generator, size)
+        return await sync_to_async(self.next_chunk)(generator, size)
+
+    @staticmethod
+    async def aclose_generator(generator: Generator | AsyncGenerator) -> None:
+        if isinstance(generator, AsyncGenerator):
+            await generator.aclose()
+        else:
+            await sync_to_async(generator.close)()
+
     @abstractmethod
-    def process_request(self, request_body: str, context: RpcRequestContext) -> str | tuple[HTTPStatus, str]:
+    def process_request(
+        self, request_body: RequestBody, context: RpcRequestContext
+    ) -> str | bytes | tuple[HTTPStatus, str] | Iterator[str]:
         """
-        Fully process a request. Return the str content ready to be sent as HttpResponse.
+        Fully process a request. Return the content ready to be sent as HttpResponse (bytes for binary protocols), or
+        an iterator of str chunks to be sent as a streaming response.
 
         This is the only method the view is supposed to call after choosing the right handler.
         Concrete implementation must perform all work here, according to its protocol specifications.
@@ -110,8 +428,61 @@ class RpcHandler(ABC, Generic[RequestType]):
         """
 
     @abstractmethod
-    async def aprocess_request(self, request_body: str, context: RpcRequestContext) -> str | tuple[HTTPStatus, str]:
+    async def aprocess_request(
+        self, request_body: RequestBody, context: RpcRequestContext
+    ) -> str | bytes | tuple[HTTPStatus, str] | AsyncIterator[str]:
         """
         Asynchronous version of process_request(). It takes the same arguments and returns the same result.
         Delegates its work to aprocess_single_request() instead of process_single_request() for async support.
+
+        It may also return an async iterator of str chunks instead of a sync one, to be sent as a streaming response.
+        """
+
+
+class CacheableRpcHandler(RpcHandler[RequestType], ABC):
+    """
+    Base class for handlers accepting calls to cacheable procedures, encoded in the query string of GET requests.
+    Concrete handlers build the request from the query string in parse_get_request(), it is then processed like a
+    single POST request.
+    """
+
+    @abstractmethod
+    def parse_get_request(
+        self, query: QueryDict, context: RpcRequestContext
+    ) -> RequestType | RpcErrorResult[RequestType]:
+        """
+        Build a request from the given query string. Return an error result when the query string is invalid or the
+        procedure is not cacheable.
         """
+
+    def dumps_get_result(
+        self, result: RpcSuccessResult[RequestType] | RpcErrorResult[RequestType], context: RpcRequestContext
+    ) -> tuple[str, str | None]:
+        """Serialize the result of a GET request. Only successful responses may be cached."""
+        try:
+            result_data = self.serializer.dumps(result)
+        except RPCException as exc:
+            rpc_exc = context.server.on_error(exc, context)
+            return self.serializer.dumps(self.build_error_result(result.request, rpc_exc.code, rpc_exc.message)), None
+
+        if isinstance(result, RpcErrorResult):
+            return result_data, None
+        return result_data, context.server.procedures[result.request.method_name].cache_control or ""
+
+    def process_get_request(self, query: QueryDict, context: RpcRequestContext) -> tuple[str, str | None]:
+        """
+        Process a call to a cacheable procedure, encoded in the query string of a GET request. Return the str content
+        ready to be sent as HttpResponse, and the value of the Cache-Control header to send with it (None if the
+        response must not be cached, empty string to only send the ETag header).
+        """
+        parsed_request = self.parse_get_request(query, context)
+        if isinstance(parsed_request, RpcErrorResult):
+            return self.dumps_get_result(parsed_request, context)
+        return self.dumps_get_result(self.process_single_request(parsed_request, context), context)
+
+    async def aprocess_get_request(self, query: QueryDict, context: RpcRequestContext) -> tuple[str, str | None]:
+        """Asynchronous version of process_get_request()"""
+        parsed_request = self.parse_get_request(query, context)
+        if isinstance(parsed_request, RpcErrorResult):
+            return self.dumps_get_result(parsed_request, context)
+        return self.dumps_get_result(await self.aprocess_single_request(parsed_request, context), context)
@@ -1,8 +1,11 @@
 import datetime
 import xmlrpc.client
-from collections.abc import Callable, Iterable, Sequence
+from collections.abc import Callable, Hashable, Iterable, Sequence
 from enum import Flag
-from typing import Any
+from typing import IO, Any
+
+from django.core.exceptions import RequestDataTooBig
+from django.http import HttpRequest
 
 from modernrpc.constants import NOT_SET
 
@@ -49,6 +52,21 @@ def ensure_sequence(element: Any) -> Sequence:
     return element if isinstance(element, (list, tuple)) else [element]
 
 
+def make_hashable(value: Any) -> Hashable:
+    """
+    Recursively convert the given value into a hashable representation. The type of each value is kept in the result,
+    so 1, 1.0 and True give different representations. Dict items order is not significant.
+
+    Raise TypeError if some part of the value cannot be hashed.
+    """
+    if isinstance(value, dict):
+        return dict, frozenset((make_hashable(key), make_hashable(val)) for key, val in value.items())
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(make_hashable(val) for val in value)
+    hash(value)
+    return type(value), value
+
+
 def first(seq: Iterable, default=NOT_SET) -> Any:
     """
     Return the first element of the given iterable, or default value if the iterable is empty.
@@ -72,3 +90,44 @@ def first_true(iterable: Iterable[Any], default: Any = None, pred: Callable[[Any
     Doc: https://more-itertools.readthedocs.io/en/stable/api.html#more_itertools.first_true
     """
     return next(filter(pred, iterable), default)
+
+
+def get_content_length(request: HttpRequest) -> int | None:
+    """Return the size of the request body declared in Content-Length header, or None if it is missing or invalid"""
+    try:
+        return int(request.META["CONTENT_LENGTH"])
+    except (KeyError, ValueError):
+        return None
+
+
+class SizeLimitedStream:
+    """
+    Wrap the stream of a request body, raising RequestDataTooBig as soon as more than max_size bytes have been read
+    from it. At most max_size + 1 bytes are read from the wrapped stream, the rest of the body is never read.
+    """
+
+    def __init__(self, stream: IO[bytes], max_size: int) -> None:
+        self.stream = stream
+        self.max_size = max_size
+        self.remaining = max_size
+
+    def limit_size(self, size: int | None) -> int:
+        # Read one byte more than allowed, to detect a body larger than max_size
+        if size is None or size < 0:
+            return self.remaining + 1
+        return min(size, self.remaining + 1)
+
+    def check_size(self, data: bytes) -> bytes:
+        self.remaining -= len(data)
+        if self.remaining < 0:
+            raise RequestDataTooBig(f"Request body exceeded the maximum size ({self.max_size} bytes)")
+        return data
+
+    def read(self, size: int | None = -1) -> bytes:
+        return self.check_size(self.stream.read(self.limit_size(size)))
+
+    def readline(self, size: int | None = -1) -> bytes:
+        return self.check_size(self.stream.readline(self.limit_size(size)))
+
+    def close(self) -> None:
+        self.stream.close()
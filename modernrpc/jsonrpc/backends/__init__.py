@@ -1,4 +1,4 @@
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from typing import Protocol
 
 from modernrpc.jsonrpc.handler import JsonRpcRequest, JsonRpcResult
@@ -7,10 +7,22 @@ from modernrpc.jsonrpc.handler import JsonRpcRequest, JsonRpcResult
 class JsonRpcDeserializer(Protocol):
     def __init__(self, **kwargs): ...
 
-    def loads(self, data: str) -> JsonRpcRequest | list[JsonRpcRequest]: ...
+    def loads(self, data: str) -> JsonRpcRequest | list[JsonRpcRequest] | Iterator[JsonRpcRequest]: ...
 
 
 class JsonRpcSerializer(Protocol):
     def __init__(self, **kwargs): ...
 
     def dumps(self, result: JsonRpcResult | Iterable[JsonRpcResult]) -> str: ...
+
+
+class BinaryJsonRpcDeserializer(Protocol):
+    def __init__(self, **kwargs): ...
+
+    def loads(self, data: bytes) -> JsonRpcRequest | list[JsonRpcRequest]: ...
+
+
+class BinaryJsonRpcSerializer(Protocol):
+    def __init__(self, **kwargs): ...
+
+    def dumps(self, result: JsonRpcResult | Iterable[JsonRpcResult]) -> bytes: ...
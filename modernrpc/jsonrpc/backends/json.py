@@ -1,21 +1,24 @@
 import json
-from collections.abc import Iterable
+import re
+from collections.abc import Iterable, Iterator
 from functools import cached_property
 from json import JSONDecodeError
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, cast
 
 from django.core.serializers.json import DjangoJSONEncoder
 from django.utils.module_loading import import_string
 
-from modernrpc.exceptions import RPCMarshallingError, RPCParseError
+from modernrpc.exceptions import RPCInvalidRequest, RPCMarshallingError, RPCParseError
+from modernrpc.jsonrpc.backends.marshalling import EnvelopeTemplate, RawJSONSplicer, RequestLimitsMixin
 from modernrpc.jsonrpc.handler import JsonRpcRequest, JsonRpcResult
-from modernrpc.types import CustomKwargs
+from modernrpc.types import CustomKwargs, RpcErrorResult, RpcSuccessResult
 
 if TYPE_CHECKING:
+    from modernrpc.limits import StructureLimits
     from modernrpc.types import DictStrAny
 
 
-class PythonJsonDeserializer:
+class PythonJsonDeserializer(RequestLimitsMixin):
     """json-rpc deserializer based on python builtin json module"""
 
     def __init__(
@@ -23,7 +26,9 @@ class PythonJsonDeserializer:
         unmarshaller_klass="modernrpc.jsonrpc.backends.marshalling.Unmarshaller",
         unmarshaller_kwargs: CustomKwargs = None,
         load_kwargs: CustomKwargs = None,
+        limits: "StructureLimits | DictStrAny | None" = None,
     ):
+        super().__init__(limits)
         self.unmarshaller_klass = import_string(unmarshaller_klass)
         self.unmarshaller_kwargs = unmarshaller_kwargs or {}
 
@@ -33,15 +38,107 @@ class PythonJsonDeserializer:
     def unmarshaller(self):
         return self.unmarshaller_klass(**self.unmarshaller_kwargs)
 
-    def loads(self, data: str) -> JsonRpcRequest | list[JsonRpcRequest]:
+    # Same return type as the JsonRpcDeserializer protocol: subclasses may parse batch requests lazily
+    def loads(self, data: str) -> JsonRpcRequest | list[JsonRpcRequest] | Iterator[JsonRpcRequest]:
         try:
             structured_data: list[DictStrAny] | DictStrAny = json.loads(data, **self.load_kwargs)
         except JSONDecodeError as exc:
             raise RPCParseError(exc.msg, data=exc) from exc
+        except RecursionError as exc:
+            # Raised by the parser on deeply nested payloads
+            raise RPCParseError(str(exc)) from exc
 
+        self.check_limits(structured_data)
         return self.unmarshaller.dict_to_request(structured_data)
 
 
+class PythonJsonIncrementalDeserializer(PythonJsonDeserializer):
+    """
+    json-rpc deserializer based on python builtin json module. Batch requests are parsed lazily, one element at a time,
+    so the handler can start executing the first calls before the whole payload has been parsed.
+    """
+
+    whitespace = re.compile(r"[ \t\n\r]*")
+
+    def __init__(
+        self,
+        unmarshaller_klass="modernrpc.jsonrpc.backends.marshalling.Unmarshaller",
+        unmarshaller_kwargs: CustomKwargs = None,
+        load_kwargs: CustomKwargs = None,
+        limits: "StructureLimits | DictStrAny | None" = None,
+    ):
+        super().__init__(unmarshaller_klass, unmarshaller_kwargs, load_kwargs, limits)
+
+        decoder_kwargs = dict(self.load_kwargs)
+        decoder_klass = decoder_kwargs.pop("cls", json.JSONDecoder)
+        self.decoder: json.JSONDecoder = decoder_klass(**decoder_kwargs)
+
+    def loads(self, data: str) -> JsonRpcRequest | list[JsonRpcRequest] | Iterator[JsonRpcRequest]:
+        position = self.skip_whitespace(data, 0)
+        if not data.startswith("[", position):
+            return super().loads(data)
+
+        requests = self.iter_batch(data, position + 1)
+        # Parse the first element immediately: if the payload is totally invalid, the error must be raised from here
+        # to produce a single error response, as required by the JSON-RPC specs
+        try:
+            first_request = next(requests)
+        except StopIteration:
+            return iter(())
+        return self.chain(first_request, requests)
+
+    @staticmethod
+    def chain(first_request: JsonRpcRequest, requests: Iterator[JsonRpcRequest]) -> Iterator[JsonRpcRequest]:
+        yield first_request
+        yield from requests
+
+    def iter_batch(self, data: str, position: int) -> Iterator[JsonRpcRequest]:
+        """
+        Yield a JsonRpcRequest for each element found in the JSON array starting at the given position.
+        Raise RPCParseError as soon as a malformed part of the payload is encountered.
+        """
+        position = self.skip_whitespace(data, position)
+        if data.startswith("]", position):
+            self.check_trailing_data(data, position + 1)
+            return
+
+        batch_size = 0
+        while True:
+            try:
+                structured_data, position = self.decoder.raw_decode(data, position)
+            except JSONDecodeError as exc:
+                raise RPCParseError(exc.msg, data=exc) from exc
+            except RecursionError as exc:
+                raise RPCParseError(str(exc)) from exc
+
+            if not isinstance(structured_data, dict):
+                raise RPCInvalidRequest("batch elements must be JSON objects", data=structured_data)
+            if self.limits is not None:
+                batch_size += 1
+                self.limits.check_batch_size(batch_size)
+                self.check_limits(structured_data)
+            yield self.unmarshaller.dict_to_request(structured_data)
+
+            position = self.skip_whitespace(data, position)
+            if data.startswith(",", position):
+                position = self.skip_whitespace(data, position + 1)
+            elif data.startswith("]", position):
+                self.check_trailing_data(data, position + 1)
+                return
+            else:
+                raise RPCParseError(f"Expecting ',' delimiter or ']' at char {position}")
+
+    def skip_whitespace(self, data: str, position: int) -> int:
+        """Return the position of the first non-whitespace character found in data from the given position"""
+        # The pattern also matches empty strings, a match is always found
+        return cast("re.Match[str]", self.whitespace.match(data, position)).end()
+
+    def check_trailing_data(self, data: str, position: int) -> None:
+        position = self.skip_whitespace(data, position)
+        if position != len(data):
+            raise RPCParseError(f"Extra data at char {position}")
+
+
 class PythonJsonSerializer:
     """json-rpc serializer based on python builtin json module"""
 
@@ -50,20 +147,38 @@ class PythonJsonSerializer:
         marshaller_klass="modernrpc.jsonrpc.backends.marshalling.Marshaller",
         marshaller_kwargs: CustomKwargs = None,
         dump_kwargs: CustomKwargs = None,
+        envelope_template: bool = False,
     ):
         self.marshaller_klass = import_string(marshaller_klass)
         self.marshaller_kwargs = marshaller_kwargs or {}
 
         self.dump_kwargs = dump_kwargs or {}
         self.dump_kwargs.setdefault("cls", DjangoJSONEncoder)
+        # json module can't write raw JSON fragments. RawJSON instances are handled by a RawJSONSplicer 'default' hook,
+        # falling back to the encoder class 'default' method for other types
+        self.fallback_default = self.dump_kwargs.pop("default", None) or self.dump_kwargs["cls"]().default
+        # Optional fast path: write the response envelope from a template, only result data is serialized
+        self.envelope_template = (
+            EnvelopeTemplate(self.dumps_value, self.marshaller_klass) if envelope_template else None
+        )
 
     @cached_property
     def marshaller(self):
         return self.marshaller_klass(**self.marshaller_kwargs)
 
+    def dumps_value(self, value: Any) -> str:
+        splicer = RawJSONSplicer(self.fallback_default)
+        return splicer.splice(json.dumps(value, default=splicer.default, **self.dump_kwargs))
+
     def dumps(self, result: JsonRpcResult | Iterable[JsonRpcResult]) -> str:
+        if self.envelope_template and isinstance(result, (RpcSuccessResult, RpcErrorResult)):
+            try:
+                return self.envelope_template.result_to_str(result)
+            except (TypeError, UnicodeDecodeError) as exc:
+                raise RPCMarshallingError(self.marshaller.result_to_dict(result), exc) from exc
+
         structured_data = self.marshaller.result_to_dict(result)
         try:
-            return json.dumps(structured_data, **self.dump_kwargs)
+            return self.dumps_value(structured_data)
         except (TypeError, UnicodeDecodeError) as exc:
             raise RPCMarshallingError(structured_data, exc) from exc
@@ -1,17 +1,59 @@
+import re
+from collections.abc import Callable
 from types import NoneType
-from typing import cast, overload
+from typing import Any, cast, overload
+from uuid import uuid4
+
+from django.core.exceptions import ImproperlyConfigured
 
 from modernrpc.constants import NOT_SET
 from modernrpc.exceptions import RPCInvalidRequest
-from modernrpc.jsonrpc.handler import JsonRpcRequest, JsonRpcResult
+from modernrpc.jsonrpc.handler import JsonRpcRequest, JsonRpcResult, RawJSON
+from modernrpc.limits import StructureLimits
 from modernrpc.types import DictStrAny, RpcErrorResult
 
 
+def check_request_limits(limits: StructureLimits, structured_data: Any) -> None:
+    """
+    Check structural limits on a decoded JSON-RPC request (or batch request), before it is unmarshalled. Invalid
+    requests are ignored here, they are rejected by the unmarshaller.
+    """
+    if isinstance(structured_data, list):
+        limits.check_batch_size(len(structured_data))
+        requests = structured_data
+    else:
+        requests = [structured_data]
+
+    for request_data in requests:
+        params = request_data.get("params") if isinstance(request_data, dict) else None
+        if isinstance(params, (list, dict)):
+            limits.check_data(params)
+
+
+class RequestLimitsMixin:
+    """
+    Structural limits support for JSON-RPC deserializers (see StructureLimits). Unlike XML-RPC deserializers, no limit
+    is checked by default: JSON parsers already refuse deeply nested payloads by themselves. When limits are given,
+    unset ones take their default value.
+    """
+
+    def __init__(self, limits: "StructureLimits | DictStrAny | None" = None):
+        self.limits = StructureLimits.build(limits) if limits is not None else None
+
+    def check_limits(self, structured_data: Any) -> None:
+        """Check limits on a decoded request (or batch request), before it is unmarshalled"""
+        if self.limits is not None:
+            check_request_limits(self.limits, structured_data)
+
+
 class Unmarshaller:
     def __init__(self, validate_version: bool = True):
         self.validate_version = validate_version
 
     def validate_dict_request(self, request_data: DictStrAny) -> None:
+        if not isinstance(request_data, dict):
+            raise RPCInvalidRequest(f"Request must be an object, found {type(request_data).__name__}")
+
         if "method" not in request_data:
             raise RPCInvalidRequest("Unable to find method name", data=request_data)
 
@@ -74,24 +116,116 @@ class Marshaller:
         if result.request.is_notification:
             return None
 
-        base_result = {
-            "id": result.request.request_id,
-            "jsonrpc": result.request.jsonrpc,
-        }
+        if isinstance(result, RpcErrorResult):
+            error: DictStrAny = {"code": result.code, "message": result.message}
+            if result.data:
+                error["data"] = result.data
+            return {"id": result.request.request_id, "jsonrpc": result.request.jsonrpc, "error": error}
+
+        return {"id": result.request.request_id, "jsonrpc": result.request.jsonrpc, "result": result.data}
+
+
+class EnvelopeTemplate:
+    """
+    Build a JSON-RPC response from pre-built string templates. Only the request id and the result (or error) data are
+    serialized, using the given function. No intermediate dict is built for the envelope.
+
+    The fixed part of the response is always written in a compact form, regardless of the serializer configuration.
+    Batch responses are not supported: serializing the whole batch in a single call is faster than one call per result.
+
+    Templates replace Marshaller.result_to_dict(), so they can't be used with a custom marshaller class.
+    """
+
+    success_template = '{"id":%s,"jsonrpc":%s,"result":%s}'
+    error_template = '{"id":%s,"jsonrpc":%s,"error":{"code":%d,"message":%s}}'
+    error_with_data_template = '{"id":%s,"jsonrpc":%s,"error":{"code":%d,"message":%s,"data":%s}}'
+
+    def __init__(self, dumps_value: Callable[[Any], str], marshaller_klass: type = Marshaller):
+        if marshaller_klass is not Marshaller:
+            raise ImproperlyConfigured("envelope_template can't be used with a custom marshaller_klass")
+        self.dumps_value = dumps_value
+
+    def dumps_id(self, request_id: Any) -> str:
+        if request_id is None:
+            return "null"
+        if type(request_id) is int:
+            return str(request_id)
+        return self.dumps_value(request_id)
+
+    def dumps_data(self, data: Any) -> str:
+        # Pre-serialized data don't need to go through the serializer at all
+        if isinstance(data, RawJSON):
+            return data.data
+        return self.dumps_value(data)
+
+    def dumps_jsonrpc(self, jsonrpc: str) -> str:
+        return '"2.0"' if jsonrpc == "2.0" else self.dumps_value(jsonrpc)
+
+    def result_to_str(self, result: JsonRpcResult) -> str:
+        if result.request.is_notification:
+            return "null"
+
+        request_id = self.dumps_id(result.request.request_id)
+        jsonrpc = self.dumps_jsonrpc(result.request.jsonrpc)
 
         if isinstance(result, RpcErrorResult):
-            response_payload: DictStrAny = {
-                **base_result,
-                "error": {
-                    "code": result.code,
-                    "message": result.message,
-                },
-            }
+            message = self.dumps_value(result.message)
             if result.data:
-                response_payload["error"]["data"] = result.data
-            return response_payload
+                data = self.dumps_data(result.data)
+                return self.error_with_data_template % (request_id, jsonrpc, result.code, message, data)
+            return self.error_template % (request_id, jsonrpc, result.code, message)
+
+        return self.success_template % (request_id, jsonrpc, self.dumps_data(result.data))
+
+
+def raw_json_default(
+    fragment_factory: Callable[[str], Any], fallback: Callable[[Any], Any] | None = None
+) -> Callable[[Any], Any]:
+    """
+    Build a 'default' hook for serialization libraries natively supporting raw JSON fragments. RawJSON instances are
+    converted using the given factory, other objects are passed to the fallback hook.
+    """
+
+    def default(obj: Any) -> Any:
+        if isinstance(obj, RawJSON):
+            return fragment_factory(obj.data)
+        if fallback is None:
+            raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+        return fallback(obj)
+
+    return default
+
+
+RAW_JSON_PLACEHOLDER = re.compile(r'"modernrpc-raw-json:([0-9a-f]{32}):(\d+)"')
+
+
+class RawJSONSplicer:
+    """
+    Support RawJSON results with serialization libraries unable to write raw JSON fragments. RawJSON instances are
+    first serialized as unique placeholder strings, then replaced by their content in the final output.
+
+    A new instance must be used for each serialization.
+    """
+
+    def __init__(self, fallback: Callable[[Any], Any] | None = None):
+        self.fallback = fallback
+        self.token = uuid4().hex
+        self.fragments: list[str] = []
+
+    def default(self, obj: Any) -> Any:
+        if isinstance(obj, RawJSON):
+            self.fragments.append(obj.data)
+            return f"modernrpc-raw-json:{self.token}:{len(self.fragments) - 1}"
+        if self.fallback is None:
+            raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+        return self.fallback(obj)
+
+    def splice(self, output: str) -> str:
+        if not self.fragments:
+            return output
+        return RAW_JSON_PLACEHOLDER.sub(self.replace_placeholder, output)
 
-        return {
-            **base_result,
-            "result": result.data,
-        }
+    def replace_placeholder(self, match: re.Match) -> str:
+        token, index = match.groups()
+        # Placeholder-like strings from another serialization (or from the result itself) are left untouched
+        return self.fragments[int(index)] if token == self.token else match.group(0)
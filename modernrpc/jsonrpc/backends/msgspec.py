@@ -0,0 +1,153 @@
+from collections.abc import Iterable
+from typing import Annotated, Any, ClassVar, Literal
+
+import msgspec
+from django.core.serializers.json import DjangoJSONEncoder
+
+from modernrpc.constants import NOT_SET
+from modernrpc.exceptions import RPCInvalidRequest, RPCMarshallingError, RPCParseError
+from modernrpc.jsonrpc.backends.marshalling import Marshaller, RequestLimitsMixin, raw_json_default
+from modernrpc.jsonrpc.handler import JsonRpcRequest, JsonRpcResult
+from modernrpc.limits import StructureLimits
+from modernrpc.types import CustomKwargs, DictStrAny, RpcErrorResult, RpcSuccessResult
+
+RequestIdStructType = str | int | float | None | msgspec.UnsetType
+ParamsStructType = list[Any] | dict[str, Any] | None
+
+
+class RequestStruct(msgspec.Struct):
+    """JSON-RPC request, as decoded by msgspec. Only "2.0" is accepted as "jsonrpc" value."""
+
+    jsonrpc: Literal["2.0"]
+    method: str
+    params: ParamsStructType = None
+    # Notification request won't have "id" field, this is different from a null "id"
+    id: RequestIdStructType = msgspec.UNSET
+
+
+class LenientRequestStruct(msgspec.Struct):
+    """JSON-RPC request, as decoded by msgspec. Any "jsonrpc" value is accepted."""
+
+    jsonrpc: str
+    method: str
+    params: ParamsStructType = None
+    id: RequestIdStructType = msgspec.UNSET
+
+
+class SuccessResponseStruct(msgspec.Struct):
+    id: Any
+    jsonrpc: str
+    result: Any
+
+
+class ErrorStruct(msgspec.Struct):
+    code: int
+    message: str
+    data: Any = msgspec.UNSET
+
+
+class ErrorResponseStruct(msgspec.Struct):
+    id: Any
+    jsonrpc: str
+    error: ErrorStruct
+
+
+class MsgspecDeserializer(RequestLimitsMixin):
+    """json-rpc deserializer based on the third-party msgspec library. Payload is decoded into typed structs"""
+
+    # Request bodies spooled to disk are passed as a memory-mapped buffer instead of str (see SpooledRequestBody)
+    accepts_buffer: ClassVar[bool] = True
+
+    def __init__(
+        self,
+        validate_version: bool = True,
+        load_kwargs: CustomKwargs = None,
+        limits: StructureLimits | DictStrAny | None = None,
+    ):
+        super().__init__(limits)
+        self.validate_version = validate_version
+        self.load_kwargs = load_kwargs or {}
+
+        request_type: Any = RequestStruct if validate_version else LenientRequestStruct
+        # Batch size is validated by msgspec itself, while decoding
+        batch_type: Any = list[request_type]
+        if self.limits is not None and self.limits.max_batch_size is not None:
+            batch_type = Annotated[batch_type, msgspec.Meta(max_length=self.limits.max_batch_size)]
+        self.decoder = msgspec.json.Decoder(request_type | batch_type, **self.load_kwargs)
+
+    def loads(self, data: str) -> JsonRpcRequest | list[JsonRpcRequest]:
+        try:
+            structured_data = self.decoder.decode(data)
+        except msgspec.ValidationError as exc:
+            raise RPCInvalidRequest(str(exc)) from exc
+        except msgspec.DecodeError as exc:
+            raise RPCParseError(str(exc), data=exc) from exc
+        except RecursionError as exc:
+            # Raised by the decoder on deeply nested payloads
+            raise RPCParseError(str(exc)) from exc
+
+        if isinstance(structured_data, list):
+            if self.limits is not None:
+                for struct in structured_data:
+                    self.check_params_limits(struct)
+            return [self.struct_to_request(struct) for struct in structured_data]
+
+        if self.limits is not None:
+            self.check_params_limits(structured_data)
+        return self.struct_to_request(structured_data)
+
+    def check_params_limits(self, struct: RequestStruct | LenientRequestStruct) -> None:
+        if self.limits is not None and struct.params is not None:
+            self.limits.check_data(struct.params)
+
+    @staticmethod
+    def struct_to_request(struct: RequestStruct | LenientRequestStruct) -> JsonRpcRequest:
+        params = struct.params
+        return JsonRpcRequest(
+            request_id=NOT_SET if struct.id is msgspec.UNSET else struct.id,
+            method_name=struct.method,
+            args=params if isinstance(params, list) else [],
+            kwargs=params if isinstance(params, dict) else {},
+        )
+
+
+class MsgspecSerializer:
+    """json-rpc serializer based on the third-party msgspec library. Responses are encoded from typed structs"""
+
+    def __init__(self, dump_kwargs: CustomKwargs = None):
+        self.dump_kwargs = dump_kwargs or {}
+        # Like ujson and simplejson backends, build an encoding hook from DjangoJSONEncoder.default to transparently
+        # serialize the types msgspec doesn't natively support (timedelta, lazy translation strings, etc.)
+        self.dump_kwargs.setdefault("enc_hook", DjangoJSONEncoder().default)
+        # Write RawJSON results verbatim, using msgspec.Raw
+        self.dump_kwargs["enc_hook"] = raw_json_default(msgspec.Raw, self.dump_kwargs["enc_hook"])
+
+        self.encoder = msgspec.json.Encoder(**self.dump_kwargs)
+
+    @staticmethod
+    def result_to_struct(result: JsonRpcResult) -> SuccessResponseStruct | ErrorResponseStruct | None:
+        if result.request.is_notification:
+            return None
+
+        if isinstance(result, RpcErrorResult):
+            error = ErrorStruct(code=result.code, message=result.message)
+            if result.data:
+                error.data = result.data
+            return ErrorResponseStruct(id=result.request.request_id, jsonrpc=result.request.jsonrpc, error=error)
+
+        return SuccessResponseStruct(id=result.request.request_id, jsonrpc=result.request.jsonrpc, result=result.data)
+
+    def dumps(self, result: JsonRpcResult | Iterable[JsonRpcResult]) -> str:
+        results: JsonRpcResult | list[JsonRpcResult]
+        if isinstance(result, (RpcSuccessResult, RpcErrorResult)):
+            results = result
+            structured_data: Any = self.result_to_struct(result)
+        else:
+            results = list(result)
+            structured_data = [self.result_to_struct(r) for r in results]
+
+        try:
+            return self.encoder.encode(structured_data).decode("utf-8")
+        except (TypeError, UnicodeDecodeError, OverflowError) as exc:
+            # Build the error message from the standard dict representation, like other backends do
+            raise RPCMarshallingError(Marshaller().result_to_dict(results), exc) from exc
@@ -1,26 +1,35 @@
 from collections.abc import Iterable
 from functools import cached_property
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, ClassVar
 
 import orjson
 from django.utils.module_loading import import_string
 
 from modernrpc.exceptions import RPCMarshallingError, RPCParseError
+from modernrpc.jsonrpc.backends.marshalling import EnvelopeTemplate, RequestLimitsMixin, raw_json_default
 from modernrpc.jsonrpc.handler import JsonRpcRequest, JsonRpcResult
-from modernrpc.types import CustomKwargs
+from modernrpc.types import CustomKwargs, RpcErrorResult, RpcSuccessResult
 
 if TYPE_CHECKING:
+    from mmap import mmap
+
+    from modernrpc.limits import StructureLimits
     from modernrpc.types import DictStrAny
 
 
-class OrjsonDeserializer:
+class OrjsonDeserializer(RequestLimitsMixin):
     """json-rpc deserializer based on the third-party orjson library"""
 
+    # Request bodies spooled to disk are passed as a memory-mapped buffer instead of str (see SpooledRequestBody)
+    accepts_buffer: ClassVar[bool] = True
+
     def __init__(
         self,
         unmarshaller_klass="modernrpc.jsonrpc.backends.marshalling.Unmarshaller",
         unmarshaller_kwargs: CustomKwargs = None,
+        limits: "StructureLimits | DictStrAny | None" = None,
     ):
+        super().__init__(limits)
         self.unmarshaller_klass = import_string(unmarshaller_klass)
         self.unmarshaller_kwargs = unmarshaller_kwargs or {}
         # Note: orjson.loads() does not support additional argument. load_kwargs is useless here
@@ -29,12 +38,19 @@ class OrjsonDeserializer:
     def unmarshaller(self):
         return self.unmarshaller_klass(**self.unmarshaller_kwargs)
 
-    def loads(self, data: str) -> JsonRpcRequest | list[JsonRpcRequest]:
+    def loads(self, data: "str | mmap") -> JsonRpcRequest | list[JsonRpcRequest]:
         try:
-            structured_data: list[DictStrAny] | DictStrAny = orjson.loads(data)
+            if isinstance(data, str):
+                structured_data: list[DictStrAny] | DictStrAny = orjson.loads(data)
+            else:
+                # orjson only accepts memory-mapped buffers through a memoryview. It must be released before the buffer
+                # is closed
+                with memoryview(data) as view:
+                    structured_data = orjson.loads(view)
         except orjson.JSONDecodeError as exc:
             raise RPCParseError(exc.msg, data=exc) from exc
 
+        self.check_limits(structured_data)
         return self.unmarshaller.dict_to_request(structured_data)
 
 
@@ -46,19 +62,35 @@ class OrjsonSerializer:
         marshaller_klass="modernrpc.jsonrpc.backends.marshalling.Marshaller",
         marshaller_kwargs: CustomKwargs = None,
         dump_kwargs: CustomKwargs = None,
+        envelope_template: bool = False,
     ):
         self.marshaller_klass = import_string(marshaller_klass)
         self.marshaller_kwargs = marshaller_kwargs or {}
 
         self.dump_kwargs = dump_kwargs or {}
+        # Write RawJSON results verbatim, using orjson.Fragment
+        self.dump_kwargs["default"] = raw_json_default(orjson.Fragment, self.dump_kwargs.get("default"))
+        # Optional fast path: write the response envelope from a template, only result data is serialized
+        self.envelope_template = (
+            EnvelopeTemplate(self.dumps_value, self.marshaller_klass) if envelope_template else None
+        )
 
     @cached_property
     def marshaller(self):
         return self.marshaller_klass(**self.marshaller_kwargs)
 
+    def dumps_value(self, value: Any) -> str:
+        return orjson.dumps(value, **self.dump_kwargs).decode("utf-8")
+
     def dumps(self, result: JsonRpcResult | Iterable[JsonRpcResult]) -> str:
+        if self.envelope_template and isinstance(result, (RpcSuccessResult, RpcErrorResult)):
+            try:
+                return self.envelope_template.result_to_str(result)
+            except (orjson.JSONEncodeError, UnicodeDecodeError, TypeError) as exc:
+                raise RPCMarshallingError(self.marshaller.result_to_dict(result), exc) from exc
+
         structured_data = self.marshaller.result_to_dict(result)
         try:
-            return orjson.dumps(structured_data, **self.dump_kwargs).decode("utf-8")
+            return self.dumps_value(structured_data)
         except (orjson.JSONEncodeError, UnicodeDecodeError, TypeError) as exc:
             raise RPCMarshallingError(structured_data, exc) from exc
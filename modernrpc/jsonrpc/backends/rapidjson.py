@@ -1,20 +1,22 @@
 from collections.abc import Iterable
 from functools import cached_property
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import rapidjson
 from django.utils.module_loading import import_string
 from rapidjson import JSONDecodeError
 
 from modernrpc.exceptions import RPCMarshallingError, RPCParseError
+from modernrpc.jsonrpc.backends.marshalling import EnvelopeTemplate, RequestLimitsMixin, raw_json_default
 from modernrpc.jsonrpc.handler import JsonRpcRequest, JsonRpcResult
-from modernrpc.types import CustomKwargs
+from modernrpc.types import CustomKwargs, RpcErrorResult, RpcSuccessResult
 
 if TYPE_CHECKING:
+    from modernrpc.limits import StructureLimits
     from modernrpc.types import DictStrAny
 
 
-class RapidjsonDeserializer:
+class RapidjsonDeserializer(RequestLimitsMixin):
     """json-rpc deserializer based on the third-party rapidjson library"""
 
     def __init__(
@@ -22,7 +24,9 @@ class RapidjsonDeserializer:
         unmarshaller_klass="modernrpc.jsonrpc.backends.marshalling.Unmarshaller",
         unmarshaller_kwargs: CustomKwargs = None,
         load_kwargs: CustomKwargs = None,
+        limits: "StructureLimits | DictStrAny | None" = None,
     ):
+        super().__init__(limits)
         self.unmarshaller_klass = import_string(unmarshaller_klass)
         self.unmarshaller_kwargs = unmarshaller_kwargs or {}
 
@@ -37,7 +41,11 @@ class RapidjsonDeserializer:
             structured_data: list[DictStrAny] | DictStrAny = rapidjson.loads(data, **self.load_kwargs)
         except JSONDecodeError as exc:
             raise RPCParseError(str(exc), data=exc) from exc
+        except RecursionError as exc:
+            # Raised by the parser on deeply nested payloads
+            raise RPCParseError(str(exc)) from exc
 
+        self.check_limits(structured_data)
         return self.unmarshaller.dict_to_request(structured_data)
 
 
@@ -49,20 +57,36 @@ class RapidjsonSerializer:
         marshaller_klass="modernrpc.jsonrpc.backends.marshalling.Marshaller",
         marshaller_kwargs: CustomKwargs = None,
         dump_kwargs: CustomKwargs = None,
+        envelope_template: bool = False,
     ):
         self.marshaller_klass = import_string(marshaller_klass)
         self.marshaller_kwargs = marshaller_kwargs or {}
 
         self.dump_kwargs = dump_kwargs or {}
         self.dump_kwargs.setdefault("datetime_mode", rapidjson.DM_ISO8601)
+        # Write RawJSON results verbatim, using rapidjson native support
+        self.dump_kwargs["default"] = raw_json_default(rapidjson.RawJSON, self.dump_kwargs.get("default"))
+        # Optional fast path: write the response envelope from a template, only result data is serialized
+        self.envelope_template = (
+            EnvelopeTemplate(self.dumps_value, self.marshaller_klass) if envelope_template else None
+        )
 
     @cached_property
     def marshaller(self):
         return self.marshaller_klass(**self.marshaller_kwargs)
 
+    def dumps_value(self, value: Any) -> str:
+        return rapidjson.dumps(value, **self.dump_kwargs)
+
     def dumps(self, result: JsonRpcResult | Iterable[JsonRpcResult]) -> str:
+        if self.envelope_template and isinstance(result, (RpcSuccessResult, RpcErrorResult)):
+            try:
+                return self.envelope_template.result_to_str(result)
+            except (TypeError, UnicodeDecodeError) as exc:
+                raise RPCMarshallingError(self.marshaller.result_to_dict(result), exc) from exc
+
         structured_data = self.marshaller.result_to_dict(result)
         try:
-            return rapidjson.dumps(structured_data, **self.dump_kwargs)
+            return self.dumps_value(structured_data)
         except (TypeError, UnicodeDecodeError) as exc:
             raise RPCMarshallingError(structured_data, exc) from exc
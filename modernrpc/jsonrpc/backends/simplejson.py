@@ -1,6 +1,6 @@
 from collections.abc import Iterable
 from functools import cached_property, partial
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import simplejson
 from django.core.serializers.json import DjangoJSONEncoder
@@ -8,14 +8,16 @@ from django.utils.module_loading import import_string
 from simplejson import JSONDecodeError
 
 from modernrpc.exceptions import RPCMarshallingError, RPCParseError
+from modernrpc.jsonrpc.backends.marshalling import EnvelopeTemplate, RequestLimitsMixin, raw_json_default
 from modernrpc.jsonrpc.handler import JsonRpcRequest, JsonRpcResult
-from modernrpc.types import CustomKwargs
+from modernrpc.types import CustomKwargs, RpcErrorResult, RpcSuccessResult
 
 if TYPE_CHECKING:
+    from modernrpc.limits import StructureLimits
     from modernrpc.types import DictStrAny
 
 
-class SimplejsonDeserializer:
+class SimplejsonDeserializer(RequestLimitsMixin):
     """json-rpc deserializer based on the third-party simplejson library"""
 
     def __init__(
@@ -23,7 +25,9 @@ class SimplejsonDeserializer:
         unmarshaller_klass="modernrpc.jsonrpc.backends.marshalling.Unmarshaller",
         unmarshaller_kwargs: CustomKwargs = None,
         load_kwargs: CustomKwargs = None,
+        limits: "StructureLimits | DictStrAny | None" = None,
     ):
+        super().__init__(limits)
         self.unmarshaller_klass = import_string(unmarshaller_klass)
         self.unmarshaller_kwargs = unmarshaller_kwargs or {}
 
@@ -38,7 +42,11 @@ class SimplejsonDeserializer:
             structured_data: list[DictStrAny] | DictStrAny = simplejson.loads(data, **self.load_kwargs)
         except JSONDecodeError as exc:
             raise RPCParseError(exc.msg, data=exc) from exc
+        except RecursionError as exc:
+            # Raised by the parser on deeply nested payloads
+            raise RPCParseError(str(exc)) from exc
 
+        self.check_limits(structured_data)
         return self.unmarshaller.dict_to_request(structured_data)
 
 
@@ -50,6 +58,7 @@ class SimplejsonSerializer:
         marshaller_klass="modernrpc.jsonrpc.backends.marshalling.Marshaller",
         marshaller_kwargs: CustomKwargs = None,
         dump_kwargs: CustomKwargs = None,
+        envelope_template: bool = False,
     ):
         self.marshaller_klass = import_string(marshaller_klass)
         self.marshaller_kwargs = marshaller_kwargs or {}
@@ -60,14 +69,29 @@ class SimplejsonSerializer:
         # simplejson.dumps() doc says "NOTE: You should use default instead of subclassing whenever possible"
         # So let's define a custom function based on DjangoJSONEncoder.default using functools.partial
         self.dump_kwargs.setdefault("default", partial(DjangoJSONEncoder.default, DjangoJSONEncoder()))
+        # Write RawJSON results verbatim, using simplejson native support
+        self.dump_kwargs["default"] = raw_json_default(simplejson.RawJSON, self.dump_kwargs["default"])
+        # Optional fast path: write the response envelope from a template, only result data is serialized
+        self.envelope_template = (
+            EnvelopeTemplate(self.dumps_value, self.marshaller_klass) if envelope_template else None
+        )
 
     @cached_property
     def marshaller(self):
         return self.marshaller_klass(**self.marshaller_kwargs)
 
+    def dumps_value(self, value: Any) -> str:
+        return simplejson.dumps(value, **self.dump_kwargs)
+
     def dumps(self, result: JsonRpcResult | Iterable[JsonRpcResult]) -> str:
+        if self.envelope_template and isinstance(result, (RpcSuccessResult, RpcErrorResult)):
+            try:
+                return self.envelope_template.result_to_str(result)
+            except (TypeError, UnicodeDecodeError) as exc:
+                raise RPCMarshallingError(self.marshaller.result_to_dict(result), exc) from exc
+
         structured_data = self.marshaller.result_to_dict(result)
         try:
-            return simplejson.dumps(structured_data, **self.dump_kwargs)
+            return self.dumps_value(structured_data)
         except (TypeError, UnicodeDecodeError) as exc:
             raise RPCMarshallingError(structured_data, exc) from exc
@@ -1,6 +1,6 @@
 from collections.abc import Iterable
 from functools import cached_property, partial
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import ujson
 from django.core.serializers.json import DjangoJSONEncoder
@@ -8,14 +8,16 @@ from django.utils.module_loading import import_string
 from ujson import JSONDecodeError
 
 from modernrpc.exceptions import RPCMarshallingError, RPCParseError
+from modernrpc.jsonrpc.backends.marshalling import EnvelopeTemplate, RawJSONSplicer, RequestLimitsMixin
 from modernrpc.jsonrpc.handler import JsonRpcRequest, JsonRpcResult
-from modernrpc.types import CustomKwargs
+from modernrpc.types import CustomKwargs, RpcErrorResult, RpcSuccessResult
 
 if TYPE_CHECKING:
+    from modernrpc.limits import StructureLimits
     from modernrpc.types import DictStrAny
 
 
-class UjsonDeserializer:
+class UjsonDeserializer(RequestLimitsMixin):
     """json-rpc deserializer based on the third-party ujson library"""
 
     def __init__(
@@ -23,7 +25,9 @@ class UjsonDeserializer:
         unmarshaller_klass="modernrpc.jsonrpc.backends.marshalling.Unmarshaller",
         unmarshaller_kwargs: CustomKwargs = None,
         load_kwargs: CustomKwargs = None,
+        limits: "StructureLimits | DictStrAny | None" = None,
     ):
+        super().__init__(limits)
         self.unmarshaller_klass = import_string(unmarshaller_klass)
         self.unmarshaller_kwargs = unmarshaller_kwargs or {}
 
@@ -39,6 +43,7 @@ class UjsonDeserializer:
         except JSONDecodeError as exc:
             raise RPCParseError(str(exc), data=exc) from exc
 
+        self.check_limits(structured_data)
         return self.unmarshaller.dict_to_request(structured_data)
 
 
@@ -50,6 +55,7 @@ class UjsonSerializer:
         marshaller_klass="modernrpc.jsonrpc.backends.marshalling.Marshaller",
         marshaller_kwargs: CustomKwargs = None,
         dump_kwargs: CustomKwargs = None,
+        envelope_template: bool = False,
     ):
         self.marshaller_klass = import_string(marshaller_klass)
         self.marshaller_kwargs = marshaller_kwargs or {}
@@ -58,14 +64,29 @@ class UjsonSerializer:
         # ujson.dumps() does not support the 'cls' argument but accepts a 'default' callable, like simplejson.
         # Build one from DjangoJSONEncoder.default to transparently serialize date, time and datetime objects.
         self.dump_kwargs.setdefault("default", partial(DjangoJSONEncoder.default, DjangoJSONEncoder()))
+        # Optional fast path: write the response envelope from a template, only result data is serialized
+        self.envelope_template = (
+            EnvelopeTemplate(self.dumps_value, self.marshaller_klass) if envelope_template else None
+        )
 
     @cached_property
     def marshaller(self):
         return self.marshaller_klass(**self.marshaller_kwargs)
 
+    def dumps_value(self, value: Any) -> str:
+        # ujson can't write raw JSON fragments, RawJSON instances are handled by a RawJSONSplicer
+        splicer = RawJSONSplicer(self.dump_kwargs["default"])
+        return splicer.splice(ujson.dumps(value, **{**self.dump_kwargs, "default": splicer.default}))
+
     def dumps(self, result: JsonRpcResult | Iterable[JsonRpcResult]) -> str:
+        if self.envelope_template and isinstance(result, (RpcSuccessResult, RpcErrorResult)):
+            try:
+                return self.envelope_template.result_to_str(result)
+            except (TypeError, UnicodeDecodeError, OverflowError) as exc:
+                raise RPCMarshallingError(self.marshaller.result_to_dict(result), exc) from exc
+
         structured_data = self.marshaller.result_to_dict(result)
         try:
-            return ujson.dumps(structured_data, **self.dump_kwargs)
+            return self.dumps_value(structured_data)
         except (TypeError, UnicodeDecodeError, OverflowError) as exc:
             raise RPCMarshallingError(structured_data, exc) from exc
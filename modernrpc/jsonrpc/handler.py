@@ -1,22 +1,28 @@
 import asyncio
+import json
 import logging
-from dataclasses import dataclass, field
+from collections.abc import AsyncIterator, Callable, Hashable, Iterable, Iterator
+from dataclasses import dataclass, field, replace
 from http import HTTPStatus
-from typing import TYPE_CHECKING, ClassVar, TypeAlias, cast
+from typing import TYPE_CHECKING, Any, ClassVar, TypeAlias, cast
 
-from django.utils.module_loading import import_string
+from django.http import HttpRequest, QueryDict
 
 from modernrpc import Protocol, RpcRequestContext
+from modernrpc.backends import BackendProbe, load_backend
 from modernrpc.config import settings
 from modernrpc.constants import NOT_SET
-from modernrpc.exceptions import RPCException
-from modernrpc.handler import RpcHandler
+from modernrpc.exceptions import RPCException, RPCInvalidRequest, RPCMethodNotFound
+from modernrpc.handler import CacheableRpcHandler, RequestBody, RpcHandler
 from modernrpc.types import DictStrAny, RpcErrorResult, RpcRequest, RpcSuccessResult
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
-
-    from modernrpc.jsonrpc.backends import JsonRpcDeserializer, JsonRpcSerializer
+    from modernrpc.jsonrpc.backends import (
+        BinaryJsonRpcDeserializer,
+        BinaryJsonRpcSerializer,
+        JsonRpcDeserializer,
+        JsonRpcSerializer,
+    )
 
 logger = logging.getLogger(__name__)
 
@@ -39,32 +45,130 @@ class JsonRpcRequest(RpcRequest):
         return self.request_id is NOT_SET
 
 
+class RawJSON:
+    """
+    Wrap an already serialized JSON document. When returned by a procedure (or nested in its result), the content is
+    written verbatim into the response, without being parsed and serialized again. The content is not validated.
+    """
+
+    # Note: this must not be a dataclass, since some libraries (orjson, msgspec) natively serialize dataclasses
+    __slots__ = ("data",)
+
+    def __init__(self, data: str):
+        self.data = data
+
+    def __repr__(self) -> str:
+        return f"RawJSON({self.data!r})"
+
+
 JsonRpcSuccessResult: TypeAlias = RpcSuccessResult[JsonRpcRequest]
 JsonRpcErrorResult: TypeAlias = RpcErrorResult[JsonRpcRequest]
 JsonRpcResult: TypeAlias = JsonRpcSuccessResult | JsonRpcErrorResult
 
+# Representative data used to check (and calibrate) candidate backends, when a backend setting is "auto"
+PROBE_PARAMS = [1, -2.5, "caf\u00e9", None, True, [1, 2], {"key": "value"}]
+PROBE_REQUEST_BODY = json.dumps({"jsonrpc": "2.0", "id": 42, "method": "system.probe", "params": PROBE_PARAMS})
+
+DESERIALIZER_PROBE = BackendProbe(
+    run=lambda deserializer: deserializer.loads(PROBE_REQUEST_BODY),
+    check=lambda request: (
+        request.method_name == "system.probe" and list(request.args) == PROBE_PARAMS and request.request_id == 42
+    ),
+)
+SERIALIZER_PROBE = BackendProbe(
+    run=lambda serializer: serializer.dumps(
+        JsonRpcSuccessResult(request=JsonRpcRequest(method_name="system.probe", request_id=42), data=PROBE_PARAMS)
+    ),
+    check=lambda response: json.loads(response) == {"id": 42, "jsonrpc": "2.0", "result": PROBE_PARAMS},
+)
+
+
+def build_binary_probes(
+    dumps: Callable[[Any], bytes], loads: Callable[[bytes], Any]
+) -> tuple[BackendProbe, BackendProbe]:
+    """
+    Return the deserializer and serializer probes for backends of a binary encoding of JSON-RPC. The given functions
+    encode and decode data with the reference library of the format.
+    """
+    request_body = dumps({"jsonrpc": "2.0", "id": 42, "method": "system.probe", "params": PROBE_PARAMS})
+    deserializer_probe = BackendProbe(
+        run=lambda deserializer: deserializer.loads(request_body), check=DESERIALIZER_PROBE.check
+    )
+    serializer_probe = BackendProbe(
+        run=SERIALIZER_PROBE.run,
+        check=lambda response: loads(response) == {"id": 42, "jsonrpc": "2.0", "result": PROBE_PARAMS},
+    )
+    return deserializer_probe, serializer_probe
+
 
-class JsonRpcHandler(RpcHandler[JsonRpcRequest]):
-    """Default JSON-RPC handler implementation"""
+# Written in place of a streamed result array, to find the envelope of the response
+STREAMED_RESULT_PLACEHOLDER = "modernrpc-streamed-result"
+
+
+class BaseJsonRpcHandler(RpcHandler[JsonRpcRequest]):
+    """
+    JSON-RPC implementation for POST requests. Base class of the default handler, and of handlers for other encodings
+    of JSON-RPC, which don't accept GET requests.
+    """
 
     protocol = Protocol.JSON_RPC
     valid_content_types: ClassVar[list[str]] = ["application/json", "application/json-rpc", "application/jsonrequest"]
     response_content_type = "application/json"
     success_result_type = JsonRpcSuccessResult
     error_result_type = JsonRpcErrorResult
+    # When True, batch responses can be streamed (see RpcServer's stream_batch_responses argument)
+    supports_streamed_batch_responses: ClassVar[bool] = True
+    streamed_array_delimiters: ClassVar[tuple[str, str, str] | None] = ("[", ",", "]")
+    # Subclasses handling a binary encoding of JSON-RPC (like MessagePack) use backends working on bytes
+    deserializer: "JsonRpcDeserializer | BinaryJsonRpcDeserializer"
+    serializer: "JsonRpcSerializer | BinaryJsonRpcSerializer"
+
+    # Backends considered when MODERNRPC_JSON_DESERIALIZER or MODERNRPC_JSON_SERIALIZER is "auto", fastest first
+    deserializer_candidates: ClassVar[list[str]] = [
+        "modernrpc.jsonrpc.backends.msgspec.MsgspecDeserializer",
+        "modernrpc.jsonrpc.backends.orjson.OrjsonDeserializer",
+        "modernrpc.jsonrpc.backends.ujson.UjsonDeserializer",
+        "modernrpc.jsonrpc.backends.rapidjson.RapidjsonDeserializer",
+        "modernrpc.jsonrpc.backends.json.PythonJsonDeserializer",
+        "modernrpc.jsonrpc.backends.simplejson.SimplejsonDeserializer",
+    ]
+    serializer_candidates: ClassVar[list[str]] = [
+        "modernrpc.jsonrpc.backends.msgspec.MsgspecSerializer",
+        "modernrpc.jsonrpc.backends.orjson.OrjsonSerializer",
+        "modernrpc.jsonrpc.backends.rapidjson.RapidjsonSerializer",
+        "modernrpc.jsonrpc.backends.ujson.UjsonSerializer",
+        "modernrpc.jsonrpc.backends.json.PythonJsonSerializer",
+        "modernrpc.jsonrpc.backends.simplejson.SimplejsonSerializer",
+    ]
 
     def __init__(self) -> None:
-        deserializer_config = settings.MODERNRPC_JSON_DESERIALIZER
-        deserializer_klass: type[JsonRpcDeserializer] = import_string(deserializer_config["class"])
-        deserializer_kwargs: DictStrAny = deserializer_config.get("kwargs", {})
-        self.deserializer: JsonRpcDeserializer = deserializer_klass(**deserializer_kwargs)
+        self.deserializer = load_backend(
+            settings.MODERNRPC_JSON_DESERIALIZER, self.deserializer_candidates, DESERIALIZER_PROBE
+        )
+        self.serializer = load_backend(settings.MODERNRPC_JSON_SERIALIZER, self.serializer_candidates, SERIALIZER_PROBE)
 
-        serializer_config = settings.MODERNRPC_JSON_SERIALIZER
-        serializer_klass: type[JsonRpcSerializer] = import_string(serializer_config["class"])
-        serializer_kwargs: DictStrAny = serializer_config.get("kwargs", {})
-        self.serializer: JsonRpcSerializer = serializer_klass(**serializer_kwargs)
+        self.batch_window_size: int = settings.MODERNRPC_JSON_BATCH_WINDOW_SIZE
 
-    def process_request(self, request_body: str, context: RpcRequestContext) -> str | tuple[HTTPStatus, str]:
+    @property
+    def text_serializer(self) -> "JsonRpcSerializer":
+        """
+        Return the serializer, for features writing JSON text around serialized results (streamed results and batch
+        responses). Subclasses using a binary serializer must disable these features.
+        """
+        return cast("JsonRpcSerializer", self.serializer)
+
+    def build_invalid_payload_result(self, exc: RPCException, context: RpcRequestContext) -> JsonRpcErrorResult:
+        """
+        Build an error result for a payload that cannot be parsed. We can't extract request_id from such payload,
+        according to the spec, a null 'id' should be used in response.
+        """
+        fake_request = JsonRpcRequest(request_id=None, method_name="")
+        rpc_exc = context.server.on_error(exc, context)
+        return self.build_error_result(fake_request, rpc_exc.code, rpc_exc.message)
+
+    def process_request(
+        self, request_body: RequestBody, context: RpcRequestContext
+    ) -> str | bytes | tuple[HTTPStatus, str] | Iterator[str]:
         """
         Parse request and process it, according to its kind. Standard request as well as batch request is supported.
 
@@ -72,32 +176,34 @@ class JsonRpcHandler(RpcHandler[JsonRpcRequest]):
         result of `parse_request()`, a standard or a batch request will be handled here.
         """
         try:
-            parsed_request = self.deserializer.loads(request_body)
+            parsed_request = self.loads_request_body(request_body)
 
         except RPCException as exc:
-            # We can't extract request_id from an incoming request. According to the spec, a
-            # null 'id' should be used in response payload
-            fake_request = JsonRpcRequest(request_id=None, method_name="")
-            rpc_exc = context.server.on_error(exc, context)
-            return self.serializer.dumps(self.build_error_result(fake_request, rpc_exc.code, rpc_exc.message))
+            return self.serializer.dumps(self.build_invalid_payload_result(exc, context))
 
-        # Parsed request is a list, we should handle it as a batch request
-        if isinstance(parsed_request, list):
-            return self.process_batch_request(cast("list[JsonRpcRequest]", parsed_request), context)
+        # Parsed request is a list (or an iterator, for incremental deserializers), handle it as a batch request
+        if not isinstance(parsed_request, JsonRpcRequest):
+            return self.process_batch_request(cast("Iterable[JsonRpcRequest]", parsed_request), context)
 
-        # By default, handle a standard single request
-        result = self.process_single_request(parsed_request, context)
+        # By default, handle a standard single request. Results of generator procedures are streamed
+        streamable = self.streamed_array_delimiters is not None and not parsed_request.is_notification
+        result = self.process_single_request(parsed_request, context, streamable=streamable)
 
         if parsed_request.is_notification:
             return HTTPStatus.NO_CONTENT, ""
 
+        if self.is_streamed_result(result):
+            return self.stream_result(result, context)
+
         try:
             return self.serializer.dumps(result)
         except RPCException as exc:
             rpc_exc = context.server.on_error(exc, context)
             return self.serializer.dumps(self.build_error_result(parsed_request, rpc_exc.code, rpc_exc.message))
 
-    async def aprocess_request(self, request_body: str, context: RpcRequestContext) -> str | tuple[HTTPStatus, str]:
+    async def aprocess_request(
+        self, request_body: RequestBody, context: RpcRequestContext
+    ) -> str | bytes | tuple[HTTPStatus, str] | AsyncIterator[str]:
         """
         Parse request and process it, according to its kind. Standard request as well as batch request is supported.
 
@@ -105,54 +211,80 @@ class JsonRpcHandler(RpcHandler[JsonRpcRequest]):
         result of `parse_request()`, a standard or a batch request will be handled here.
         """
         try:
-            parsed_request = self.deserializer.loads(request_body)
+            parsed_request = self.loads_request_body(request_body)
 
         except RPCException as exc:
-            # We can't extract request_id from an incoming request. According to the spec, a
-            # null 'id' should be used in response payload
-            fake_request = JsonRpcRequest(request_id=None, method_name="")
-            rpc_exc = context.server.on_error(exc, context)
-            return self.serializer.dumps(self.build_error_result(fake_request, rpc_exc.code, rpc_exc.message))
+            return self.serializer.dumps(self.build_invalid_payload_result(exc, context))
 
-        # Parsed request is a list, we should handle it as a batch request
-        if isinstance(parsed_request, list):
-            return await self.aprocess_batch_request(cast("list[JsonRpcRequest]", parsed_request), context)
+        # Parsed request is a list (or an iterator, for incremental deserializers), handle it as a batch request
+        if not isinstance(parsed_request, JsonRpcRequest):
+            return await self.aprocess_batch_request(cast("Iterable[JsonRpcRequest]", parsed_request), context)
 
-        # By default, handle a standard single request
-        result = await self.aprocess_single_request(parsed_request, context)
+        # By default, handle a standard single request. Results of generator procedures are streamed
+        streamable = self.streamed_array_delimiters is not None and not parsed_request.is_notification
+        result = await self.aprocess_single_request(parsed_request, context, streamable=streamable)
 
         if parsed_request.is_notification:
             return HTTPStatus.NO_CONTENT, ""
 
+        if self.is_streamed_result(result):
+            return await self.astream_result(result, context)
+
         try:
             return self.serializer.dumps(result)
         except RPCException as exc:
             rpc_exc = context.server.on_error(exc, context)
             return self.serializer.dumps(self.build_error_result(parsed_request, rpc_exc.code, rpc_exc.message))
 
+    def get_streamed_envelope(self, result: JsonRpcSuccessResult, serialized: str) -> tuple[str, str]:
+        # The result array is replaced by a unique placeholder, written verbatim by the serializer
+        placeholder = STREAMED_RESULT_PLACEHOLDER
+        serialized_envelope = self.text_serializer.dumps(replace(result, data=RawJSON(placeholder)))
+        prefix, found, suffix = serialized_envelope.partition(placeholder)
+        if not found:
+            raise ValueError("Unexpected serialized response format, unable to stream the result")
+        return prefix, suffix
+
     def process_batch_request(
-        self, requests: list[JsonRpcRequest], context: RpcRequestContext
-    ) -> str | tuple[HTTPStatus, str]:
-        # Process each request and store corresponding results (success or error)
-        results: Iterator[JsonRpcResult] = (self.process_single_request(request, context) for request in requests)
+        self, requests: Iterable[JsonRpcRequest], context: RpcRequestContext
+    ) -> str | bytes | tuple[HTTPStatus, str]:
+        # Process each request and store corresponding results (success or error), except for notifications
+        results: list[JsonRpcResult] = []
+        try:
+            for result in self.process_requests(requests, context):
+                if result.request.is_notification:
+                    continue
+                results.append(result)
 
-        # Filter out notification results
-        filtered_results = [result for result in results if not result.request.is_notification]
+        except RPCException as exc:
+            # Incremental deserializers may fail to parse the remaining part of the batch after some calls have
+            # already been executed. In such case, append a single error result with a null 'id'
+            results.append(self.build_invalid_payload_result(exc, context))
 
         # Return JSON-serialized response list
-        if filtered_results:
-            return self.serializer.dumps(filtered_results)
+        if results:
+            return self.serializer.dumps(results)
 
         # Notifications-only batch request returns 204 no content
         return HTTPStatus.NO_CONTENT, ""
 
     async def aprocess_batch_request(
-        self, requests: list[JsonRpcRequest], context: RpcRequestContext
-    ) -> str | tuple[HTTPStatus, str]:
+        self, requests: Iterable[JsonRpcRequest], context: RpcRequestContext
+    ) -> str | bytes | tuple[HTTPStatus, str] | AsyncIterator[str]:
+        # When enabled, stream responses as soon as they are available (notifications-only batch excepted)
+        if (
+            context.server.stream_batch_responses
+            and self.supports_streamed_batch_responses
+            and isinstance(requests, list)
+            and not all(request.is_notification for request in requests)
+        ):
+            return self.astream_batch_results(requests, context)
+
         # Process each request and store corresponding results (success or error)
-        results: list[JsonRpcResult] = await asyncio.gather(
-            *(self.aprocess_single_request(request, context) for request in requests)
-        )
+        if isinstance(requests, list):
+            results: list[JsonRpcResult] = await self.aprocess_requests(requests, context)
+        else:
+            results = await self.aprocess_requests_window(requests, context)
 
         # Filter out notification results
         filtered_results = [result for result in results if not result.request.is_notification]
@@ -163,3 +295,173 @@ class JsonRpcHandler(RpcHandler[JsonRpcRequest]):
 
         # Notifications-only batch request returns 204 no content
         return HTTPStatus.NO_CONTENT, ""
+
+    async def astream_batch_results(
+        self, requests: list[JsonRpcRequest], context: RpcRequestContext
+    ) -> AsyncIterator[str]:
+        """
+        Execute all requests concurrently and yield each serialized response as soon as the corresponding call is
+        completed. Yielded chunks build a valid JSON array. Responses are matched by their 'id' on the client side, so
+        the order of the batch doesn't need to be preserved.
+
+        Identical calls to idempotent procedures are executed only once, their result is yielded for each request.
+        """
+        tasks: list[asyncio.Task[JsonRpcResult]] = []
+        executed_requests: dict[Hashable, JsonRpcRequest] = {}
+        # Requests sharing the result of another one, indexed by the id() of the request actually executed
+        duplicates: dict[int, list[JsonRpcRequest]] = {}
+
+        for request in requests:
+            key = self.get_call_key(request, context)
+            if key in executed_requests:
+                duplicates[id(executed_requests[key])].append(request)
+                continue
+
+            tasks.append(asyncio.ensure_future(self.aprocess_single_request(request, context)))
+            duplicates[id(request)] = []
+            if key is not None:
+                executed_requests[key] = request
+
+        self.log_deduplicated_calls(len(requests) - len(tasks))
+
+        prefix = "["
+        try:
+            for next_completed in asyncio.as_completed(tasks):
+                result = await next_completed
+                fanned_out = (self.fan_out_result(result, request) for request in duplicates[id(result.request)])
+                for request_result in (result, *fanned_out):
+                    if request_result.request.is_notification:
+                        continue
+                    yield prefix + self.dumps_batch_result(request_result, context)
+                    prefix = ","
+            yield "]"
+        finally:
+            # The client may have disconnected before the end of the response
+            for task in tasks:
+                task.cancel()
+
+    def dumps_batch_result(self, result: JsonRpcResult, context: RpcRequestContext) -> str:
+        """Serialize a single result from a batch request. On serialization error, serialize an error result instead"""
+        try:
+            return self.text_serializer.dumps(result)
+        except RPCException as exc:
+            rpc_exc = context.server.on_error(exc, context)
+            return self.text_serializer.dumps(self.build_error_result(result.request, rpc_exc.code, rpc_exc.message))
+
+    async def aprocess_requests_window(
+        self, requests: Iterable[JsonRpcRequest], context: RpcRequestContext
+    ) -> list[JsonRpcResult]:
+        """
+        Execute requests as soon as they are produced by the given iterable, keeping at most `batch_window_size`
+        calls running at the same time. Results are returned in the same order as requests.
+
+        Identical calls to idempotent procedures are executed only once, their result is returned for each request.
+        """
+        processed_requests: list[JsonRpcRequest] = []
+        tasks: list[asyncio.Task[JsonRpcResult]] = []
+        known_tasks: dict[Hashable, asyncio.Task[JsonRpcResult]] = {}
+        running: set[asyncio.Task[JsonRpcResult]] = set()
+        parse_error: JsonRpcResult | None = None
+
+        try:
+            for request in requests:
+                processed_requests.append(request)
+                key = self.get_call_key(request, context)
+                if key in known_tasks:
+                    tasks.append(known_tasks[key])
+                    continue
+
+                if len(running) >= self.batch_window_size:
+                    _, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+
+                task = asyncio.ensure_future(self.aprocess_single_request(request, context))
+                tasks.append(task)
+                running.add(task)
+                if key is not None:
+                    known_tasks[key] = task
+                # Let the new task start before parsing the next request
+                await asyncio.sleep(0)
+
+        except RPCException as exc:
+            parse_error = self.build_invalid_payload_result(exc, context)
+
+        results: list[JsonRpcResult] = [
+            self.fan_out_result(result, request)
+            for result, request in zip(await asyncio.gather(*tasks), processed_requests, strict=True)
+        ]
+        self.log_deduplicated_calls(len(tasks) - len(set(tasks)))
+
+        if parse_error:
+            results.append(parse_error)
+        return results
+
+
+class JsonRpcHandler(CacheableRpcHandler[JsonRpcRequest], BaseJsonRpcHandler):
+    """Default JSON-RPC handler implementation, calls to cacheable procedures can also be sent with GET requests"""
+
+    def parse_get_request(self, query: QueryDict, context: RpcRequestContext) -> JsonRpcRequest | JsonRpcErrorResult:
+        """
+        Build a request from the query string of a GET request: ``?method=<name>&params=<JSON array|object>&id=<id>``.
+        "params" and "id" are optional, the id is always read as a string. Only cacheable procedures can be called this
+        way. Return an error result when the query string is invalid or the procedure is not cacheable.
+        """
+        try:
+            params = json.loads(query.get("params", "[]"))
+        except ValueError as exc:
+            return self.build_invalid_payload_result(RPCInvalidRequest(f"params is not valid JSON ({exc})"), context)
+        if not isinstance(params, list | dict):
+            return self.build_invalid_payload_result(RPCInvalidRequest("params must be an array or an object"), context)
+
+        method_names = query.getlist("method")
+        if len(method_names) != 1:
+            return self.build_invalid_payload_result(RPCInvalidRequest("method must be given exactly once"), context)
+
+        rpc_request = JsonRpcRequest(
+            method_name=method_names[0],
+            args=params if isinstance(params, list) else [],
+            kwargs=params if isinstance(params, dict) else {},
+            request_id=query.get("id"),
+        )
+
+        try:
+            wrapper = context.server.get_procedure_wrapper(rpc_request.method_name, self.protocol)
+            if not wrapper.cacheable:
+                raise RPCInvalidRequest(f'procedure "{rpc_request.method_name}" can only be called with POST requests')
+        except (RPCMethodNotFound, RPCInvalidRequest) as exc:
+            rpc_exc = context.server.on_error(exc, context)
+            return self.build_error_result(rpc_request, rpc_exc.code, rpc_exc.message, rpc_exc.data)
+
+        return rpc_request
+
+
+class BinaryJsonRpcHandler(BaseJsonRpcHandler):
+    """
+    Base class for handlers of a binary encoding of JSON-RPC. Requests and responses follow JSON-RPC 2.0 semantics
+    (including batch requests and notifications), procedures available in JSON-RPC can be called. Subclasses define
+    content types, backends settings and candidates, and the probes returned by build_binary_probes().
+    """
+
+    # Batch responses (and generator results) are built as JSON arrays when streamed
+    supports_streamed_batch_responses = False
+    streamed_array_delimiters = None
+    deserializer: "BinaryJsonRpcDeserializer"
+    serializer: "BinaryJsonRpcSerializer"
+
+    # Names of the settings configuring backends, and probes used to check candidates when these settings are "auto"
+    deserializer_setting: ClassVar[str]
+    serializer_setting: ClassVar[str]
+    deserializer_probe: ClassVar[BackendProbe]
+    serializer_probe: ClassVar[BackendProbe]
+
+    def __init__(self) -> None:
+        self.deserializer = load_backend(
+            getattr(settings, self.deserializer_setting), self.deserializer_candidates, self.deserializer_probe
+        )
+        self.serializer = load_backend(
+            getattr(settings, self.serializer_setting), self.serializer_candidates, self.serializer_probe
+        )
+
+        self.batch_window_size = settings.MODERNRPC_JSON_BATCH_WINDOW_SIZE
+
+    def decode_request_body(self, request: HttpRequest, default_encoding: str) -> bytes:
+        return request.body
@@ -0,0 +1,106 @@
+import sys
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from modernrpc.exceptions import RPCInvalidRequest
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+# Replaces disabled limits in comparisons
+UNLIMITED = sys.maxsize
+
+
+@dataclass(frozen=True)
+class StructureLimits:
+    """
+    Limits on the structure of incoming requests, checked by deserializers while requests are parsed or unmarshalled.
+    Requests exceeding any of them are rejected with RPCInvalidRequest. Set a limit to None to disable it.
+
+    - max_depth: maximum nesting level of arrays and structs
+    - max_values: maximum number of values in a request (params, array items and struct member values, at any depth)
+    - max_array_length: maximum number of items in a single array
+    - max_struct_members: maximum number of members in a single struct
+    - max_string_length: maximum length of string values and struct member names
+    - max_batch_size: maximum number of calls in a JSON-RPC batch request
+    """
+
+    max_depth: int | None = 64
+    max_values: int | None = None
+    max_array_length: int | None = None
+    max_struct_members: int | None = None
+    max_string_length: int | None = None
+    max_batch_size: int | None = None
+
+    @classmethod
+    def build(cls, limits: "StructureLimits | dict[str, Any] | None") -> "StructureLimits":
+        """Return a StructureLimits instance from the given value, as found in backends kwargs"""
+        if isinstance(limits, StructureLimits):
+            return limits
+        return cls(**(limits or {}))
+
+    def check_depth(self, depth: int) -> None:
+        if self.max_depth is not None and depth > self.max_depth:
+            raise RPCInvalidRequest(f"maximum nesting depth exceeded ({self.max_depth})")
+
+    def check_values(self, count: int) -> None:
+        if self.max_values is not None and count > self.max_values:
+            raise RPCInvalidRequest(f"maximum number of values exceeded ({self.max_values})")
+
+    def check_array_length(self, length: int) -> None:
+        if self.max_array_length is not None and length > self.max_array_length:
+            raise RPCInvalidRequest(f"maximum array length exceeded ({self.max_array_length})")
+
+    def check_struct_members(self, count: int) -> None:
+        if self.max_struct_members is not None and count > self.max_struct_members:
+            raise RPCInvalidRequest(f"maximum number of struct members exceeded ({self.max_struct_members})")
+
+    def check_string_length(self, value: str) -> str:
+        if self.max_string_length is not None and len(value) > self.max_string_length:
+            raise RPCInvalidRequest(f"maximum string length exceeded ({self.max_string_length})")
+        return value
+
+    def check_batch_size(self, size: int) -> None:
+        if self.max_batch_size is not None and size > self.max_batch_size:
+            raise RPCInvalidRequest(f"maximum batch size exceeded ({self.max_batch_size})")
+
+    def check_container(self, container: list | dict) -> "Iterable[Any]":
+        """Check limits on a single array or struct (but not on its items). Return its items"""
+        if type(container) is not dict:
+            self.check_array_length(len(container))
+            return container
+
+        self.check_struct_members(len(container))
+        if self.max_string_length is not None:
+            max_string_length = self.max_string_length
+            for key in container:
+                if type(key) is str and len(key) > max_string_length:
+                    self.check_string_length(key)
+        return container.values()
+
+    def check_data(self, data: list | dict) -> None:
+        """
+        Check all limits on the given params, as decoded by a parser (lists, dicts and scalar values). The params
+        container itself is at depth 0. Nested containers are walked iteratively, so any depth can be checked safely.
+        """
+        # This is called for each request, limits are compared inline and disabled ones replaced by unreachable values
+        max_depth = UNLIMITED if self.max_depth is None else self.max_depth
+        max_values = UNLIMITED if self.max_values is None else self.max_values
+        max_string_length = UNLIMITED if self.max_string_length is None else self.max_string_length
+
+        values_count = 0
+        stack: list[tuple[Any, int]] = [(data, 0)]
+        while stack:
+            container, depth = stack.pop()
+            values_count += len(container)
+            if values_count > max_values:
+                self.check_values(values_count)
+
+            for item in self.check_container(container):
+                item_type = type(item)
+                if item_type is list or item_type is dict:
+                    if depth >= max_depth:
+                        self.check_depth(depth + 1)
+                    stack.append((item, depth + 1))
+                elif item_type is str and len(item) > max_string_length:
+                    self.check_string_length(item)
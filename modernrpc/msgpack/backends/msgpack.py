@@ -0,0 +1,85 @@
+import datetime as dt
+import json
+from collections.abc import Iterable
+from functools import cached_property
+from typing import Any
+
+import msgpack
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from modernrpc.exceptions import RPCMarshallingError, RPCParseError
+from modernrpc.jsonrpc.backends.marshalling import raw_json_default
+from modernrpc.jsonrpc.handler import JsonRpcRequest, JsonRpcResult
+from modernrpc.types import CustomKwargs
+
+
+def msgpack_default(obj: Any) -> Any:
+    """
+    Convert objects not natively supported by msgpack. Naive datetimes are made aware in the current time zone, to be
+    packed as Timestamp extension type. Other types are converted like DjangoJSONEncoder does.
+    """
+    if isinstance(obj, dt.datetime) and timezone.is_naive(obj):
+        return timezone.make_aware(obj)
+    return DjangoJSONEncoder().default(obj)
+
+
+class MsgpackDeserializer:
+    """msgpack-rpc deserializer based on the third-party msgpack library"""
+
+    def __init__(
+        self,
+        unmarshaller_klass="modernrpc.jsonrpc.backends.marshalling.Unmarshaller",
+        unmarshaller_kwargs: CustomKwargs = None,
+        load_kwargs: CustomKwargs = None,
+    ):
+        self.unmarshaller_klass = import_string(unmarshaller_klass)
+        self.unmarshaller_kwargs = unmarshaller_kwargs or {}
+
+        self.load_kwargs = load_kwargs or {}
+        # Timestamp extension type is unpacked as (aware) datetime
+        self.load_kwargs.setdefault("timestamp", 3)
+
+    @cached_property
+    def unmarshaller(self):
+        return self.unmarshaller_klass(**self.unmarshaller_kwargs)
+
+    def loads(self, data: bytes) -> JsonRpcRequest | list[JsonRpcRequest]:
+        try:
+            structured_data = msgpack.unpackb(data, **self.load_kwargs)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise RPCParseError(str(exc) or exc.__class__.__name__, data=exc) from exc
+
+        return self.unmarshaller.dict_to_request(structured_data)
+
+
+class MsgpackSerializer:
+    """msgpack-rpc serializer based on the third-party msgpack library"""
+
+    def __init__(
+        self,
+        marshaller_klass="modernrpc.jsonrpc.backends.marshalling.Marshaller",
+        marshaller_kwargs: CustomKwargs = None,
+        dump_kwargs: CustomKwargs = None,
+    ):
+        self.marshaller_klass = import_string(marshaller_klass)
+        self.marshaller_kwargs = marshaller_kwargs or {}
+
+        self.dump_kwargs = dump_kwargs or {}
+        # Aware datetimes are packed as Timestamp extension type
+        self.dump_kwargs.setdefault("datetime", True)
+        self.dump_kwargs.setdefault("default", msgpack_default)
+        # RawJSON results can't be written verbatim, they are parsed and packed as any other value
+        self.dump_kwargs["default"] = raw_json_default(json.loads, self.dump_kwargs["default"])
+
+    @cached_property
+    def marshaller(self):
+        return self.marshaller_klass(**self.marshaller_kwargs)
+
+    def dumps(self, result: JsonRpcResult | Iterable[JsonRpcResult]) -> bytes:
+        structured_data = self.marshaller.result_to_dict(result)
+        try:
+            return msgpack.packb(structured_data, **self.dump_kwargs)
+        except (TypeError, ValueError, OverflowError) as exc:
+            raise RPCMarshallingError(structured_data, exc) from exc
@@ -0,0 +1,30 @@
+from typing import ClassVar
+
+import msgpack
+
+from modernrpc.jsonrpc.handler import BinaryJsonRpcHandler, build_binary_probes
+
+# Representative data used to check (and calibrate) candidate backends, when a backend setting is "auto"
+DESERIALIZER_PROBE, SERIALIZER_PROBE = build_binary_probes(msgpack.packb, msgpack.unpackb)
+
+
+class MsgpackRpcHandler(BinaryJsonRpcHandler):
+    """
+    MessagePack RPC handler. Requests and responses follow JSON-RPC 2.0 semantics (including batch requests and
+    notifications), but are encoded with MessagePack instead of JSON. Procedures available in JSON-RPC can be called.
+    """
+
+    valid_content_types: ClassVar[list[str]] = [
+        "application/msgpack",
+        "application/x-msgpack",
+        "application/vnd.msgpack",
+    ]
+    response_content_type = "application/msgpack"
+
+    # Backends considered when MODERNRPC_MSGPACK_DESERIALIZER or MODERNRPC_MSGPACK_SERIALIZER is "auto"
+    deserializer_setting = "MODERNRPC_MSGPACK_DESERIALIZER"
+    serializer_setting = "MODERNRPC_MSGPACK_SERIALIZER"
+    deserializer_candidates: ClassVar[list[str]] = ["modernrpc.msgpack.backends.msgpack.MsgpackDeserializer"]
+    serializer_candidates: ClassVar[list[str]] = ["modernrpc.msgpack.backends.msgpack.MsgpackSerializer"]
+    deserializer_probe = DESERIALIZER_PROBE
+    serializer_probe = SERIALIZER_PROBE
@@ -0,0 +1,150 @@
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import replace
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from django.http import HttpRequest, HttpResponse
+from django.middleware.csrf import CsrfViewMiddleware
+from django.utils.datastructures import MultiValueDict
+
+from modernrpc import RpcRequestContext
+from modernrpc.exceptions import RPCException, RPCInvalidParams, RPCInvalidRequest, RPCParseError
+from modernrpc.handler import RequestBody
+from modernrpc.jsonrpc.handler import BaseJsonRpcHandler, JsonRpcRequest, JsonRpcResult
+
+if TYPE_CHECKING:
+    from modernrpc.jsonrpc.backends import JsonRpcSerializer
+
+
+class MultipartRpcHandler(BaseJsonRpcHandler):
+    """
+    multipart/form-data JSON-RPC handler. One part of the request contains the JSON-RPC request (single or batch), the
+    other parts contain raw files, sent without base64 encoding. Params reference files by part name, using an object
+    like {"$file": "<part name>"}, which is replaced by the corresponding Django UploadedFile before the procedure is
+    called.
+
+    Files are handled by Django upload handlers: small files are kept in memory, larger ones are written to temporary
+    files (see FILE_UPLOAD_MAX_MEMORY_SIZE setting).
+
+    Unlike other RPC requests, multipart/form-data requests can be sent cross-origin by browsers, with the user's
+    cookies and without a CORS preflight request. To protect session-authenticated procedures against CSRF, requests
+    are rejected unless they carry the csrf_header_name header or a valid Django CSRF token.
+    """
+
+    valid_content_types: ClassVar[list[str]] = ["multipart/form-data"]
+    # Name of the part containing the JSON-RPC request. It can be sent as a regular form field or as a file
+    request_part_name: ClassVar[str] = "request"
+    # Key of the objects used in params to reference a file part
+    file_reference_key: ClassVar[str] = "$file"
+    # Responses are serialized as JSON text
+    serializer: "JsonRpcSerializer"
+    # Custom header sent by RPC clients. Browsers send it cross-origin only after a successful CORS preflight request
+    csrf_header_name: ClassVar[str] = "X-Requested-With"
+
+    def is_csrf_protected(self, request: HttpRequest) -> bool:
+        """
+        Return True when the given request can't have been forged by a third-party page: it carries the csrf_header_name
+        header, or passes Django CSRF checks (token sent in the csrfmiddlewaretoken part or in the X-CSRFToken header)
+        """
+        if self.csrf_header_name in request.headers:
+            return True
+
+        # Run CSRF checks the way CsrfViewMiddleware does for views not decorated with csrf_exempt
+        csrf_check = CsrfViewMiddleware(lambda _: HttpResponse())
+        csrf_check.process_request(request)
+        return csrf_check.process_view(request, lambda _: HttpResponse(), (), {}) is None
+
+    def build_csrf_error_response(self, context: RpcRequestContext) -> tuple[HTTPStatus, str]:
+        exc = RPCInvalidRequest(
+            f"multipart/form-data requests must be sent with a {self.csrf_header_name} header or a valid CSRF token"
+        )
+        return HTTPStatus.FORBIDDEN, self.serializer.dumps(self.build_invalid_payload_result(exc, context))
+
+    def decode_request_body(self, request: HttpRequest, default_encoding: str) -> str | bytes:
+        """
+        Return the JSON-RPC request, read from the corresponding part. Request body is parsed by Django. A part sent as
+        a file is returned as bytes, it is decoded by process_request() so decoding errors produce a parse error.
+        """
+        request_file = request.FILES.get(self.request_part_name)
+        if request_file is not None:
+            return request_file.read()
+        return request.POST.get(self.request_part_name, "")
+
+    @staticmethod
+    def decode_request_part(request_body: RequestBody, context: RpcRequestContext) -> RequestBody:
+        """Decode the JSON-RPC request part when it was sent as a file. Raise RPCParseError if it can't be decoded"""
+        if not isinstance(request_body, bytes):
+            return request_body
+        try:
+            return request_body.decode(context.request.encoding or context.server.default_encoding)
+        except UnicodeDecodeError as exc:
+            raise RPCParseError(str(exc), data=exc) from exc
+
+    def process_request(
+        self, request_body: RequestBody, context: RpcRequestContext
+    ) -> str | bytes | tuple[HTTPStatus, str] | Iterator[str]:
+        if not self.is_csrf_protected(context.request):
+            return self.build_csrf_error_response(context)
+        try:
+            decoded_body = self.decode_request_part(request_body, context)
+        except RPCException as exc:
+            return self.serializer.dumps(self.build_invalid_payload_result(exc, context))
+        return super().process_request(decoded_body, context)
+
+    async def aprocess_request(
+        self, request_body: RequestBody, context: RpcRequestContext
+    ) -> str | bytes | tuple[HTTPStatus, str] | AsyncIterator[str]:
+        if not self.is_csrf_protected(context.request):
+            return self.build_csrf_error_response(context)
+        try:
+            decoded_body = self.decode_request_part(request_body, context)
+        except RPCException as exc:
+            return self.serializer.dumps(self.build_invalid_payload_result(exc, context))
+        return await super().aprocess_request(decoded_body, context)
+
+    def resolve_files(self, value: Any, files: MultiValueDict) -> Any:
+        """Return the given value, where each file reference has been replaced by the corresponding uploaded file"""
+        if isinstance(value, dict):
+            if len(value) == 1 and self.file_reference_key in value:
+                part_name = value[self.file_reference_key]
+                if not isinstance(part_name, str) or part_name not in files:
+                    raise RPCInvalidParams(f'file part "{part_name}" not found in request')
+                return files[part_name]
+            return {key: self.resolve_files(val, files) for key, val in value.items()}
+
+        if isinstance(value, list):
+            return [self.resolve_files(val, files) for val in value]
+
+        return value
+
+    def resolve_request_files(self, rpc_request: JsonRpcRequest, context: RpcRequestContext) -> JsonRpcRequest:
+        files = context.request.FILES
+        return replace(
+            rpc_request,
+            args=self.resolve_files(list(rpc_request.args), files),
+            kwargs=self.resolve_files(rpc_request.kwargs, files),
+        )
+
+    def process_single_request(
+        self, rpc_request: JsonRpcRequest, context: RpcRequestContext, streamable: bool = False
+    ) -> JsonRpcResult:
+        try:
+            resolved_request = self.resolve_request_files(rpc_request, context)
+        except RPCException as exc:
+            rpc_exc = context.server.on_error(exc, context)
+            return self.build_error_result(rpc_request, rpc_exc.code, rpc_exc.message, rpc_exc.data)
+
+        result = super().process_single_request(resolved_request, context, streamable)
+        return self.fan_out_result(result, rpc_request)
+
+    async def aprocess_single_request(
+        self, rpc_request: JsonRpcRequest, context: RpcRequestContext, streamable: bool = False
+    ) -> JsonRpcResult:
+        try:
+            resolved_request = self.resolve_request_files(rpc_request, context)
+        except RPCException as exc:
+            rpc_exc = context.server.on_error(exc, context)
+            return self.build_error_result(rpc_request, rpc_exc.code, rpc_exc.message, rpc_exc.data)
+
+        result = await super().aprocess_single_request(resolved_request, context, streamable)
+        return self.fan_out_result(result, rpc_request)
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Iterable, Iterator
+from typing import TYPE_CHECKING, ClassVar
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import RequestDataTooBig
+from django.http import HttpRequest
+
+from modernrpc import RpcRequestContext
+from modernrpc.exceptions import RPCException, RPCInvalidRequest
+from modernrpc.handler import RequestBody
+from modernrpc.jsonrpc.handler import BaseJsonRpcHandler, JsonRpcRequest, JsonRpcResult
+from modernrpc.spooling import SpooledRequestBody
+
+if TYPE_CHECKING:
+    from modernrpc.jsonrpc.backends import JsonRpcDeserializer, JsonRpcSerializer
+
+logger = logging.getLogger(__name__)
+
+
+class NdjsonRpcHandler(BaseJsonRpcHandler):
+    """
+    Newline-delimited JSON-RPC handler. The request body contains one JSON-RPC request per line, and the response is
+    streamed with one JSON-RPC response per line. The body is read (and calls are executed) line by line, so memory
+    usage doesn't depend on the number of calls sent in a single request.
+    """
+
+    valid_content_types: ClassVar[list[str]] = ["application/x-ndjson", "application/jsonl"]
+    response_content_type = "application/x-ndjson"
+    supports_streamed_batch_responses = False
+    # Each line is parsed and serialized as JSON text
+    deserializer: "JsonRpcDeserializer"
+    serializer: "JsonRpcSerializer"
+
+    def decode_request_body(self, request: HttpRequest, default_encoding: str) -> Iterator[str]:
+        """Return an iterator over the lines of the request body, read lazily from the request stream"""
+        encoding = request.encoding or default_encoding
+        return (line.decode(encoding) for line in request)
+
+    @staticmethod
+    def iter_lines(request_body: RequestBody) -> Iterator[str]:
+        """
+        Return an iterator over the lines of the given request body. The body returned by decode_request_body() is
+        already such an iterator, other kinds of body are read at once.
+        """
+        if isinstance(request_body, Iterator):
+            return request_body
+        if isinstance(request_body, SpooledRequestBody):
+            with request_body:
+                request_body = request_body.read_text()
+        if isinstance(request_body, bytes):
+            request_body = request_body.decode()
+        return iter(request_body.splitlines())
+
+    def parse_line(self, line: str, context: RpcRequestContext) -> JsonRpcRequest | JsonRpcResult | None:
+        """
+        Parse a single line of the request body. Return None for blank lines, and an error result (with a null 'id')
+        when the line can't be parsed to a single request.
+        """
+        if not line.strip():
+            return None
+
+        try:
+            parsed_request = self.deserializer.loads(line)
+        except RPCException as exc:
+            return self.build_invalid_payload_result(exc, context)
+
+        if not isinstance(parsed_request, JsonRpcRequest):
+            return self.build_invalid_payload_result(
+                RPCInvalidRequest("Batch requests are not supported, each line must contain a single request"), context
+            )
+
+        return parsed_request
+
+    def dumps_lines(self, results: Iterable[JsonRpcResult], context: RpcRequestContext) -> str:
+        """Serialize the given results, one per line. Notification results are skipped."""
+        return "".join(
+            self.dumps_batch_result(result, context) + "\n" for result in results if not result.request.is_notification
+        )
+
+    def process_request(self, request_body: RequestBody, context: RpcRequestContext) -> Iterator[str]:
+        return self.stream_results(self.iter_lines(request_body), context)
+
+    async def aprocess_request(self, request_body: RequestBody, context: RpcRequestContext) -> AsyncIterator[str]:
+        return self.astream_results(self.iter_lines(request_body), context)
+
+    def parse_lines(self, lines: Iterator[str], context: RpcRequestContext) -> Iterator[JsonRpcRequest | JsonRpcResult]:
+        """
+        Parse the given lines, as they are read. Blank lines are skipped. When the request body exceeds the server's
+        max_request_size, the response has already started: an error result is produced and reading stops.
+        """
+        try:
+            for line in lines:
+                if (parsed := self.parse_line(line, context)) is not None:
+                    yield parsed
+        except RequestDataTooBig as exc:
+            yield self.build_invalid_payload_result(RPCInvalidRequest(str(exc)), context)
+
+    def stream_results(self, lines: Iterator[str], context: RpcRequestContext) -> Iterator[str]:
+        """Execute each request as soon as its line is read, and yield the corresponding response line"""
+        for parsed in self.parse_lines(lines, context):
+            result = self.process_single_request(parsed, context) if isinstance(parsed, JsonRpcRequest) else parsed
+            if chunk := self.dumps_lines([result], context):
+                yield chunk
+
+    @staticmethod
+    def pop_completed(running: set[asyncio.Task[JsonRpcResult]]) -> list[JsonRpcResult]:
+        """Remove completed tasks from the given set and return their results"""
+        done = {task for task in running if task.done()}
+        running -= done
+        return [task.result() for task in done]
+
+    async def astream_results(self, lines: Iterator[str], context: RpcRequestContext) -> AsyncIterator[str]:
+        """
+        Execute requests as soon as their line is read, keeping at most `batch_window_size` calls running at the same
+        time. Response lines are yielded in completion order, clients must match them with requests using their 'id'.
+        """
+        running: set[asyncio.Task[JsonRpcResult]] = set()
+        # Reading the request stream may block, lines are read in a thread to keep the event loop available
+        parsed_lines = self.parse_lines(lines, context)
+        read_next = sync_to_async(lambda: next(parsed_lines, None))
+
+        try:
+            while (parsed := await read_next()) is not None:
+                results: list[JsonRpcResult] = []
+                if isinstance(parsed, JsonRpcRequest):
+                    if len(running) >= self.batch_window_size:
+                        await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    running.add(asyncio.ensure_future(self.aprocess_single_request(parsed, context)))
+                    # Let the new task start before reading the next line
+                    await asyncio.sleep(0)
+                else:
+                    results.append(parsed)
+
+                if chunk := self.dumps_lines([*results, *self.pop_completed(running)], context):
+                    yield chunk
+
+            while running:
+                await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                if chunk := self.dumps_lines(self.pop_completed(running), context):
+                    yield chunk
+
+        finally:
+            # The client may have disconnected before the end of the response
+            for task in running:
+                task.cancel()
@@ -1,23 +1,31 @@
 import functools
 import logging
-from collections.abc import Callable, Coroutine
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterator
 from http import HTTPStatus
-from typing import Any
+from typing import Any, Literal
 
-from django.http import HttpRequest, HttpResponse, HttpResponseNotAllowed
+from django.http import HttpRequest, HttpResponse, HttpResponseNotAllowed, StreamingHttpResponse
 from django.shortcuts import redirect
+from django.utils.cache import add_never_cache_headers, get_conditional_response, set_response_etag
 from django.utils.log import log_response
 from django.utils.module_loading import import_string
 from django.views.decorators.csrf import csrf_exempt
 
 from modernrpc.compat import async_csrf_exempt
 from modernrpc.config import settings
-from modernrpc.constants import NOT_SET, SYSTEM_NAMESPACE_DOTTED_PATH, Protocol
+from modernrpc.constants import (
+    ASYNC_SYSTEM_NAMESPACE_DOTTED_PATH,
+    NOT_SET,
+    SYSTEM_NAMESPACE_DOTTED_PATH,
+    Default,
+    Protocol,
+)
 from modernrpc.core import ProcedureWrapper, RpcRequestContext
 from modernrpc.exceptions import RPCException, RPCInternalError, RPCMethodNotFound
-from modernrpc.handler import RpcHandler
-from modernrpc.helpers import check_flags_compatibility, first_true
-from modernrpc.types import AuthPredicateType, FuncOrCoro
+from modernrpc.files import FILE_QUERY_PARAM, build_file_response
+from modernrpc.handler import CacheableRpcHandler, RpcHandler
+from modernrpc.helpers import SizeLimitedStream, check_flags_compatibility, first_true, get_content_length
+from modernrpc.types import AuthPredicateType, FuncOrCoro, MaxRequestSize
 from modernrpc.views import handle_rpc_request, handle_rpc_request_async
 
 logger = logging.getLogger(__name__)
@@ -42,6 +50,9 @@ class RegistryMixin:
         protocol: Protocol = Protocol.ALL,
         auth: AuthPredicateType = NOT_SET,
         context_target: str | None = None,
+        idempotent: bool = False,
+        cacheable: bool = False,
+        cache_control: str | None = None,
     ) -> Callable:
         """
         Registers a procedure for handling RPC (Remote Procedure Call) requests. This function can be used as a
@@ -54,6 +65,12 @@ class RegistryMixin:
         :param auth: Defines user authentication settings or access rules for the procedure. Defaults to NOT_SET, in
                      which case the server's authentication settings will be used.
         :param context_target: Specify the procedure argument name for accessing the RPC request context.
+        :param idempotent: When True, identical calls to this procedure in a single batch request (or multicall) are
+                           executed only once, and the result is returned for each call.
+        :param cacheable: When True, the procedure can also be called with a JSON-RPC GET request, and successful
+                          responses can be stored by HTTP caches.
+        :param cache_control: Value of the Cache-Control header sent with successful responses to GET requests. Only
+                              used when cacheable is True. When not set, only the ETag header is sent.
 
         :raises ValueError: If a procedure can't be registered
         """
@@ -67,7 +84,14 @@ class RegistryMixin:
 
             auth_predicate = self.auth if auth is NOT_SET else auth
             wrapper = ProcedureWrapper(
-                func, name, protocol=protocol, auth=auth_predicate, context_target=context_target
+                func,
+                name,
+                protocol=protocol,
+                auth=auth_predicate,
+                context_target=context_target,
+                idempotent=idempotent,
+                cacheable=cacheable,
+                cache_control=cache_control,
             )
 
             if wrapper.name in self._registry and wrapper != self._registry[wrapper.name]:
@@ -104,6 +128,10 @@ class RpcServer(RegistryMixin):
         error_handler: RpcErrorHandler | None = None,
         redirect_get_request_to: str | Callable[..., Any] | None = None,
         default_encoding: str = settings.MODERNRPC_DEFAULT_ENCODING,
+        stream_batch_responses: bool = False,
+        async_multicall: bool | None = None,
+        multicall_workers: int | None = None,
+        max_request_size: MaxRequestSize | Literal[Default.NOT_SET] = NOT_SET,
     ) -> None:
         super().__init__(auth)
         handler_classes = filter(
@@ -112,13 +140,26 @@ class RpcServer(RegistryMixin):
         )
         self.handlers: list[RpcHandler] = [klass() for klass in handler_classes]
 
+        # When True, XML-RPC system.multicall executes calls concurrently using asyncio.gather(). Else, calls are
+        # executed in a pool of multicall_workers threads (sequentially, with the default single worker)
+        self.async_multicall = settings.MODERNRPC_XMLRPC_ASYNC_MULTICALL if async_multicall is None else async_multicall
+        self.multicall_workers = (
+            settings.MODERNRPC_XMLRPC_MULTICALL_WORKERS if multicall_workers is None else multicall_workers
+        )
+
         if register_system_procedures:
-            system_namespace = import_string(SYSTEM_NAMESPACE_DOTTED_PATH)
-            self.register_namespace(system_namespace, "system")
+            dotted_path = ASYNC_SYSTEM_NAMESPACE_DOTTED_PATH if self.async_multicall else SYSTEM_NAMESPACE_DOTTED_PATH
+            self.register_namespace(import_string(dotted_path), "system")
 
         self.error_handler = error_handler
         self.redirect_get_request_target = redirect_get_request_to
         self.default_encoding = default_encoding
+        # When True, the async view streams JSON-RPC batch responses in completion order
+        self.stream_batch_responses = stream_batch_responses
+        # Maximum size of request bodies, in bytes. None is a valid value (no limit), so NOT_SET is used as default
+        self.max_request_size: MaxRequestSize = (
+            settings.MODERNRPC_MAX_REQUEST_SIZE if max_request_size is NOT_SET else max_request_size
+        )
 
     def register_namespace(self, namespace: RpcNamespace, name: str | None = None) -> None:
         """Register all procedures from given namespace into the top-level server."""
@@ -142,6 +183,9 @@ class RpcServer(RegistryMixin):
                 protocol=wrapper.protocol,
                 auth=wrapper.auth,
                 context_target=wrapper.context_target,
+                idempotent=wrapper.idempotent,
+                cacheable=wrapper.cacheable,
+                cache_control=wrapper.cache_control,
             )
 
     def get_procedure_wrapper(self, name: str, protocol: Protocol) -> ProcedureWrapper:
@@ -158,6 +202,12 @@ class RpcServer(RegistryMixin):
 
     def get_request_handler(self, request: HttpRequest) -> RpcHandler | None:
         """Return the first handler that can handle the given request, or None if no handler can handle it."""
+        if request.method == "GET":
+            return first_true(
+                self.handlers,
+                pred=lambda handler: isinstance(handler, CacheableRpcHandler),
+                default=None,
+            )
         return first_true(self.handlers, pred=lambda handler: handler.can_handle(request), default=None)
 
     def on_error(self, exception: BaseException, context: RpcRequestContext) -> RPCException:
@@ -185,15 +235,58 @@ class RpcServer(RegistryMixin):
         log_response(f"Method Not Allowed ({request.method}): {request.path}", response=response, request=request)
         return response
 
-    def check_request(self, request: HttpRequest) -> HttpResponse | None:
+    def build_request_too_large_response(self, request: HttpRequest) -> HttpResponse:
+        """Build an HttpResponse instance for a request whose body exceeds the maximum size"""
+        response = HttpResponse(
+            "Unable to handle your request, the request body is too large.",
+            status=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            content_type="text/plain",
+        )
+        log_response(f"Request Entity Too Large: {request.path}", response=response, request=request)
+        return response
+
+    def get_max_request_size(self, request: HttpRequest) -> int | None:
+        """Return the maximum size of the given request body, in bytes, or None if it is not limited"""
+        if isinstance(self.max_request_size, dict):
+            return self.max_request_size.get(request.content_type or "", self.max_request_size.get("*"))
+        return self.max_request_size
+
+    def check_request_size(self, request: HttpRequest) -> HttpResponse | None:
+        """
+        Reject the request early when its Content-Length header exceeds the maximum size, before its body is read.
+        Else, limit the request stream, in case the body is sent without Content-Length (or is larger than declared):
+        RequestDataTooBig will be raised as soon as the maximum size is exceeded while the body is read.
+        """
+        max_size = self.get_max_request_size(request)
+        if max_size is None:
+            return None
+
+        content_length = get_content_length(request)
+        if content_length is not None and content_length > max_size:
+            return self.build_request_too_large_response(request)
+
+        # Django reads the body of all requests (request.body, request.POST, iteration on lines) from this stream
+        request._stream = SizeLimitedStream(request._stream, max_size)  # type: ignore[assignment]  # noqa: SLF001
+        return None
+
+    def check_request(self, request: HttpRequest) -> HttpResponse | StreamingHttpResponse | None:
         """
         Check incoming request for common issues. When everything is fine, return None. Else, return the appropriate
         HttpResponse instance.
 
         :param request: Request instance as received by Django
-        :return: A response instance (HttpResponsePermanentRedirect, HttpResponseNotAllowed, HttpResponse) or None
+        :return: A response instance (HttpResponsePermanentRedirect, HttpResponseNotAllowed, FileResponse,
+                 HttpResponse) or None
         """
         if request.method == "GET":
+            # Download of a file returned by a procedure, see FileResult
+            if FILE_QUERY_PARAM in request.GET:
+                return build_file_response(request)
+
+            # Call to a cacheable procedure, with method and params encoded in the query string
+            if "method" in request.GET and self.get_request_handler(request):
+                return None
+
             if self.redirect_get_request_target:
                 return redirect(to=self.redirect_get_request_target, permanent=True)
 
@@ -209,11 +302,16 @@ class RpcServer(RegistryMixin):
                 status=HTTPStatus.BAD_REQUEST,
                 content_type="text/plain",
             )
-        return None
+        return self.check_request_size(request)
 
     @staticmethod
-    def build_response(handler: RpcHandler, result_data: str | tuple[int, str]) -> HttpResponse:
+    def build_response(
+        handler: RpcHandler, result_data: str | bytes | tuple[int, str] | Iterator[str] | AsyncIterator[str]
+    ) -> HttpResponse | StreamingHttpResponse:
         """Build an HttpResponse instance from the given handler and result data."""
+        if isinstance(result_data, Iterator | AsyncIterator):
+            return StreamingHttpResponse(result_data, content_type=handler.response_content_type)
+
         if isinstance(result_data, tuple) and len(result_data) == 2:
             status, result_data = result_data
         else:
@@ -221,11 +319,32 @@ class RpcServer(RegistryMixin):
 
         return HttpResponse(result_data, status=status, content_type=handler.response_content_type)
 
+    @staticmethod
+    def build_get_response(
+        request: HttpRequest, handler: RpcHandler, result_data: str, cache_control: str | None
+    ) -> HttpResponse:
+        """
+        Build an HttpResponse instance for a GET request. When cache_control is None, the response must not be cached.
+        Else, ETag header (and Cache-Control header, when cache_control is not empty) is set, and a 304 response is
+        returned if the client already has the same content (If-None-Match header).
+        """
+        response = HttpResponse(result_data, content_type=handler.response_content_type)
+        if cache_control is None:
+            add_never_cache_headers(response)
+            return response
+
+        if cache_control:
+            response.headers["Cache-Control"] = cache_control
+        set_response_etag(response)
+        # get_conditional_response() returns None when the response must be sent unchanged
+        return get_conditional_response(request, etag=response.headers["ETag"], response=response) or response
+
     @property
-    def view(self) -> Callable[[HttpRequest], HttpResponse]:
+    def view(self) -> Callable[[HttpRequest], HttpResponse | StreamingHttpResponse]:
         """
         Returns a synchronous view function that can be used in Django URL patterns.
-        The view is decorated with csrf_exempt and require_POST.
+        The view is decorated with csrf_exempt. RPC calls are sent with POST requests, GET requests are only accepted
+        for calls to cacheable procedures and downloads of file results (other ones are redirected or rejected).
 
         :return: A callable view function
         """
@@ -233,10 +352,11 @@ class RpcServer(RegistryMixin):
         return csrf_exempt(view_func)
 
     @property
-    def async_view(self) -> Callable[[HttpRequest], Coroutine[None, None, HttpResponse]]:
+    def async_view(self) -> Callable[[HttpRequest], Coroutine[None, None, HttpResponse | StreamingHttpResponse]]:
         """
         Returns an asynchronous view function that can be used in Django URL patterns.
-        The view is decorated with csrf_exempt and require_POST.
+        The view is decorated with csrf_exempt. Like the synchronous view, it accepts POST requests, and GET requests
+        for calls to cacheable procedures and downloads of file results.
 
         :return: An awaitable async view function
         """
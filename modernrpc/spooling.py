@@ -0,0 +1,94 @@
+import codecs
+import mmap
+import tempfile
+from typing import IO
+
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.http import HttpRequest
+
+from modernrpc.compat import Self
+from modernrpc.helpers import SizeLimitedStream, get_content_length
+
+
+def should_spool_body(request: HttpRequest, max_memory_size: int | None) -> bool:
+    """
+    Return True if the body of the given request must be spooled to a temporary file, because it is larger than
+    max_memory_size (or its size is unknown). Always return False when max_memory_size is None.
+    """
+    if max_memory_size is None:
+        return False
+    content_length = get_content_length(request)
+    return content_length is None or content_length > max_memory_size
+
+
+def get_spooled_body_max_size(request: HttpRequest) -> int | None:
+    """
+    Return the maximum size of the given request body when it is spooled. Spooled bodies are not read from
+    request.body, so Django's DATA_UPLOAD_MAX_MEMORY_SIZE is applied here, unless the request stream is already limited
+    by the server's max_request_size. Return None if the size is not limited.
+    """
+    if isinstance(request._stream, SizeLimitedStream):  # noqa: SLF001
+        return None
+    return settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+
+
+class SpooledRequestBody:
+    """
+    Body of a large request. It is copied from the request stream into a temporary file, chunk by chunk, then mapped
+    in memory. Unlike request.body (and its decoded copy), the content is never entirely held in process memory: pages
+    of the mapped file are loaded on demand (and can be discarded) by the OS while the body is parsed.
+
+    Deserializers accepting buffers (see the accepts_buffer attribute) parse the mapped file directly. For other ones,
+    the body is decoded to str, without keeping a bytes copy in memory.
+    """
+
+    def __init__(self, file: IO[bytes], encoding: str) -> None:
+        self.file = file
+        self.encoding = encoding
+        # An empty file can't be mapped
+        self.buffer: mmap.mmap | bytes = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if file.tell() else b""
+
+    @classmethod
+    def from_request(
+        cls, request: HttpRequest, encoding: str, chunk_size: int = 64 * 1024, max_size: int | None = None
+    ) -> "SpooledRequestBody":
+        """
+        Read the body of the given request into a new SpooledRequestBody, without reading request.body. Raise
+        RequestDataTooBig if the body is larger than max_size: at most max_size + 1 bytes are read from the request.
+        """
+        if max_size is not None:
+            content_length = get_content_length(request)
+            if content_length is not None and content_length > max_size:
+                raise RequestDataTooBig(f"Request body exceeded the maximum size ({max_size} bytes)")
+
+        file = tempfile.TemporaryFile()  # noqa: SIM115 (closed by close())
+        try:
+            size = 0
+            while chunk := request.read(chunk_size if max_size is None else min(chunk_size, max_size - size + 1)):
+                size += file.write(chunk)
+                if max_size is not None and size > max_size:
+                    raise RequestDataTooBig(f"Request body exceeded the maximum size ({max_size} bytes)")
+            file.flush()
+            return cls(file, encoding)
+        except BaseException:
+            file.close()
+            raise
+
+    @property
+    def is_utf8(self) -> bool:
+        return codecs.lookup(self.encoding).name == "utf-8"
+
+    def read_text(self) -> str:
+        return str(self.buffer, self.encoding)
+
+    def close(self) -> None:
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self.file.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
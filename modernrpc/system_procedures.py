@@ -1,22 +1,22 @@
-import asyncio
+import queue
+from collections.abc import Hashable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
 
 from modernrpc import Protocol, RpcNamespace, RpcRequestContext
-from modernrpc.config import settings
 from modernrpc.exceptions import RPCInvalidParams
-from modernrpc.types import RpcErrorResult
+from modernrpc.handler import RpcHandler
+from modernrpc.types import FuncOrCoro, RpcErrorResult, RpcSuccessResult
 from modernrpc.xmlrpc.handler import XmlRpcRequest
 
-system = RpcNamespace()
-
 
-@system.register_procedure(name="listMethods", context_target="_ctx")
 def __system_list_methods(_ctx: RpcRequestContext):
     """Returns a list of all procedures exposed by the server"""
     server = _ctx.server
     return list(server.procedures.keys())
 
 
-@system.register_procedure(name="methodSignature", context_target="_ctx")
 def __system_method_signature(method_name: str, _ctx: RpcRequestContext):
     """
     Returns an array describing the possible signatures for the given procedure.
@@ -41,7 +41,6 @@ def __system_method_signature(method_name: str, _ctx: RpcRequestContext):
     return [[return_type, *args_types]]
 
 
-@system.register_procedure(name="methodHelp", context_target="_ctx")
 def __system_method_help(method_name: str, _ctx: RpcRequestContext):
     """
     Returns the documentation of the given procedure.
@@ -55,49 +54,114 @@ def __system_method_help(method_name: str, _ctx: RpcRequestContext):
     return method.text_doc
 
 
-if settings.MODERNRPC_XMLRPC_ASYNC_MULTICALL:
-
-    @system.register_procedure(name="multicall", protocol=Protocol.XML_RPC, context_target="_ctx")
-    async def __system_multicall(calls: list, _ctx: RpcRequestContext):
-        """
-        Call multiple procedure at once, using asyncio.gather().
-
-        :param calls: An array of struct like {"methodName": string, "params": [..., ...]}
-        :param _ctx: Request context for this call
-        :return: An array containing the result of each procedure call
-        """
-        if not isinstance(calls, list):
-            raise RPCInvalidParams(f"system.multicall first argument should be a list, {type(calls).__name__} given.")
-
-        requests = (XmlRpcRequest(call.get("methodName"), call.get("params") or []) for call in calls)
-        results = await asyncio.gather(*(_ctx.handler.aprocess_single_request(request, _ctx) for request in requests))
-
-        return [
-            {"faultCode": result.code, "faultString": result.message}
-            if isinstance(result, RpcErrorResult)
-            else (result.data,)
-            for result in results
-        ]
-else:
-
-    @system.register_procedure(name="multicall", protocol=Protocol.XML_RPC, context_target="_ctx")
-    def __system_multicall(calls: list, _ctx: RpcRequestContext):
-        """
-        Call multiple procedure at once.
-
-        :param calls: An array of struct like {"methodName": string, "params": [..., ...]}
-        :param _ctx: Request context for this call
-        :return: An array containing the result of each procedure call
-        """
-        if not isinstance(calls, list):
-            raise RPCInvalidParams(f"system.multicall first argument should be a list, {type(calls).__name__} given.")
-
-        requests = (XmlRpcRequest(call.get("methodName"), call.get("params") or []) for call in calls)
-        results = (_ctx.handler.process_single_request(request, _ctx) for request in requests)
-
-        return [
-            {"faultCode": result.code, "faultString": result.message}
-            if isinstance(result, RpcErrorResult)
-            else (result.data,)
-            for result in results
-        ]
+def build_multicall_result(results: Iterable[RpcSuccessResult | RpcErrorResult]) -> list:
+    return [
+        {"faultCode": result.code, "faultString": result.message}
+        if isinstance(result, RpcErrorResult)
+        else (result.data,)
+        for result in results
+    ]
+
+
+def process_requests_in_threads(
+    handler: RpcHandler[XmlRpcRequest],
+    rpc_requests: Iterable[XmlRpcRequest],
+    context: RpcRequestContext,
+    max_workers: int,
+) -> list[RpcSuccessResult[XmlRpcRequest] | RpcErrorResult[XmlRpcRequest]]:
+    """
+    Threaded version of handler.process_requests(). Requests are processed in parallel by at most max_workers threads,
+    and results are returned in the same order. Database connections opened by worker threads are closed before they
+    exit.
+
+    Each thread uses its own database connection: procedures run outside the transaction of the request (with
+    ATOMIC_REQUESTS) and can't see its uncommitted writes.
+
+    Identical calls to idempotent procedures are executed only once, their result is returned for each request.
+    """
+    rpc_requests = list(rpc_requests)
+
+    # For each request, the index of the request actually executed to compute its result
+    known_indexes: dict[Hashable, int] = {}
+    executed_indexes: list[int] = []
+    for index, rpc_request in enumerate(rpc_requests):
+        key = handler.get_call_key(rpc_request, context)
+        executed_indexes.append(index if key is None else known_indexes.setdefault(key, index))
+
+    pending: queue.SimpleQueue[int] = queue.SimpleQueue()
+    for index in sorted(set(executed_indexes)):
+        pending.put(index)
+    results: dict[int, RpcSuccessResult[XmlRpcRequest] | RpcErrorResult[XmlRpcRequest]] = {}
+
+    def worker() -> None:
+        try:
+            while True:
+                try:
+                    index = pending.get_nowait()
+                except queue.Empty:
+                    return
+                results[index] = handler.process_single_request(rpc_requests[index], context)
+        finally:
+            connections.close_all()
+
+    workers_count = min(max_workers, pending.qsize())
+    with ThreadPoolExecutor(max_workers=workers_count or 1, thread_name_prefix="modernrpc-multicall") as executor:
+        for future in [executor.submit(worker) for _ in range(workers_count)]:
+            future.result()
+
+    handler.log_deduplicated_calls(len(executed_indexes) - len(results))
+
+    return [
+        handler.fan_out_result(results[index], rpc_request)
+        for index, rpc_request in zip(executed_indexes, rpc_requests, strict=True)
+    ]
+
+
+def __system_multicall(calls: list, _ctx: RpcRequestContext):
+    """
+    Call multiple procedure at once. Procedures are executed sequentially, or in parallel in a pool of threads when
+    the server has been created with multicall_workers > 1.
+
+    :param calls: An array of struct like {"methodName": string, "params": [..., ...]}
+    :param _ctx: Request context for this call
+    :return: An array containing the result of each procedure call
+    """
+    if not isinstance(calls, list):
+        raise RPCInvalidParams(f"system.multicall first argument should be a list, {type(calls).__name__} given.")
+
+    requests = (XmlRpcRequest(call.get("methodName"), call.get("params") or []) for call in calls)
+    if _ctx.server.multicall_workers > 1:
+        return build_multicall_result(
+            process_requests_in_threads(_ctx.handler, requests, _ctx, _ctx.server.multicall_workers)
+        )
+    return build_multicall_result(_ctx.handler.process_requests(requests, _ctx))
+
+
+async def __system_async_multicall(calls: list, _ctx: RpcRequestContext):
+    """
+    Call multiple procedure at once, using asyncio.gather().
+
+    :param calls: An array of struct like {"methodName": string, "params": [..., ...]}
+    :param _ctx: Request context for this call
+    :return: An array containing the result of each procedure call
+    """
+    if not isinstance(calls, list):
+        raise RPCInvalidParams(f"system.multicall first argument should be a list, {type(calls).__name__} given.")
+
+    requests = (XmlRpcRequest(call.get("methodName"), call.get("params") or []) for call in calls)
+    return build_multicall_result(await _ctx.handler.aprocess_requests(requests, _ctx))
+
+
+def build_system_namespace(multicall: FuncOrCoro) -> RpcNamespace:
+    """Return a namespace containing the introspection procedures, and the given system.multicall implementation"""
+    namespace = RpcNamespace()
+    namespace.register_procedure(__system_list_methods, name="listMethods", context_target="_ctx")
+    namespace.register_procedure(__system_method_signature, name="methodSignature", context_target="_ctx")
+    namespace.register_procedure(__system_method_help, name="methodHelp", context_target="_ctx")
+    namespace.register_procedure(multicall, name="multicall", protocol=Protocol.XML_RPC, context_target="_ctx")
+    return namespace
+
+
+# A server registers one of these namespaces, depending on its async_multicall argument
+system = build_system_namespace(__system_multicall)
+async_system = build_system_namespace(__system_async_multicall)
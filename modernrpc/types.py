@@ -43,4 +43,7 @@ CustomKwargs: TypeAlias = DictStrAny | None
 AuthPredicate: TypeAlias = Callable[[HttpRequest], Any]
 AuthPredicateType: TypeAlias = Literal[Default.NOT_SET] | AuthPredicate | Sequence[AuthPredicate] | None
 
+# Maximum size of request bodies, in bytes: a single value, or a value for each content type ("*" for other types)
+MaxRequestSize: TypeAlias = int | dict[str, int | None] | None
+
 FuncOrCoro: TypeAlias = Callable[..., Any] | Callable[..., Awaitable[Any]]
@@ -2,10 +2,12 @@ import logging
 from http import HTTPStatus
 from typing import TYPE_CHECKING
 
+from django.core.exceptions import RequestDataTooBig
 from django.http import HttpRequest
-from django.http.response import HttpResponse
+from django.http.response import HttpResponse, StreamingHttpResponse
 
 from modernrpc.core import RpcRequestContext
+from modernrpc.handler import CacheableRpcHandler
 
 if TYPE_CHECKING:
     from modernrpc.server import RpcServer
@@ -13,7 +15,7 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-def handle_rpc_request(request: HttpRequest, server: "RpcServer") -> HttpResponse:
+def handle_rpc_request(request: HttpRequest, server: "RpcServer") -> HttpResponse | StreamingHttpResponse:
     """
     Synchronous view function to handle RPC requests.
 
@@ -33,15 +35,24 @@ def handle_rpc_request(request: HttpRequest, server: "RpcServer") -> HttpRespons
             content_type="text/plain",
         )
 
-    result_data = handler.process_request(
-        request.body.decode(request.encoding or server.default_encoding),
-        RpcRequestContext(request, server, handler, handler.protocol),
-    )
+    context = RpcRequestContext(request, server, handler, handler.protocol)
+    # Only handlers accepting GET requests are returned for them
+    if request.method == "GET" and isinstance(handler, CacheableRpcHandler):
+        content, cache_control = handler.process_get_request(request.GET, context)
+        return server.build_get_response(request, handler, content, cache_control)
+
+    try:
+        request_body = handler.decode_request_body(request, server.default_encoding)
+    except RequestDataTooBig:
+        # Body larger than the server's max_request_size (or than Django's DATA_UPLOAD_MAX_MEMORY_SIZE)
+        return server.build_request_too_large_response(request)
+
+    result_data = handler.process_request(request_body, context)
 
     return server.build_response(handler, result_data)
 
 
-async def handle_rpc_request_async(request: HttpRequest, server: "RpcServer") -> HttpResponse:
+async def handle_rpc_request_async(request: HttpRequest, server: "RpcServer") -> HttpResponse | StreamingHttpResponse:
     """
     Asynchronous view function to handle RPC requests.
 
@@ -61,9 +72,18 @@ async def handle_rpc_request_async(request: HttpRequest, server: "RpcServer") ->
             content_type="text/plain",
         )
 
-    result_data = await handler.aprocess_request(
-        request.body.decode(request.encoding or server.default_encoding),
-        RpcRequestContext(request, server, handler, handler.protocol),
-    )
+    context = RpcRequestContext(request, server, handler, handler.protocol)
+    # Only handlers accepting GET requests are returned for them
+    if request.method == "GET" and isinstance(handler, CacheableRpcHandler):
+        content, cache_control = await handler.aprocess_get_request(request.GET, context)
+        return server.build_get_response(request, handler, content, cache_control)
+
+    try:
+        request_body = handler.decode_request_body(request, server.default_encoding)
+    except RequestDataTooBig:
+        # Body larger than the server's max_request_size (or than Django's DATA_UPLOAD_MAX_MEMORY_SIZE)
+        return server.build_request_too_large_response(request)
+
+    result_data = await handler.aprocess_request(request_body, context)
 
     return server.build_response(handler, result_data)
@@ -1,11 +1,11 @@
 from functools import cached_property
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
 import defusedxml
 import defusedxml.ElementTree as DefusedElementTree
 from django.utils.module_loading import import_string
 
-from modernrpc.exceptions import RPCInsecureRequest, RPCInvalidRequest, RPCMarshallingError, RPCParseError
+from modernrpc.exceptions import RPCException, RPCInsecureRequest, RPCInvalidRequest, RPCMarshallingError, RPCParseError
 from modernrpc.types import CustomKwargs
 from modernrpc.xmlrpc.handler import XmlRpcRequest, XmlRpcResult
 
@@ -19,6 +19,9 @@ ETREE_DEFAULT_ELEMENT_TYPE = "xml.etree.ElementTree.Element"
 class EtreeDeserializer:
     """xml-rpc deserializer based on python builtin module xml.etree"""
 
+    # Request bodies spooled to disk are passed as a memory-mapped buffer instead of str (see SpooledRequestBody)
+    accepts_buffer: ClassVar[bool] = True
+
     def __init__(
         self,
         unmarshaller_klass="modernrpc.xmlrpc.backends.marshalling.EtreeElementUnmarshaller",
@@ -35,8 +38,8 @@ class EtreeDeserializer:
         self.load_kwargs.setdefault("forbid_dtd", True)
 
     @cached_property
-    def unmarshaller(self):
-        return self.unmarshaller_klass[self.element_type_klass](**self.unmarshaller_kwargs)
+    def unmarshaller_type(self):
+        return self.unmarshaller_klass[self.element_type_klass]
 
     def loads(self, data: str) -> XmlRpcRequest:
         try:
@@ -46,8 +49,12 @@ class EtreeDeserializer:
         except (defusedxml.DTDForbidden, defusedxml.EntitiesForbidden, defusedxml.ExternalReferenceForbidden) as exc:
             raise RPCInsecureRequest(str(exc)) from exc
 
+        # Unmarshallers keep track of the request structure, a new one is needed for each request
+        unmarshaller = self.unmarshaller_type(**self.unmarshaller_kwargs)
         try:
-            return self.unmarshaller.element_to_request(root_obj)
+            return unmarshaller.element_to_request(root_obj)
+        except RPCException:
+            raise
         except Exception as exc:
             raise RPCInvalidRequest(str(exc)) from exc
 
@@ -0,0 +1,271 @@
+import base64
+import xml.parsers.expat
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, ClassVar, NoReturn
+
+from django.utils.module_loading import import_string
+
+from modernrpc.constants import NOT_SET
+from modernrpc.exceptions import RPCException, RPCInsecureRequest, RPCInvalidRequest, RPCParseError
+from modernrpc.limits import StructureLimits
+from modernrpc.types import CustomKwargs, DictStrAny
+from modernrpc.xmlrpc.backends.spooling import SpooledBase64Decoder
+from modernrpc.xmlrpc.handler import XmlRpcRequest
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Tags defining the structure of a request. Any other tag found in a <value> must be a known type
+STRUCTURE_TAGS = frozenset({"methodCall", "methodName", "params", "param", "value", "data", "member", "name"})
+
+
+class ExpatUnmarshaller:
+    """
+    Build an XmlRpcRequest directly from expat parser events. No element tree is built: each value is converted as soon
+    as its closing tag is found, containers (params, arrays, structs and members) are kept in a stack until they are
+    complete.
+
+    A new instance must be used for each request.
+
+    When base64_max_memory_size is set, base64 values are decoded while their text is received, and values larger than
+    this size are returned as temporary files (see SpooledBase64Decoder).
+
+    Structural limits (see StructureLimits) are checked as soon as the corresponding tag is found.
+    """
+
+    def __init__(
+        self,
+        allow_none=True,
+        base64_max_memory_size: int | None = None,
+        limits: StructureLimits | DictStrAny | None = None,
+    ) -> None:
+        self.allow_none = allow_none
+        self.base64_max_memory_size = base64_max_memory_size
+        self.limits = StructureLimits.build(limits)
+
+        self.load_funcs: dict[str, Callable[[str], Any]] = {
+            "nil": self.load_nil,
+            "boolean": self.load_bool,
+            "int": int,
+            "i4": int,
+            "double": float,
+            "string": self.limits.check_string_length,
+            "dateTime.iso8601": self.load_datetime,
+            "base64": base64.b64decode,
+        }
+        self.end_funcs: dict[str, Callable[[str], None]] = {
+            "value": self.end_value,
+            "array": self.end_container,
+            "struct": self.end_container,
+            "name": self.end_name,
+            "member": self.end_member,
+            "param": self.end_param,
+            "params": self.end_params,
+            "methodName": self.end_method_name,
+        }
+
+        self.root_found = False
+        self.method_name: str | None = None
+        self.args: list[Any] | None = None
+        # Each frame is a [tag, content] pair. Content is a list for params and arrays, a dict for structs, and a
+        # [name, value] list for members and values
+        self.stack: list[list[Any]] = []
+        self.text: list[str] = []
+        self.base64_decoder: SpooledBase64Decoder | None = None
+        # Number of values found so far, and current nesting level of arrays and structs
+        self.values_count = 0
+        self.depth = 0
+
+    def start(self, tag: str, _attrs: dict[str, str]) -> None:
+        self.text.clear()
+
+        if not self.root_found:
+            if tag != "methodCall":
+                raise RPCInvalidRequest("missing methodCall tag")
+            self.root_found = True
+
+        elif tag == "value":
+            self.values_count += 1
+            self.limits.check_values(self.values_count)
+            self.stack.append([tag, [NOT_SET, NOT_SET]])
+        elif tag in ("array", "struct"):
+            self.depth += 1
+            self.limits.check_depth(self.depth)
+            self.stack.append([tag, [] if tag == "array" else {}])
+        elif tag == "params":
+            self.stack.append([tag, []])
+        elif tag in ("param", "member"):
+            self.stack.append([tag, [NOT_SET, NOT_SET]])
+        elif tag == "base64" and self.base64_max_memory_size is not None:
+            self.base64_decoder = SpooledBase64Decoder(self.base64_max_memory_size)
+        elif tag not in STRUCTURE_TAGS and tag not in self.load_funcs:
+            raise RPCInvalidRequest(f"Unsupported type {tag}")
+
+    def end(self, tag: str) -> None:
+        text = "".join(self.text).strip()
+        self.text.clear()
+
+        if tag == "base64" and self.base64_decoder is not None:
+            decoder, self.base64_decoder = self.base64_decoder, None
+            self.add_value(decoder.result())
+        elif tag in self.load_funcs:
+            self.add_value(self.load_funcs[tag](text))
+        elif tag in self.end_funcs:
+            self.end_funcs[tag](text)
+
+    def end_value(self, text: str) -> None:
+        _, (_, value) = self.stack.pop()
+        # According to the specs, a value without type is a string
+        self.add_value(self.limits.check_string_length(text) if value is NOT_SET else value)
+
+    def end_container(self, _: str) -> None:
+        tag, value = self.stack.pop()
+        if tag == "array":
+            self.limits.check_array_length(len(value))
+        self.depth -= 1
+        self.add_value(value)
+
+    def end_name(self, text: str) -> None:
+        if not self.stack or self.stack[-1][0] != "member":
+            raise RPCInvalidRequest("name found outside of struct member")
+        self.stack[-1][1][0] = self.limits.check_string_length(text)
+
+    def end_member(self, _: str) -> None:
+        _, (name, value) = self.stack.pop()
+        if name is NOT_SET:
+            raise RPCInvalidRequest("missing member.name tag")
+        if value is NOT_SET:
+            raise RPCInvalidRequest("missing member.value tag")
+        struct = self.stack[-1][1]
+        struct[name] = value
+        self.limits.check_struct_members(len(struct))
+
+    def end_param(self, _: str) -> None:
+        _, (_, value) = self.stack.pop()
+        if value is NOT_SET:
+            raise RPCInvalidRequest("missing child element")
+        self.add_value(value)
+
+    def end_params(self, _: str) -> None:
+        _, self.args = self.stack.pop()
+
+    def end_method_name(self, text: str) -> None:
+        self.method_name = text
+
+    def data(self, text: str) -> None:
+        if self.base64_decoder is not None:
+            self.base64_decoder.feed(text)
+        else:
+            self.text.append(text)
+
+    def add_value(self, value: Any) -> None:
+        if not self.stack:
+            raise RPCInvalidRequest("value found outside of params")
+
+        tag, content = self.stack[-1]
+        if tag == "struct":
+            raise RPCInvalidRequest("value found outside of struct member")
+        if tag in ("params", "array"):
+            content.append(value)
+        # In params, values are wrapped in a <param> tag. Only the first value of params and members is kept
+        elif content[1] is NOT_SET:
+            content[1] = value
+
+    def get_request(self) -> XmlRpcRequest:
+        if self.method_name is None:
+            raise RPCInvalidRequest("missing methodCall.methodName tag")
+        return XmlRpcRequest(method_name=self.method_name, args=self.args or [])
+
+    def load_nil(self, _: str) -> None:
+        if self.allow_none:
+            return
+        raise ValueError("cannot unmarshal <nil/> unless allow_none is enabled")
+
+    @staticmethod
+    def load_bool(value: str) -> bool:
+        if value not in ("0", "1"):
+            raise TypeError(f"invalid boolean value: only 0 and 1 are allowed, found {value}")
+        return value == "1"
+
+    @staticmethod
+    def load_datetime(value: str) -> datetime:
+        return datetime.strptime(value, "%Y%m%dT%H:%M:%S")
+
+
+def reject_dtd(*_) -> NoReturn:
+    raise RPCInsecureRequest("DTD is forbidden")
+
+
+def forbid_entities(*_) -> NoReturn:
+    raise RPCInsecureRequest("Entity declarations are forbidden")
+
+
+def harden_parser(parser: "xml.parsers.expat.XMLParserType", forbid_dtd: bool = True) -> None:
+    """Configure an expat parser to reject entity declarations (and DTD, if requested), like defusedxml does"""
+    if forbid_dtd:
+        parser.StartDoctypeDeclHandler = reject_dtd
+    parser.EntityDeclHandler = forbid_entities
+    parser.UnparsedEntityDeclHandler = forbid_entities
+    parser.ExternalEntityRefHandler = forbid_entities
+    parser.SetParamEntityParsing(xml.parsers.expat.XML_PARAM_ENTITY_PARSING_NEVER)
+
+
+class HardenedExpat:
+    """
+    Replacement for the xml.parsers.expat module, for libraries accepting an alternate expat implementation (like
+    xmltodict). Created parsers are hardened with harden_parser().
+    """
+
+    def __init__(self, forbid_dtd: bool = True):
+        self.forbid_dtd = forbid_dtd
+
+    def ParserCreate(self, *args, **kwargs) -> "xml.parsers.expat.XMLParserType":
+        parser = xml.parsers.expat.ParserCreate(*args, **kwargs)
+        harden_parser(parser, self.forbid_dtd)
+        return parser
+
+
+class ExpatDeserializer:
+    """
+    xml-rpc deserializer based on python builtin expat parser. Requests are built directly from parser events, without
+    building any element tree. DTD and entity declarations are rejected, like defusedxml does.
+    """
+
+    # Request bodies spooled to disk are passed as a memory-mapped buffer instead of str (see SpooledRequestBody)
+    accepts_buffer: ClassVar[bool] = True
+
+    def __init__(
+        self,
+        unmarshaller_klass="modernrpc.xmlrpc.backends.expat.ExpatUnmarshaller",
+        unmarshaller_kwargs: CustomKwargs = None,
+        forbid_dtd: bool = True,
+    ):
+        self.unmarshaller_klass = import_string(unmarshaller_klass)
+        self.unmarshaller_kwargs = unmarshaller_kwargs or {}
+
+        self.forbid_dtd = forbid_dtd
+
+    def create_parser(self, unmarshaller: ExpatUnmarshaller) -> "xml.parsers.expat.XMLParserType":
+        parser = xml.parsers.expat.ParserCreate()
+        # Character data is reported in a single call for each text node
+        parser.buffer_text = True
+        parser.StartElementHandler = unmarshaller.start
+        parser.EndElementHandler = unmarshaller.end
+        parser.CharacterDataHandler = unmarshaller.data
+
+        harden_parser(parser, self.forbid_dtd)
+        return parser
+
+    def loads(self, data: str) -> XmlRpcRequest:
+        unmarshaller = self.unmarshaller_klass(**self.unmarshaller_kwargs)
+
+        try:
+            self.create_parser(unmarshaller).Parse(data, True)
+        except xml.parsers.expat.ExpatError as exc:
+            raise RPCParseError(str(exc)) from exc
+        except RPCException:
+            raise
+        except Exception as exc:
+            raise RPCInvalidRequest(str(exc)) from exc
+
+        return unmarshaller.get_request()
@@ -1,10 +1,12 @@
+import threading
+from collections.abc import Iterator
 from functools import cached_property
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
 import lxml.etree
 from django.utils.module_loading import import_string
 
-from modernrpc.exceptions import RPCInvalidRequest, RPCMarshallingError, RPCParseError
+from modernrpc.exceptions import RPCException, RPCInsecureRequest, RPCInvalidRequest, RPCMarshallingError, RPCParseError
 from modernrpc.types import CustomKwargs
 from modernrpc.xmlrpc.handler import XmlRpcRequest, XmlRpcResult
 
@@ -18,6 +20,9 @@ LXML_DEFAULT_ELEMENT_TYPE = "lxml.etree._Element"
 class LxmlDeserializer:
     """xml-rpc deserializer based on the third-party lxml library"""
 
+    # Request bodies spooled to disk are passed as a memory-mapped buffer instead of str (see SpooledRequestBody)
+    accepts_buffer: ClassVar[bool] = True
+
     def __init__(
         self,
         unmarshaller_klass="modernrpc.xmlrpc.backends.marshalling.EtreeElementUnmarshaller",
@@ -39,27 +44,116 @@ class LxmlDeserializer:
         self.load_parser_kwargs.setdefault("huge_tree", False)  # Prevent the billion-laugh attack
 
         self.load_kwargs = load_kwargs or {}
+        # A parser given in load_kwargs is used as is. Caller is responsible for its thread-safety
+        self.custom_parser = self.load_kwargs.pop("parser", None)
+
+        self.thread_parsers = threading.local()
 
     @cached_property
-    def unmarshaller(self):
-        return self.unmarshaller_klass[self.element_type_klass](**self.unmarshaller_kwargs)
+    def unmarshaller_type(self):
+        return self.unmarshaller_klass[self.element_type_klass]
 
-    def loads(self, data: str) -> XmlRpcRequest:
-        if "parser" not in self.load_kwargs:
-            # Create a custom parser, with default secure params, configurable from settings
-            parser = lxml.etree.XMLParser(**self.load_parser_kwargs)
-            self.load_kwargs["parser"] = parser
+    def get_parser(self) -> lxml.etree.XMLParser:
+        """
+        Return the parser of the current thread, created on first use with secure params, configurable from settings.
+        lxml parsers are not thread-safe, so they can't be shared by all threads of a threaded server.
+        """
+        if self.custom_parser is not None:
+            return self.custom_parser
 
         try:
-            root_obj: _Element = lxml.etree.fromstring(data, **self.load_kwargs)
+            return self.thread_parsers.parser
+        except AttributeError:
+            parser = self.thread_parsers.parser = lxml.etree.XMLParser(**self.load_parser_kwargs)
+            return parser
+
+    def loads(self, data: str) -> XmlRpcRequest:
+        try:
+            root_obj: _Element = lxml.etree.fromstring(data, parser=self.get_parser(), **self.load_kwargs)
         except lxml.etree.XMLSyntaxError as exc:
             raise RPCParseError(str(exc)) from exc
 
+        # Unmarshallers keep track of the request structure, a new one is needed for each request
+        unmarshaller = self.unmarshaller_type(**self.unmarshaller_kwargs)
+        try:
+            return unmarshaller.element_to_request(root_obj)
+        except RPCException:
+            raise
+        except Exception as exc:
+            raise RPCInvalidRequest(str(exc)) from exc
+
+
+class LxmlIterparseDeserializer:
+    """
+    xml-rpc deserializer based on the incremental parser of the third-party lxml library. Each element is converted as
+    soon as it is complete, then removed from the tree. The memory used by the tree only depends on the nesting depth
+    and on chunk_size, not on the size of the request.
+    """
+
+    # Request bodies spooled to disk are passed as a memory-mapped buffer instead of str (see SpooledRequestBody)
+    accepts_buffer: ClassVar[bool] = True
+
+    def __init__(
+        self,
+        unmarshaller_klass="modernrpc.xmlrpc.backends.expat.ExpatUnmarshaller",
+        unmarshaller_kwargs: CustomKwargs = None,
+        load_parser_kwargs: CustomKwargs = None,
+        chunk_size: int = 64 * 1024,
+        forbid_dtd: bool = True,
+    ):
+        self.unmarshaller_klass = import_string(unmarshaller_klass)
+        self.unmarshaller_kwargs = unmarshaller_kwargs or {}
+
+        self.load_parser_kwargs = load_parser_kwargs or {}
+        self.load_parser_kwargs.setdefault("resolve_entities", False)  # Prevent entity expansion
+        self.load_parser_kwargs.setdefault("no_network", True)  # Prevent network access
+        self.load_parser_kwargs.setdefault("dtd_validation", False)  # Disable DTD validation
+        self.load_parser_kwargs.setdefault("load_dtd", False)  # Disable DTD loading
+        self.load_parser_kwargs.setdefault("huge_tree", False)  # Prevent the billion-laugh attack
+
+        self.chunk_size = chunk_size
+        # Entities are not resolved, but unresolved references would silently be ignored. Reject DTD to prevent that
+        self.forbid_dtd = forbid_dtd
+
+    def iter_events(self, data: str) -> Iterator[tuple[str, "_Element"]]:
+        """Feed the parser with data, one chunk at a time, and yield parsing events as soon as they are available"""
+        parser = lxml.etree.XMLPullParser(events=("start", "end"), **self.load_parser_kwargs)
+        for index in range(0, len(data), self.chunk_size):
+            parser.feed(data[index : index + self.chunk_size])
+            yield from parser.read_events()
+        parser.close()
+        yield from parser.read_events()
+
+    def loads(self, data: str) -> XmlRpcRequest:
+        unmarshaller = self.unmarshaller_klass(**self.unmarshaller_kwargs)
+
         try:
-            return self.unmarshaller.element_to_request(root_obj)
+            for event, element in self.iter_events(data):
+                if event == "start":
+                    if self.forbid_dtd and element.getparent() is None and element.getroottree().docinfo.doctype:
+                        raise RPCInsecureRequest("DTD is forbidden")
+                    unmarshaller.start(element.tag, element.attrib)
+                    continue
+
+                if element.text:
+                    unmarshaller.data(element.text)
+                unmarshaller.end(element.tag)
+
+                # The element has been converted, remove it (and previous siblings) from the tree
+                element.clear()
+                parent = element.getparent()
+                while parent is not None and element.getprevious() is not None:
+                    del parent[0]
+
+        except lxml.etree.XMLSyntaxError as exc:
+            raise RPCParseError(str(exc)) from exc
+        except RPCException:
+            raise
         except Exception as exc:
             raise RPCInvalidRequest(str(exc)) from exc
 
+        return unmarshaller.get_request()
+
 
 class LxmlSerializer:
     """xml-rpc serializer based on the third-party lxml library"""
@@ -2,14 +2,17 @@ import base64
 from collections import OrderedDict
 from collections.abc import Callable, Iterable
 from datetime import datetime
+from tempfile import SpooledTemporaryFile
 from types import NoneType
 from typing import Any, Generic, Protocol, TypeVar
 
 from modernrpc.compat import Self
 from modernrpc.exceptions import RPCInvalidRequest
 from modernrpc.helpers import first
+from modernrpc.limits import StructureLimits
 from modernrpc.types import DictStrAny, RpcErrorResult
 from modernrpc.xmlrpc.backends.constants import MAXINT, MININT
+from modernrpc.xmlrpc.backends.spooling import decode_base64
 from modernrpc.xmlrpc.handler import XmlRpcRequest, XmlRpcResult
 
 
@@ -37,8 +40,24 @@ DumpFuncType = Callable[[Any], ElementType]
 
 
 class EtreeElementUnmarshaller(Generic[ElementType]):
-    def __init__(self, allow_none=True) -> None:
+    """
+    Build an XmlRpcRequest from an element tree. Structural limits (see StructureLimits) are checked while the tree is
+    walked, so a new instance must be used for each request.
+    """
+
+    def __init__(
+        self,
+        allow_none=True,
+        base64_max_memory_size: int | None = None,
+        limits: StructureLimits | DictStrAny | None = None,
+    ) -> None:
         self.allow_none = allow_none
+        # When set, larger base64 values are decoded into a temporary file (see decode_base64())
+        self.base64_max_memory_size = base64_max_memory_size
+        self.limits = StructureLimits.build(limits)
+        # Number of values found so far, and current nesting level of arrays and structs
+        self.values_count = 0
+        self.depth = 0
 
         self.load_funcs: dict[str, LoadFuncType] = {
             "value": self.load_value,
@@ -91,6 +110,8 @@ class EtreeElementUnmarshaller(Generic[ElementType]):
         return load_func(elt)
 
     def load_value(self, element: ElementType) -> Any:
+        self.values_count += 1
+        self.limits.check_values(self.values_count)
         return self.dispatch(self.first_child(element))
 
     def load_nil(self, _: ElementType) -> None:
@@ -111,19 +132,30 @@ class EtreeElementUnmarshaller(Generic[ElementType]):
         return float(self.stripped_text(elt))
 
     def load_str(self, elt: ElementType) -> str:
-        return str(self.stripped_text(elt))
+        return self.limits.check_string_length(str(self.stripped_text(elt)))
 
     def load_datetime(self, elt: ElementType) -> datetime:
         return datetime.strptime(self.stripped_text(elt), "%Y%m%dT%H:%M:%S")
 
-    def load_base64(self, elt: ElementType) -> bytes:
-        return base64.b64decode(self.stripped_text(elt))
+    def load_base64(self, elt: ElementType) -> bytes | SpooledTemporaryFile:
+        return decode_base64(self.stripped_text(elt), self.base64_max_memory_size)
 
     def load_array(self, elt: ElementType) -> list[Any]:
-        return [self.dispatch(value_elt) for value_elt in elt.findall("./data/value")]
+        self.depth += 1
+        self.limits.check_depth(self.depth)
+        value_elts = elt.findall("./data/value")
+        self.limits.check_array_length(len(value_elts))
+        values = [self.dispatch(value_elt) for value_elt in value_elts]
+        self.depth -= 1
+        return values
 
     def load_struct(self, elt: ElementType) -> DictStrAny:
-        member_names_and_values = [self.load_struct_member(member) for member in elt.findall("./member")]
+        self.depth += 1
+        self.limits.check_depth(self.depth)
+        members = elt.findall("./member")
+        self.limits.check_struct_members(len(members))
+        member_names_and_values = [self.load_struct_member(member) for member in members]
+        self.depth -= 1
         return dict(member_names_and_values)
 
     def load_struct_member(self, member_elt: ElementType) -> tuple[str, Any]:
@@ -134,7 +166,7 @@ class EtreeElementUnmarshaller(Generic[ElementType]):
         if value is None:
             raise RPCInvalidRequest("missing member.value tag", data=member_elt)
 
-        return self.stripped_text(member_name), self.dispatch(value)
+        return self.limits.check_string_length(self.stripped_text(member_name)), self.dispatch(value)
 
 
 class EtreeElementMarshaller(Generic[ElementType]):
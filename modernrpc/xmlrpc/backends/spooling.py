@@ -0,0 +1,66 @@
+import base64
+import binascii
+import re
+from tempfile import SpooledTemporaryFile
+
+# Characters ignored by base64.b64decode(), when validate is False
+NON_BASE64_CHARS = re.compile(r"[^A-Za-z0-9+/=]")
+
+
+class SpooledBase64Decoder:
+    """
+    Decode base64 text incrementally. Decoded data is written into a SpooledTemporaryFile, kept in memory up to
+    max_memory_size bytes, and moved to a temporary file on disk above this size.
+
+    Text is decoded chunk_size characters at a time, so neither the whole text without whitespaces nor the whole
+    decoded value is ever built in memory.
+    """
+
+    def __init__(self, max_memory_size: int, chunk_size: int = 64 * 1024) -> None:
+        self.max_memory_size = max_memory_size
+        # Each chunk must contain complete quadruplets of base64 characters
+        self.chunk_size = chunk_size - chunk_size % 4 or 4
+        self.file = SpooledTemporaryFile(max_size=max_memory_size)  # noqa: SIM115 (returned by result())
+        self.pending = ""
+
+    def feed(self, text: str) -> None:
+        for start in range(0, len(text), self.chunk_size):
+            chunk = self.pending + NON_BASE64_CHARS.sub("", text[start : start + self.chunk_size])
+            complete_length = len(chunk) - len(chunk) % 4
+            self.file.write(base64.b64decode(chunk[:complete_length]))
+            self.pending = chunk[complete_length:]
+
+    def result(self) -> bytes | SpooledTemporaryFile:
+        """
+        Return the decoded value. Values smaller than max_memory_size are returned as bytes, larger ones as a file
+        object, positioned at the beginning of the data. Raise binascii.Error if the text is not valid base64.
+        """
+        # Like b64decode(), incomplete quadruplets raise an error
+        try:
+            self.file.write(base64.b64decode(self.pending))
+        except binascii.Error:
+            self.file.close()
+            raise
+        self.pending = ""
+
+        size = self.file.tell()
+        self.file.seek(0)
+        if size > self.max_memory_size:
+            return self.file
+
+        with self.file:
+            return self.file.read()
+
+
+def decode_base64(text: str, max_memory_size: int | None = None) -> bytes | SpooledTemporaryFile:
+    """
+    Decode the given base64 text. When max_memory_size is set and the decoded value is larger, it is decoded
+    incrementally into a temporary file, returned instead of bytes (see SpooledBase64Decoder).
+    """
+    # Each group of 4 base64 characters contains 3 bytes, a smaller text can be decoded directly
+    if max_memory_size is None or len(text) // 4 * 3 <= max_memory_size:
+        return base64.b64decode(text)
+
+    decoder = SpooledBase64Decoder(max_memory_size)
+    decoder.feed(text)
+    return decoder.result()
@@ -0,0 +1,185 @@
+import base64
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import datetime
+from functools import cached_property
+from types import NoneType
+from typing import Any
+
+from django.utils.module_loading import import_string
+
+from modernrpc.exceptions import RPCMarshallingError
+from modernrpc.types import CustomKwargs, RpcErrorResult
+from modernrpc.xmlrpc.backends.constants import MAXINT, MININT
+from modernrpc.xmlrpc.handler import XmlRpcResult
+
+DumpFuncType = Callable[[Any, list[str]], None]
+
+
+def escape(text: str) -> str:
+    """Escape text content, the same way ElementTree does"""
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def text_element(tag: str, text: str) -> str:
+    """Return an element with the given (already escaped) text. Empty elements are written as <tag />, like etree"""
+    return f"<{tag}>{text}</{tag}>" if text else f"<{tag} />"
+
+
+class StringBuilderMarshaller:
+    """
+    Write XML-RPC responses directly into a list of strings, without building any element tree. The output is identical
+    to the one produced by EtreeElementMarshaller, serialized with ElementTree.
+
+    Struct members prefixes (member and name tags, with escaped key) are cached for string keys, up to key_cache_size
+    distinct keys. Set key_cache_size to 0 to disable the cache.
+    """
+
+    def __init__(self, allow_none=True, key_cache_size=1024) -> None:
+        self.allow_none = allow_none
+
+        self.key_cache_size = key_cache_size
+        self.member_prefixes: dict[str, str] = {}
+
+        self.dump_funcs: dict[type, DumpFuncType] = {
+            NoneType: self.dump_nil,
+            bool: self.dump_bool,
+            int: self.dump_int,
+            float: self.dump_float,
+            str: self.dump_str,
+            bytes: self.dump_bytearray,
+            bytearray: self.dump_bytearray,
+            datetime: self.dump_datetime,
+            list: self.dump_list,
+            tuple: self.dump_list,
+            dict: self.dump_dict,
+            OrderedDict: self.dump_dict,
+        }
+
+    def result_to_string(self, result: XmlRpcResult) -> str:
+        """Convert an XmlRpcResult to an XML string."""
+        parts: list[str] = []
+
+        if isinstance(result, RpcErrorResult):
+            parts.append("<methodResponse><fault><value><struct>")
+            parts.append(f"<member><name>faultCode</name><value><int>{result.code}</int></value></member>")
+            parts.append("<member><name>faultString</name><value>")
+            self.dump_str(result.message, parts)
+            parts.append("</value></member></struct></value></fault></methodResponse>")
+        else:
+            parts.append("<methodResponse><params><param><value>")
+            self.dispatch(result.data, parts)
+            parts.append("</value></param></params></methodResponse>")
+
+        return "".join(parts)
+
+    def dispatch(self, value: Any, parts: list[str]) -> None:
+        """Dispatch a value to the appropriate dump method."""
+        try:
+            dump_func = self.dump_funcs[type(value)]
+        except KeyError as exc:
+            raise TypeError(f"Unsupported type: {type(value)}") from exc
+
+        dump_func(value, parts)
+
+    def dump_nil(self, _: None, parts: list[str]) -> None:
+        if self.allow_none:
+            parts.append("<nil />")
+            return
+        raise ValueError("cannot marshal None unless allow_none is enabled")
+
+    @staticmethod
+    def dump_bool(value: bool, parts: list[str]) -> None:
+        parts.append("<boolean>1</boolean>" if value else "<boolean>0</boolean>")
+
+    @staticmethod
+    def dump_int(value: int, parts: list[str]) -> None:
+        if value > MAXINT or value < MININT:
+            raise OverflowError("int value exceeds XML-RPC limits")
+        parts.append(f"<int>{value}</int>")
+
+    @staticmethod
+    def dump_float(value: float, parts: list[str]) -> None:
+        parts.append(f"<double>{value}</double>")
+
+    @staticmethod
+    def dump_str(value: str, parts: list[str]) -> None:
+        parts.append(text_element("string", escape(value)))
+
+    @staticmethod
+    def dump_datetime(value: datetime, parts: list[str]) -> None:
+        parts.append(f"<dateTime.iso8601>{value.strftime('%04Y%02m%02dT%H:%M:%S')}</dateTime.iso8601>")
+
+    @staticmethod
+    def dump_bytearray(value: bytes | bytearray, parts: list[str]) -> None:
+        parts.append(text_element("base64", base64.b64encode(value).decode()))
+
+    @staticmethod
+    def build_member_prefix(key: str) -> str:
+        return f"<member>{text_element('name', escape(key))}<value>"
+
+    def member_prefix(self, key: Any) -> str:
+        # Only string keys are cached: different keys may compare equal (1 and True) but have different representations
+        if type(key) is not str:
+            return self.build_member_prefix(str(key))
+
+        try:
+            return self.member_prefixes[key]
+        except KeyError:
+            prefix = self.build_member_prefix(key)
+            if len(self.member_prefixes) < self.key_cache_size:
+                self.member_prefixes[key] = prefix
+            return prefix
+
+    def dump_dict(self, value: dict, parts: list[str]) -> None:
+        if not value:
+            parts.append("<struct />")
+            return
+
+        parts.append("<struct>")
+        for key, val in value.items():
+            parts.append(self.member_prefix(key))
+            self.dispatch(val, parts)
+            parts.append("</value></member>")
+        parts.append("</struct>")
+
+    def dump_list(self, value: list | tuple, parts: list[str]) -> None:
+        if not value:
+            parts.append("<array><data /></array>")
+            return
+
+        parts.append("<array><data>")
+        for val in value:
+            parts.append("<value>")
+            self.dispatch(val, parts)
+            parts.append("</value>")
+        parts.append("</data></array>")
+
+
+class StringBuilderSerializer:
+    """xml-rpc serializer writing responses directly as strings, without building any element tree"""
+
+    def __init__(
+        self,
+        marshaller_klass="modernrpc.xmlrpc.backends.stringbuilder.StringBuilderMarshaller",
+        marshaller_kwargs: CustomKwargs = None,
+    ):
+        self.marshaller_klass = import_string(marshaller_klass)
+        self.marshaller_kwargs = marshaller_kwargs or {}
+
+    @cached_property
+    def marshaller(self) -> StringBuilderMarshaller:
+        return self.marshaller_klass(**self.marshaller_kwargs)
+
+    def dumps(self, result: XmlRpcResult) -> str:
+        """Serialize an XmlRpcResult to an XML string."""
+        try:
+            return self.marshaller.result_to_string(result)
+        except Exception as exc:
+            raise RPCMarshallingError(result.data, exc) from exc
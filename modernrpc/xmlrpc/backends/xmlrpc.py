@@ -1,35 +1,137 @@
 import xml.parsers.expat
 import xmlrpc.client
+from typing import Any, ClassVar
 from xmlrpc.client import Fault, ResponseError
 
 import defusedxml.xmlrpc
 
-from modernrpc.exceptions import RPCInsecureRequest, RPCInvalidRequest, RPCMarshallingError, RPCParseError
-from modernrpc.types import CustomKwargs, RpcErrorResult
+from modernrpc.exceptions import RPCException, RPCInsecureRequest, RPCInvalidRequest, RPCMarshallingError, RPCParseError
+from modernrpc.limits import UNLIMITED, StructureLimits
+from modernrpc.types import CustomKwargs, DictStrAny, RpcErrorResult
+from modernrpc.xmlrpc.backends.spooling import decode_base64
 from modernrpc.xmlrpc.handler import XmlRpcRequest, XmlRpcResult
 
 # Apply defusedxml monkey-patch once at import time to secure xmlrpc.client globally
 defusedxml.xmlrpc.monkey_patch()
 
 
+class PythonXmlRpcUnmarshaller(xmlrpc.client.Unmarshaller):
+    """
+    Builtin xmlrpc unmarshaller, checking structural limits (see StructureLimits) as soon as the corresponding tag is
+    found. When base64_max_memory_size is set, larger base64 values are decoded into temporary files.
+    """
+
+    # Copy of the base class dispatch table, with custom handlers (see below)
+    dispatch = dict(xmlrpc.client.Unmarshaller.dispatch)  # noqa: RUF012
+
+    def __init__(
+        self,
+        base64_max_memory_size: int | None = None,
+        limits: StructureLimits | None = None,
+        use_datetime=False,
+        use_builtin_types=False,
+    ) -> None:
+        super().__init__(use_datetime=use_datetime, use_builtin_types=use_builtin_types)
+        self.base64_max_memory_size = base64_max_memory_size
+        self.limits = limits or StructureLimits()
+        self.use_builtin_types = use_builtin_types
+        self.values_count = 0
+        # Limits are compared on each element, disabled ones are replaced by a value which can't be reached
+        self.max_values = UNLIMITED if self.limits.max_values is None else self.limits.max_values
+        self.max_depth = UNLIMITED if self.limits.max_depth is None else self.limits.max_depth
+
+    def start(self, tag: str, attrs: dict[str, str]) -> None:
+        # Same as the base class method, with limits checks. Calling the base method from here would noticeably slow
+        # down the parsing, as this is called for each element
+        if ":" in tag:
+            tag = tag.rsplit(":", 1)[-1]
+        if tag == "value":
+            self.values_count += 1
+            if self.values_count > self.max_values:
+                self.limits.check_values(self.values_count)
+        elif tag in ("array", "struct"):
+            # A mark is kept for each array and struct being built
+            if len(self._marks) >= self.max_depth:
+                self.limits.check_depth(len(self._marks) + 1)
+            self._marks.append(len(self._stack))
+        self._data = []
+        if self._value and tag not in self.dispatch:
+            raise ResponseError(f"unknown tag {tag!r}")
+        self._value = tag == "value"
+
+    def end_string(self, data: str) -> None:
+        if self.limits.max_string_length is not None:
+            self.limits.check_string_length(data)
+        super().end_string(data)
+
+    dispatch["string"] = end_string  # type: ignore[assignment]
+    dispatch["name"] = end_string  # type: ignore[assignment]
+
+    def end_array(self, data: str) -> None:
+        self.limits.check_array_length(len(self._stack) - self._marks[-1])
+        super().end_array(data)
+
+    dispatch["array"] = end_array  # type: ignore[assignment]
+
+    def end_struct(self, data: str) -> None:
+        # Members names and values are stacked after the mark
+        self.limits.check_struct_members((len(self._stack) - self._marks[-1]) // 2)
+        super().end_struct(data)
+
+    dispatch["struct"] = end_struct  # type: ignore[assignment]
+
+    def end_base64(self, data: str) -> None:
+        value: Any = decode_base64(data, self.base64_max_memory_size)
+        if isinstance(value, bytes) and not self.use_builtin_types:
+            value = xmlrpc.client.Binary(value)
+        self.append(value)
+        self._value = False
+
+    dispatch["base64"] = end_base64  # type: ignore[assignment]
+
+
 class PythonXmlRpcDeserializer:
     """xml-rpc deserializer based on python builtin xmlrpc module"""
 
-    def __init__(self, load_kwargs: CustomKwargs = None):
+    # Request bodies spooled to disk are passed as a memory-mapped buffer instead of str (see SpooledRequestBody)
+    accepts_buffer: ClassVar[bool] = True
+
+    def __init__(
+        self,
+        load_kwargs: CustomKwargs = None,
+        base64_max_memory_size: int | None = None,
+        limits: StructureLimits | DictStrAny | None = None,
+    ):
 
         self.load_kwargs = load_kwargs or {}
         self.load_kwargs.setdefault("use_datetime", True)
         self.load_kwargs.setdefault("use_builtin_types", True)
 
+        # When set, larger base64 values are decoded into a temporary file (see decode_base64())
+        self.base64_max_memory_size = base64_max_memory_size
+        self.limits = StructureLimits.build(limits)
+
+    def parse(self, data: str) -> tuple[tuple, str | None]:
+        """Same as xmlrpc.client.loads(), using PythonXmlRpcUnmarshaller"""
+        unmarshaller = PythonXmlRpcUnmarshaller(self.base64_max_memory_size, self.limits, **self.load_kwargs)
+        parser = defusedxml.xmlrpc.DefusedExpatParser(unmarshaller)
+        parser.feed(data)
+        parser.close()
+        return unmarshaller.close(), unmarshaller.getmethodname()
+
     def loads(self, data: str) -> XmlRpcRequest:
         try:
-            params, method_name = xmlrpc.client.loads(data, **self.load_kwargs)
+            params, method_name = self.parse(data)
         except xml.parsers.expat.ExpatError as exc:
             raise RPCParseError(str(exc)) from exc
-        except (ResponseError, TypeError) as exc:
-            raise RPCInvalidRequest(str(exc)) from exc
         except defusedxml.DefusedXmlException as exc:
             raise RPCInsecureRequest(str(exc)) from exc
+        except RPCException:
+            raise
+        # DefusedXmlException is a subclass of ValueError, it must be handled first
+        # IndexError is raised by the base unmarshaller on malformed structs (e.g. a name without value)
+        except (ResponseError, TypeError, ValueError, IndexError) as exc:
+            raise RPCInvalidRequest(str(exc)) from exc
 
         if not method_name:
             raise RPCInvalidRequest("Unable to find method name", data=data)
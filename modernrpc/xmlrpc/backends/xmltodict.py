@@ -5,17 +5,20 @@ from collections.abc import Callable
 from datetime import datetime
 from functools import cached_property
 from io import StringIO
+from tempfile import SpooledTemporaryFile
 from types import NoneType
-from typing import Any, Literal
+from typing import Any, ClassVar, Literal
 
-import defusedxml.ElementTree
 import xmltodict
 from django.utils.module_loading import import_string
 
-from modernrpc.exceptions import RPCInsecureRequest, RPCInvalidRequest, RPCMarshallingError, RPCParseError
+from modernrpc.exceptions import RPCException, RPCInvalidRequest, RPCMarshallingError, RPCParseError
 from modernrpc.helpers import first
+from modernrpc.limits import StructureLimits
 from modernrpc.types import CustomKwargs, DictStrAny, RpcErrorResult
 from modernrpc.xmlrpc.backends.constants import MAXINT, MININT
+from modernrpc.xmlrpc.backends.expat import HardenedExpat
+from modernrpc.xmlrpc.backends.spooling import decode_base64
 from modernrpc.xmlrpc.handler import XmlRpcRequest, XmlRpcResult
 
 LoadFuncType = Callable[[Any], Any]
@@ -23,8 +26,24 @@ DumpFuncType = Callable[[Any], dict]
 
 
 class Unmarshaller:
-    def __init__(self, allow_none=True) -> None:
+    """
+    Build an XmlRpcRequest from the data parsed by xmltodict. Structural limits (see StructureLimits) are checked while
+    the data is walked, so a new instance must be used for each request.
+    """
+
+    def __init__(
+        self,
+        allow_none=True,
+        base64_max_memory_size: int | None = None,
+        limits: StructureLimits | DictStrAny | None = None,
+    ) -> None:
         self.allow_none = allow_none
+        # When set, larger base64 values are decoded into a temporary file (see decode_base64())
+        self.base64_max_memory_size = base64_max_memory_size
+        self.limits = StructureLimits.build(limits)
+        # Number of values found so far, and current nesting level of arrays and structs
+        self.values_count = 0
+        self.depth = 0
         self.load_funcs: dict[str, LoadFuncType] = {
             "value": self.load_value,
             "nil": self.load_nil,
@@ -90,6 +109,12 @@ class Unmarshaller:
 
     def load_value(self, data: dict) -> Any:
         _type, value = first(data.items())
+        return self.dispatch_value(_type, value)
+
+    def dispatch_value(self, _type: str, value: Any) -> Any:
+        """Same as dispatch(), for the content of a <value> tag"""
+        self.values_count += 1
+        self.limits.check_values(self.values_count)
         return self.dispatch(_type, value)
 
     def load_nil(self, _) -> None:
@@ -111,33 +136,40 @@ class Unmarshaller:
     def load_float(data: str) -> float:
         return float(data)
 
-    @staticmethod
-    def load_str(data: str) -> str:
-        return str(data)
+    def load_str(self, data: str) -> str:
+        return self.limits.check_string_length(str(data))
 
     @staticmethod
     def load_datetime(data: str) -> datetime:
         return datetime.strptime(data, "%Y%m%dT%H:%M:%S")
 
-    @staticmethod
-    def load_base64(data: str) -> bytes:
-        return base64.b64decode(data)
+    def load_base64(self, data: str) -> bytes | SpooledTemporaryFile:
+        return decode_base64(data, self.base64_max_memory_size)
 
     def load_array(self, data: dict[str, dict[str, list[DictStrAny]]]):
+        self.depth += 1
+        self.limits.check_depth(self.depth)
+        elements = data["data"].get("value", [])
+        self.limits.check_array_length(len(elements))
         values = []
-        for element in data["data"].get("value", []):
+        for element in elements:
             _type, value = first(element.items())
-            values.append(self.dispatch(_type, value))
+            values.append(self.dispatch_value(_type, value))
+        self.depth -= 1
         return values
 
     def load_struct(self, data: dict):
+        self.depth += 1
+        self.limits.check_depth(self.depth)
+        self.limits.check_struct_members(len(data["member"]))
         res = {}
         for member in data["member"]:
             value = member["value"]
             if len(value) > 1:
                 raise ValueError
             _type, value = first(value.items())
-            res[member["name"]] = self.dispatch(_type, value)
+            res[self.limits.check_string_length(member["name"])] = self.dispatch_value(_type, value)
+        self.depth -= 1
         return res
 
 
@@ -249,42 +281,37 @@ class Marshaller:
 class XmlToDictDeserializer:
     """xml-rpc deserializer based on the third-party xmltodict library"""
 
+    # Request bodies spooled to disk are passed as a memory-mapped buffer instead of str (see SpooledRequestBody)
+    accepts_buffer: ClassVar[bool] = True
+
     def __init__(
         self,
         unmarshaller_klass="modernrpc.xmlrpc.backends.xmltodict.Unmarshaller",
         unmarshaller_kwargs: CustomKwargs = None,
         load_kwargs: CustomKwargs = None,
+        forbid_dtd: bool = True,
     ):
         self.unmarshaller_klass = import_string(unmarshaller_klass)
         self.unmarshaller_kwargs = unmarshaller_kwargs or {}
         self.load_kwargs = load_kwargs or {}
         self.load_kwargs["force_list"] = Unmarshaller.do_force_list
-
-    @cached_property
-    def unmarshaller(self):
-        return self.unmarshaller_klass(**self.unmarshaller_kwargs)
+        # Parse with a hardened expat parser, rejecting DTD and entity declarations, like defusedxml does.
+        # Entities are already rejected by the parser, xmltodict must not replace the corresponding handler
+        self.load_kwargs.setdefault("expat", HardenedExpat(forbid_dtd=forbid_dtd))
+        self.load_kwargs.setdefault("disable_entities", False)
 
     def loads(self, data: str) -> XmlRpcRequest:
-        try:
-            # First, parse the XML using defusedxml.ElementTree for security
-            # This will raise appropriate exceptions for XML vulnerabilities
-            root = defusedxml.ElementTree.fromstring(data)
-
-            # Convert the parsed XML to a string and then parse it with xmltodict
-            # This is safe because defusedxml has already validated the XML
-            data = defusedxml.ElementTree.tostring(root, encoding="utf-8").decode("utf-8")
-        except defusedxml.ElementTree.ParseError as exc:
-            raise RPCParseError(str(exc)) from exc
-        except defusedxml.DefusedXmlException as exc:
-            raise RPCInsecureRequest(str(exc)) from exc
-
         try:
             structured_data: DictStrAny = xmltodict.parse(data, **self.load_kwargs)
         except xml.parsers.expat.ExpatError as exc:
             raise RPCParseError(str(exc)) from exc
 
+        # Unmarshallers keep track of the request structure, a new one is needed for each request
+        unmarshaller = self.unmarshaller_klass(**self.unmarshaller_kwargs)
         try:
-            return self.unmarshaller.dict_to_request(structured_data)
+            return unmarshaller.dict_to_request(structured_data)
+        except RPCException:
+            raise
         except Exception as exc:
             raise RPCInvalidRequest(str(exc)) from exc
 
@@ -1,14 +1,15 @@
 import logging
+import xmlrpc.client
+from collections.abc import AsyncIterator, Iterator
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, ClassVar
-
-from django.utils.module_loading import import_string
+from typing import TYPE_CHECKING, Any, ClassVar
 
 from modernrpc import Protocol, RpcRequestContext
+from modernrpc.backends import BackendProbe, load_backend
 from modernrpc.config import settings
 from modernrpc.exceptions import RPCException
-from modernrpc.handler import RpcHandler
-from modernrpc.types import DictStrAny, RpcErrorResult, RpcRequest, RpcSuccessResult
+from modernrpc.handler import RequestBody, RpcHandler
+from modernrpc.types import RpcErrorResult, RpcRequest, RpcSuccessResult
 
 if TYPE_CHECKING:
     from modernrpc.xmlrpc.backends import XmlRpcDeserializer, XmlRpcSerializer
@@ -24,6 +25,21 @@ XmlRpcSuccessResult = RpcSuccessResult[XmlRpcRequest]
 XmlRpcErrorResult = RpcErrorResult[XmlRpcRequest]
 XmlRpcResult = XmlRpcSuccessResult | XmlRpcErrorResult
 
+# Representative data used to check (and calibrate) candidate backends, when a backend setting is "auto"
+PROBE_PARAMS: list[Any] = [1, -2.5, "caf\u00e9", True, [1, 2], {"key": "value"}]
+PROBE_REQUEST_BODY = xmlrpc.client.dumps(tuple(PROBE_PARAMS), methodname="system.probe")
+
+DESERIALIZER_PROBE = BackendProbe(
+    run=lambda deserializer: deserializer.loads(PROBE_REQUEST_BODY),
+    check=lambda request: request.method_name == "system.probe" and list(request.args) == PROBE_PARAMS,
+)
+SERIALIZER_PROBE = BackendProbe(
+    run=lambda serializer: serializer.dumps(
+        XmlRpcSuccessResult(request=XmlRpcRequest(method_name="system.probe"), data=PROBE_PARAMS)
+    ),
+    check=lambda response: xmlrpc.client.loads(response) == ((PROBE_PARAMS,), None),
+)
+
 
 class XmlRpcHandler(RpcHandler[XmlRpcRequest]):
     """Default XML-RPC handler implementation"""
@@ -33,26 +49,41 @@ class XmlRpcHandler(RpcHandler[XmlRpcRequest]):
     response_content_type = "application/xml"
     success_result_type = XmlRpcSuccessResult
     error_result_type = XmlRpcErrorResult
+    streamed_array_delimiters = ("<data>", "", "</data>")
+
+    # Backends considered when MODERNRPC_XML_DESERIALIZER or MODERNRPC_XML_SERIALIZER is "auto", fastest first
+    deserializer_candidates: ClassVar[list[str]] = [
+        "modernrpc.xmlrpc.backends.expat.ExpatDeserializer",
+        "modernrpc.xmlrpc.backends.lxml.LxmlDeserializer",
+        "modernrpc.xmlrpc.backends.xmlrpc.PythonXmlRpcDeserializer",
+        "modernrpc.xmlrpc.backends.etree.EtreeDeserializer",
+        "modernrpc.xmlrpc.backends.lxml.LxmlIterparseDeserializer",
+        "modernrpc.xmlrpc.backends.xmltodict.XmlToDictDeserializer",
+    ]
+    serializer_candidates: ClassVar[list[str]] = [
+        "modernrpc.xmlrpc.backends.stringbuilder.StringBuilderSerializer",
+        "modernrpc.xmlrpc.backends.xmlrpc.PythonXmlRpcSerializer",
+        "modernrpc.xmlrpc.backends.lxml.LxmlSerializer",
+        "modernrpc.xmlrpc.backends.etree.EtreeSerializer",
+        "modernrpc.xmlrpc.backends.xmltodict.XmlToDictSerializer",
+    ]
 
     def __init__(self) -> None:
-        deserializer_config = settings.MODERNRPC_XML_DESERIALIZER
-        deserializer_klass: type[XmlRpcDeserializer] = import_string(deserializer_config["class"])
-        deserializer_kwargs: DictStrAny = deserializer_config.get("kwargs", {})
-        self.deserializer: XmlRpcDeserializer = deserializer_klass(**deserializer_kwargs)
-
-        serializer_config = settings.MODERNRPC_XML_SERIALIZER
-        serializer_klass: type[XmlRpcSerializer] = import_string(serializer_config["class"])
-        serializer_kwargs: DictStrAny = serializer_config.get("kwargs", {})
-        self.serializer: XmlRpcSerializer = serializer_klass(**serializer_kwargs)
-
-    def process_request(self, request_body: str, context: RpcRequestContext) -> str:
+        self.deserializer: XmlRpcDeserializer = load_backend(
+            settings.MODERNRPC_XML_DESERIALIZER, self.deserializer_candidates, DESERIALIZER_PROBE
+        )
+        self.serializer: XmlRpcSerializer = load_backend(
+            settings.MODERNRPC_XML_SERIALIZER, self.serializer_candidates, SERIALIZER_PROBE
+        )
+
+    def process_request(self, request_body: RequestBody, context: RpcRequestContext) -> str | Iterator[str]:
         """
         Parse request and delegates to process_single_request(), catching exceptions to handle errors.
 
         `system.multicall()` is implemented in the `modernrpc.system_procedures` module.
         """
         try:
-            request = self.deserializer.loads(request_body)
+            request = self.loads_request_body(request_body)
 
         except RPCException as exc:
             rpc_exc = context.server.on_error(exc, context)
@@ -60,7 +91,9 @@ class XmlRpcHandler(RpcHandler[XmlRpcRequest]):
                 self.build_error_result(XmlRpcRequest(method_name=""), rpc_exc.code, rpc_exc.message)
             )
 
-        result = self.process_single_request(request, context)
+        result = self.process_single_request(request, context, streamable=True)
+        if self.is_streamed_result(result):
+            return self.stream_result(result, context)
 
         try:
             return self.serializer.dumps(result)
@@ -69,14 +102,14 @@ class XmlRpcHandler(RpcHandler[XmlRpcRequest]):
             rpc_exc = context.server.on_error(exc, context)
             return self.serializer.dumps(self.build_error_result(request, rpc_exc.code, rpc_exc.message))
 
-    async def aprocess_request(self, request_body: str, context: RpcRequestContext) -> str:
+    async def aprocess_request(self, request_body: RequestBody, context: RpcRequestContext) -> str | AsyncIterator[str]:
         """
         Parse request and delegates to process_single_request(), catching exceptions to handle errors.
 
         `system.multicall()` is implemented in the `modernrpc.system_procedures` module.
         """
         try:
-            request = self.deserializer.loads(request_body)
+            request = self.loads_request_body(request_body)
 
         except RPCException as exc:
             rpc_exc = context.server.on_error(exc, context)
@@ -84,7 +117,9 @@ class XmlRpcHandler(RpcHandler[XmlRpcRequest]):
                 self.build_error_result(XmlRpcRequest(method_name=""), rpc_exc.code, rpc_exc.message)
             )
 
-        result = await self.aprocess_single_request(request, context)
+        result = await self.aprocess_single_request(request, context, streamable=True)
+        if self.is_streamed_result(result):
+            return await self.astream_result(result, context)
 
         try:
             return self.serializer.dumps(result)
@@ -92,3 +127,10 @@ class XmlRpcHandler(RpcHandler[XmlRpcRequest]):
         except RPCException as exc:
             rpc_exc = context.server.on_error(exc, context)
             return self.serializer.dumps(self.build_error_result(request, rpc_exc.code, rpc_exc.message))
+
+    def get_streamed_envelope(self, result: XmlRpcSuccessResult, serialized: str) -> tuple[str, str]:
+        # Values are escaped, so the first <data> and the last </data> tags always delimit the result array
+        start, end = serialized.find("<data>"), serialized.rfind("</data>")
+        if start == -1 or end == -1:
+            raise ValueError("Unexpected serialized response format, unable to stream the result")
+        return serialized[:start], serialized[end + len("</data>") :]
@@ -0,0 +1,118 @@
+import datetime as dt
+from decimal import Decimal
+
+import cbor2
+import pytest
+
+from modernrpc.cbor.backends.cbor2 import Cbor2Deserializer, Cbor2Serializer
+from modernrpc.exceptions import RPCInvalidRequest, RPCMarshallingError, RPCParseError
+from modernrpc.jsonrpc.handler import JsonRpcErrorResult, JsonRpcRequest, JsonRpcSuccessResult, RawJSON
+
+
+class TestCbor2Deserializer:
+    deserializer = Cbor2Deserializer()
+
+    def test_single_request(self):
+        payload = cbor2.dumps({"jsonrpc": "2.0", "id": 5, "method": "foo", "params": {"a": b"\x00\x01"}})
+
+        request = self.deserializer.loads(payload)
+
+        assert request.method_name == "foo"
+        assert request.request_id == 5
+        assert request.kwargs == {"a": b"\x00\x01"}
+
+    def test_batch_request(self):
+        payload = cbor2.dumps(
+            [{"jsonrpc": "2.0", "id": 5, "method": "foo", "params": [1]}, {"jsonrpc": "2.0", "method": "bar"}]
+        )
+
+        requests = self.deserializer.loads(payload)
+
+        assert [request.method_name for request in requests] == ["foo", "bar"]
+        assert requests[1].is_notification
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            dt.datetime(2024, 1, 1, 10, 0, tzinfo=dt.timezone.utc),
+            dt.date(2024, 1, 1),
+            2**100,
+            -(2**100),
+            Decimal("1.25"),
+            bytes(range(256)),
+        ],
+    )
+    def test_tagged_values(self, value):
+        payload = cbor2.dumps({"jsonrpc": "2.0", "id": 5, "method": "foo", "params": [value]})
+
+        assert self.deserializer.loads(payload).args == [value]
+
+    @pytest.mark.parametrize("payload", [b"\xff", b"\x82\x01", b"\x82\x01\x02\x03"])
+    def test_invalid_payload(self, payload):
+        with pytest.raises(RPCParseError):
+            self.deserializer.loads(payload)
+
+    def test_cyclic_reference(self):
+        with pytest.raises(RPCParseError, match="shared references are not supported"):
+            self.deserializer.loads(bytes.fromhex("d81c81d81d00"))
+
+    def test_shared_reference(self):
+        shared = [1, 2]
+        payload = cbor2.dumps(
+            {"jsonrpc": "2.0", "id": 5, "method": "foo", "params": [shared, shared]}, value_sharing=True
+        )
+
+        with pytest.raises(RPCParseError, match="shared references are not supported"):
+            self.deserializer.loads(payload)
+
+    @pytest.mark.parametrize("data", [42, [1, 2], {"jsonrpc": "2.0", "id": 5}, {"method": "foo"}])
+    def test_invalid_request(self, data):
+        with pytest.raises(RPCInvalidRequest):
+            self.deserializer.loads(cbor2.dumps(data))
+
+
+class TestCbor2Serializer:
+    serializer = Cbor2Serializer()
+    request = JsonRpcRequest(request_id=5, method_name="foo")
+
+    def dumps_and_load(self, data):
+        result = JsonRpcSuccessResult(request=self.request, data=data)
+        return cbor2.loads(self.serializer.dumps(result))["result"]
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            b"\x00\xff",
+            2**100,
+            dt.datetime(2024, 1, 1, 10, 0, tzinfo=dt.timezone.utc),
+            dt.date(2024, 1, 1),
+            Decimal("1.5"),
+        ],
+    )
+    def test_native_types(self, value):
+        assert self.dumps_and_load(value) == value
+
+    def test_naive_datetime(self, settings):
+        settings.TIME_ZONE = "UTC"
+        serializer = Cbor2Serializer()
+        result = JsonRpcSuccessResult(request=self.request, data=dt.datetime(2024, 1, 1, 10, 0))
+
+        assert cbor2.loads(serializer.dumps(result))["result"] == dt.datetime(2024, 1, 1, 10, 0, tzinfo=dt.timezone.utc)
+
+    def test_django_types(self):
+        assert self.dumps_and_load(dt.timedelta(hours=1)) == "P0DT01H00M00S"
+
+    def test_raw_json(self):
+        assert self.dumps_and_load(RawJSON('{"a": [1, 2]}')) == {"a": [1, 2]}
+
+    def test_error_result(self):
+        result = JsonRpcErrorResult(request=self.request, code=-32000, message="Oops", data={"x": 1})
+        assert cbor2.loads(self.serializer.dumps(result)) == {
+            "id": 5,
+            "jsonrpc": "2.0",
+            "error": {"code": -32000, "message": "Oops", "data": {"x": 1}},
+        }
+
+    def test_unserializable_result(self):
+        with pytest.raises(RPCMarshallingError):
+            self.dumps_and_load(object())
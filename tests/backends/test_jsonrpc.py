@@ -1,13 +1,18 @@
 import json
 import random
 from collections import OrderedDict
+from collections.abc import Iterator
 from datetime import datetime
 
 import pytest
-from helpers import assert_json_data_are_equal
+from django.core.exceptions import ImproperlyConfigured
+from helpers import JSON_DESERIALIZERS_CLASSES, JSON_SERIALIZERS_CLASSES, assert_json_data_are_equal
 
 from modernrpc.exceptions import RPCInvalidRequest, RPCMarshallingError, RPCParseError
-from modernrpc.jsonrpc.handler import JsonRpcErrorResult, JsonRpcRequest, JsonRpcSuccessResult
+from modernrpc.jsonrpc.backends.json import PythonJsonIncrementalDeserializer
+from modernrpc.jsonrpc.backends.marshalling import Marshaller
+from modernrpc.jsonrpc.backends.msgspec import MsgspecSerializer
+from modernrpc.jsonrpc.handler import JsonRpcErrorResult, JsonRpcRequest, JsonRpcSuccessResult, RawJSON
 
 
 class TestJsonRpcDeserializer:
@@ -217,6 +222,11 @@ class TestJsonRpcDeserializer:
         with pytest.raises(RPCInvalidRequest):
             json_deserializer.loads(payload)
 
+    @pytest.mark.parametrize("payload", ["5", '"foo"', "null", "[1, 2]"])
+    def test_invalid_payload_type(self, json_deserializer, payload):
+        with pytest.raises(RPCInvalidRequest):
+            json_deserializer.loads(payload)
+
     @pytest.mark.parametrize(
         "request_id",
         [
@@ -325,6 +335,10 @@ class TestJsonRpcSerializer:
         ],
     )
     def test_result_unsupported_type(self, request, json_serializer, value):
+        if isinstance(json_serializer, MsgspecSerializer) and isinstance(value, bytes):
+            marker = pytest.mark.xfail(reason="MsgspecSerializer encodes bytes values as base64 strings", strict=True)
+            request.applymarker(marker)
+
         result = JsonRpcSuccessResult(request=self.req1, data=value)
         with pytest.raises(RPCMarshallingError) as exc:
             json_serializer.dumps(result)
@@ -358,3 +372,272 @@ class TestJsonRpcSerializer:
             }
         }"""
         assert_json_data_are_equal(json_serializer.dumps(result), expected)
+
+    def test_result_raw_json(self, json_serializer):
+        raw = '[{"id": 1, "tags": ["a", "b"]},   {"id": 2, "tags": []}]'
+        result = JsonRpcSuccessResult(request=self.req1, data=RawJSON(raw))
+
+        dumped = json_serializer.dumps(result)
+
+        # Raw content is written verbatim (i.e. with its original formatting)
+        assert raw in dumped
+        assert_json_data_are_equal(dumped, f'{{"id": "1", "jsonrpc": "2.0", "result": {raw}}}')
+
+    def test_result_nested_raw_json(self, json_serializer):
+        data = {"date": datetime(2024, 1, 5, 12, 30), "items": [RawJSON('{"x": 1}'), RawJSON("null")]}
+        result = JsonRpcSuccessResult(request=self.req1, data=data)
+
+        dumped = json_serializer.dumps(result)
+
+        assert json.loads(dumped)["result"]["items"] == [{"x": 1}, None]
+        assert json.loads(dumped)["result"]["date"].startswith("2024-01-05T12:30:00")
+
+    def test_result_raw_json_placeholder_like_string(self, json_serializer):
+        lookalike = f"modernrpc-raw-json:{'0' * 32}:0"
+        result = JsonRpcSuccessResult(request=self.req1, data=[RawJSON("true"), lookalike])
+
+        assert json.loads(json_serializer.dumps(result))["result"] == [True, lookalike]
+
+    def test_result_batch_raw_json(self, json_serializer):
+        results = [
+            JsonRpcSuccessResult(request=self.req0, data=RawJSON('{"a": 1}')),
+            JsonRpcSuccessResult(request=self.notif, data=RawJSON('{"b": 2}')),
+            JsonRpcErrorResult(request=self.req1, code=65000, message="bar", data=RawJSON('{"c": 3}')),
+        ]
+        expected = """
+        [
+          {"id": null, "jsonrpc": "2.0", "result": {"a": 1}},
+          null,
+          {"id": "1", "jsonrpc": "2.0", "error": {"code": 65000, "message": "bar", "data": {"c": 3}}}
+        ]
+        """
+        assert_json_data_are_equal(json_serializer.dumps(results), expected)
+
+
+class TestJsonRpcIncrementalDeserializer:
+    deserializer = PythonJsonIncrementalDeserializer()
+
+    def test_single_request(self):
+        request = self.deserializer.loads('{"id": 255, "jsonrpc": "2.0", "method": "foo", "params": [5]}')
+        assert isinstance(request, JsonRpcRequest)
+        assert request.request_id == 255
+        assert request.args == [5]
+
+    def test_batch_request(self):
+        payload = """
+        [
+          {"jsonrpc": "2.0", "id": 33, "method": "foo", "params": {"a": 5, "b": null}} ,
+          {"jsonrpc": "2.0", "method": "bar", "params": ["abcd", 123.5]}
+        ]
+        """
+        requests = self.deserializer.loads(payload)
+        assert isinstance(requests, Iterator)
+
+        first_request = next(requests)
+        assert first_request.request_id == 33
+        assert first_request.kwargs == {"a": 5, "b": None}
+
+        second_request = next(requests)
+        assert second_request.is_notification is True
+        assert second_request.args == ["abcd", 123.5]
+
+        with pytest.raises(StopIteration):
+            next(requests)
+
+    def test_empty_batch(self):
+        assert list(self.deserializer.loads(" [ ] ")) == []
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            "[",
+            '[{"jsonrpc": "2.0", "id": 33, "method": }]',
+            '[{"jsonrpc": "2.0", "id": 33 "method": "foo"}]',
+        ],
+    )
+    def test_invalid_first_element(self, payload):
+        with pytest.raises(RPCParseError):
+            self.deserializer.loads(payload)
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            '[{"jsonrpc": "2.0", "id": 1, "method": "foo"}, {"jsonrpc": "2.0", "id": 33, "method": }]',
+            '[{"jsonrpc": "2.0", "id": 1, "method": "foo"} {"jsonrpc": "2.0", "id": 33, "method": "foo"}]',
+            '[{"jsonrpc": "2.0", "id": 1, "method": "foo"}, {"jsonrpc": "2.0", "id": 33, "method": "foo"}',
+            '[{"jsonrpc": "2.0", "id": 1, "method": "foo"}, {"jsonrpc": "2.0", "id": 33, "method": "foo"}] 5',
+        ],
+    )
+    def test_invalid_second_element(self, payload):
+        requests = self.deserializer.loads(payload)
+        assert next(requests).request_id == 1
+        with pytest.raises(RPCParseError):
+            list(requests)
+
+    def test_invalid_element_type(self):
+        requests = self.deserializer.loads('[{"jsonrpc": "2.0", "id": 1, "method": "foo"}, [1, 2]]')
+        assert next(requests).request_id == 1
+        with pytest.raises(RPCInvalidRequest):
+            next(requests)
+
+
+class TestStructureLimits:
+    @pytest.fixture(params=[*JSON_DESERIALIZERS_CLASSES, PythonJsonIncrementalDeserializer])
+    def deserializer_factory(self, request):
+        def factory(**limits):
+            return request.param(limits=limits)
+
+        return factory
+
+    @staticmethod
+    def build_payload(params) -> str:
+        return json.dumps({"id": 1, "jsonrpc": "2.0", "method": "foo", "params": params})
+
+    @staticmethod
+    def build_batch_payload(size: int) -> str:
+        return json.dumps([{"id": i, "jsonrpc": "2.0", "method": "foo", "params": [i]} for i in range(size)])
+
+    @staticmethod
+    def nested_arrays(depth: int) -> list:
+        value: list = [1]
+        for _ in range(depth - 1):
+            value = [value]
+        return value
+
+    def test_disabled_by_default(self, json_deserializer):
+        payload = self.build_payload([self.nested_arrays(200), "x" * 100_000, list(range(100_000))])
+
+        assert json_deserializer.loads(payload).args[0] == self.nested_arrays(200)
+
+    def test_deeply_nested_payload(self, json_deserializer):
+        # Parsers refuse too deep structures by themselves, no matter which limits are configured
+        payload = '{"id": 1, "jsonrpc": "2.0", "method": "foo", "params": [' + "[" * 100_000 + "]" * 100_001 + "}"
+
+        with pytest.raises(RPCParseError):
+            json_deserializer.loads(payload)
+
+    def test_default_max_depth(self, deserializer_factory):
+        deserializer = deserializer_factory()
+
+        assert deserializer.loads(self.build_payload([self.nested_arrays(64)])).method_name == "foo"
+        with pytest.raises(RPCInvalidRequest, match=r"maximum nesting depth exceeded \(64\)"):
+            deserializer.loads(self.build_payload([self.nested_arrays(65)]))
+
+    def test_max_depth_with_objects(self, deserializer_factory):
+        params = {"a": {"b": [1]}}
+
+        assert deserializer_factory(max_depth=2).loads(self.build_payload(params)).kwargs == params
+        with pytest.raises(RPCInvalidRequest, match="maximum nesting depth exceeded"):
+            deserializer_factory(max_depth=1).loads(self.build_payload(params))
+
+    def test_max_values(self, deserializer_factory):
+        # The object itself, and its 5 member values
+        payload = self.build_payload([{f"m{i}": "x" for i in range(5)}])
+
+        assert deserializer_factory(max_values=6).loads(payload).args[0]["m4"] == "x"
+        with pytest.raises(RPCInvalidRequest, match=r"maximum number of values exceeded \(5\)"):
+            deserializer_factory(max_values=5).loads(payload)
+
+    def test_max_array_length(self, deserializer_factory):
+        payload = self.build_payload([1, [2, 3, 4]])
+
+        assert deserializer_factory(max_array_length=3).loads(payload).args == [1, [2, 3, 4]]
+        with pytest.raises(RPCInvalidRequest, match=r"maximum array length exceeded \(2\)"):
+            deserializer_factory(max_array_length=2).loads(payload)
+
+    def test_max_struct_members(self, deserializer_factory):
+        payload = self.build_payload({f"m{i}": i for i in range(10)})
+
+        assert len(deserializer_factory(max_struct_members=10).loads(payload).kwargs) == 10
+        with pytest.raises(RPCInvalidRequest, match=r"maximum number of struct members exceeded \(9\)"):
+            deserializer_factory(max_struct_members=9).loads(payload)
+
+    @pytest.mark.parametrize("params", [["x" * 11], [{"x" * 11: 1}]], ids=["string", "member name"])
+    def test_max_string_length(self, deserializer_factory, params):
+        payload = self.build_payload(params)
+
+        assert deserializer_factory(max_string_length=11).loads(payload).args == params
+        with pytest.raises(RPCInvalidRequest, match=r"maximum string length exceeded \(10\)"):
+            deserializer_factory(max_string_length=10).loads(payload)
+
+    def test_limits_checked_in_batch(self, deserializer_factory):
+        payload = json.dumps([{"id": 1, "jsonrpc": "2.0", "method": "foo", "params": [self.nested_arrays(3)]}] * 2)
+
+        with pytest.raises(RPCInvalidRequest, match="maximum nesting depth exceeded"):
+            list(deserializer_factory(max_depth=2).loads(payload))
+
+    def test_max_batch_size(self, deserializer_factory):
+        assert len(list(deserializer_factory(max_batch_size=3).loads(self.build_batch_payload(3)))) == 3
+        with pytest.raises(RPCInvalidRequest):
+            list(deserializer_factory(max_batch_size=3).loads(self.build_batch_payload(4)))
+
+
+class CustomMarshaller(Marshaller):
+    pass
+
+
+@pytest.fixture(params=[klass for klass in JSON_SERIALIZERS_CLASSES if klass is not MsgspecSerializer])
+def template_serializer(request):
+    return request.param(envelope_template=True)
+
+
+class TestJsonRpcEnvelopeTemplate:
+    """Ensure serializers configured with envelope_template=True produce the same output as the standard path"""
+
+    notif = JsonRpcRequest(method_name="webhook")
+
+    @pytest.mark.parametrize("request_id", [None, 0, -5, 1234, 3.5, "", "foo", 'quote"d\n'])
+    @pytest.mark.parametrize(
+        "data",
+        [None, True, 42, "foo", datetime(2025, 1, 2, 4, 5, 6), ["a", 1, 2.5], {"x": {"y": [1, 2]}}],
+    )
+    def test_success_result(self, template_serializer, request_id, data):
+        result = JsonRpcSuccessResult(request=JsonRpcRequest(request_id=request_id, method_name="foo"), data=data)
+        expected = type(template_serializer)().dumps(result)
+        assert_json_data_are_equal(template_serializer.dumps(result), expected)
+
+    def test_notification_result(self, template_serializer):
+        assert template_serializer.dumps(JsonRpcSuccessResult(request=self.notif, data=55)) == "null"
+
+    def test_custom_jsonrpc_version(self, template_serializer):
+        result = JsonRpcSuccessResult(request=JsonRpcRequest(request_id=1, method_name="foo", jsonrpc="1.0"), data=5)
+        assert json.loads(template_serializer.dumps(result)) == {"id": 1, "jsonrpc": "1.0", "result": 5}
+
+    @pytest.mark.parametrize("data", [None, {"reason": "foo"}])
+    def test_error_result(self, template_serializer, data):
+        request = JsonRpcRequest(request_id="abc", method_name="foo")
+        result = JsonRpcErrorResult(request=request, code=-32000, message='Bad "value"', data=data)
+        expected = type(template_serializer)().dumps(result)
+        assert_json_data_are_equal(template_serializer.dumps(result), expected)
+
+    def test_batch_result(self, template_serializer):
+        results = [
+            JsonRpcSuccessResult(request=JsonRpcRequest(request_id=1, method_name="foo"), data=[10, 20]),
+            JsonRpcSuccessResult(request=self.notif),
+            JsonRpcErrorResult(request=JsonRpcRequest(request_id=2, method_name="foo"), code=-1, message="bar"),
+            JsonRpcSuccessResult(request=JsonRpcRequest(request_id=3, method_name="foo"), data=RawJSON('{"a": 1}')),
+        ]
+        expected = """
+        [
+          {"id": 1, "jsonrpc": "2.0", "result": [10, 20]},
+          null,
+          {"id": 2, "jsonrpc": "2.0", "error": {"code": -1, "message": "bar"}},
+          {"id": 3, "jsonrpc": "2.0", "result": {"a": 1}}
+        ]
+        """
+        assert_json_data_are_equal(template_serializer.dumps(results), expected)
+
+    def test_raw_json_result(self, template_serializer):
+        raw = '{"a":   [1, 2]}'
+        result = JsonRpcSuccessResult(request=JsonRpcRequest(request_id=1, method_name="foo"), data=RawJSON(raw))
+        assert template_serializer.dumps(result) == f'{{"id":1,"jsonrpc":"2.0","result":{raw}}}'
+
+    def test_custom_marshaller_rejected(self, template_serializer):
+        with pytest.raises(ImproperlyConfigured):
+            type(template_serializer)(marshaller_klass=f"{__name__}.CustomMarshaller", envelope_template=True)
+
+    def test_result_unsupported_type(self, template_serializer):
+        result = JsonRpcSuccessResult(request=JsonRpcRequest(request_id=33, method_name="foo"), data=...)
+        with pytest.raises(RPCMarshallingError) as exc:
+            template_serializer.dumps(result)
+        assert "Unable to serialize result data: {'id': 33, 'jsonrpc': '2.0', 'result': Ellipsis}" in exc.value.message
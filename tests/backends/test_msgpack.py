@@ -0,0 +1,96 @@
+import datetime as dt
+from decimal import Decimal
+
+import msgpack
+import pytest
+
+from modernrpc.exceptions import RPCInvalidRequest, RPCMarshallingError, RPCParseError
+from modernrpc.jsonrpc.handler import JsonRpcErrorResult, JsonRpcRequest, JsonRpcSuccessResult, RawJSON
+from modernrpc.msgpack.backends.msgpack import MsgpackDeserializer, MsgpackSerializer
+
+
+class TestMsgpackDeserializer:
+    deserializer = MsgpackDeserializer()
+
+    def test_single_request(self):
+        payload = msgpack.packb({"jsonrpc": "2.0", "id": 5, "method": "foo", "params": {"a": b"\x00\x01"}})
+
+        request = self.deserializer.loads(payload)
+
+        assert request.method_name == "foo"
+        assert request.request_id == 5
+        assert request.kwargs == {"a": b"\x00\x01"}
+
+    def test_batch_request(self):
+        payload = msgpack.packb(
+            [{"jsonrpc": "2.0", "id": 5, "method": "foo", "params": [1]}, {"jsonrpc": "2.0", "method": "bar"}]
+        )
+
+        requests = self.deserializer.loads(payload)
+
+        assert [request.method_name for request in requests] == ["foo", "bar"]
+        assert requests[1].is_notification
+
+    def test_timestamp(self):
+        date = dt.datetime(2024, 1, 1, 10, 0, tzinfo=dt.timezone.utc)
+        payload = msgpack.packb({"jsonrpc": "2.0", "id": 5, "method": "foo", "params": [date]}, datetime=True)
+
+        assert self.deserializer.loads(payload).args == [date]
+
+    @pytest.mark.parametrize("payload", [b"\xc1", b"\x92\x01", b"\x92\x01\x02\x03"])
+    def test_invalid_payload(self, payload):
+        with pytest.raises(RPCParseError):
+            self.deserializer.loads(payload)
+
+    @pytest.mark.parametrize("data", [42, [1, 2], {"jsonrpc": "2.0", "id": 5}, {"method": "foo"}])
+    def test_invalid_request(self, data):
+        with pytest.raises(RPCInvalidRequest):
+            self.deserializer.loads(msgpack.packb(data))
+
+
+class TestMsgpackSerializer:
+    serializer = MsgpackSerializer()
+    request = JsonRpcRequest(request_id=5, method_name="foo")
+
+    def dumps_and_load(self, data):
+        result = JsonRpcSuccessResult(request=self.request, data=data)
+        return msgpack.unpackb(self.serializer.dumps(result), timestamp=3)["result"]
+
+    def test_bytes(self):
+        assert self.dumps_and_load(b"\x00\xff") == b"\x00\xff"
+
+    def test_aware_datetime(self):
+        date = dt.datetime(2024, 1, 1, 10, 0, tzinfo=dt.timezone.utc)
+        assert self.dumps_and_load(date) == date
+
+    def test_naive_datetime(self, settings):
+        settings.TIME_ZONE = "UTC"
+        assert self.dumps_and_load(dt.datetime(2024, 1, 1, 10, 0)) == dt.datetime(
+            2024, 1, 1, 10, 0, tzinfo=dt.timezone.utc
+        )
+
+    def test_django_types(self):
+        assert self.dumps_and_load([dt.date(2024, 1, 1), Decimal("1.5")]) == ["2024-01-01", "1.5"]
+
+    def test_raw_json(self):
+        assert self.dumps_and_load(RawJSON('{"a": [1, 2]}')) == {"a": [1, 2]}
+
+    def test_error_result(self):
+        result = JsonRpcErrorResult(request=self.request, code=-32000, message="Oops", data={"x": 1})
+        assert msgpack.unpackb(self.serializer.dumps(result)) == {
+            "id": 5,
+            "jsonrpc": "2.0",
+            "error": {"code": -32000, "message": "Oops", "data": {"x": 1}},
+        }
+
+    def test_batch_result(self):
+        notification = JsonRpcRequest(method_name="foo")
+        results = [
+            JsonRpcSuccessResult(request=self.request, data=1),
+            JsonRpcSuccessResult(request=notification, data=2),
+        ]
+        assert msgpack.unpackb(self.serializer.dumps(results)) == [{"id": 5, "jsonrpc": "2.0", "result": 1}, None]
+
+    def test_unserializable_result(self):
+        with pytest.raises(RPCMarshallingError):
+            self.dumps_and_load(object())
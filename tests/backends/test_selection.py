@@ -0,0 +1,156 @@
+import logging
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from modernrpc import backends
+from modernrpc.backends import load_backend, select_backend
+from modernrpc.jsonrpc.backends.json import PythonJsonDeserializer, PythonJsonSerializer
+from modernrpc.jsonrpc.handler import DESERIALIZER_PROBE as JSON_DESERIALIZER_PROBE
+from modernrpc.jsonrpc.handler import SERIALIZER_PROBE as JSON_SERIALIZER_PROBE
+from modernrpc.jsonrpc.handler import JsonRpcHandler
+from modernrpc.xmlrpc.handler import DESERIALIZER_PROBE as XML_DESERIALIZER_PROBE
+from modernrpc.xmlrpc.handler import SERIALIZER_PROBE as XML_SERIALIZER_PROBE
+from modernrpc.xmlrpc.handler import XmlRpcHandler
+
+
+@pytest.fixture(autouse=True)
+def _clear_selection_cache():
+    backends._selected_backends.clear()  # noqa: SLF001
+    yield
+    backends._selected_backends.clear()  # noqa: SLF001
+
+
+class TestBackendSelection:
+    def test_explicit_class(self):
+        config = {"class": "modernrpc.jsonrpc.backends.json.PythonJsonSerializer", "kwargs": {}}
+        serializer = load_backend(config, [], JSON_SERIALIZER_PROBE)
+        assert isinstance(serializer, PythonJsonSerializer)
+
+    def test_auto_as_string(self):
+        candidates = ["modernrpc.jsonrpc.backends.json.PythonJsonDeserializer"]
+        deserializer = load_backend("auto", candidates, JSON_DESERIALIZER_PROBE)
+        assert isinstance(deserializer, PythonJsonDeserializer)
+
+    def test_unavailable_candidates_ignored(self):
+        candidates = [
+            "modernrpc.jsonrpc.backends.not_installed.Serializer",
+            "modernrpc.jsonrpc.backends.json.PythonJsonSerializer",
+        ]
+        selected = select_backend(candidates, {}, JSON_SERIALIZER_PROBE)
+        assert selected == "modernrpc.jsonrpc.backends.json.PythonJsonSerializer"
+
+    def test_non_conform_candidates_ignored(self, caplog):
+        candidates = [
+            "tests.helpers.BrokenJsonSerializer",
+            "modernrpc.jsonrpc.backends.json.PythonJsonSerializer",
+        ]
+        with caplog.at_level(logging.WARNING, logger="modernrpc.backends"):
+            selected = select_backend(candidates, {}, JSON_SERIALIZER_PROBE)
+
+        assert selected == "modernrpc.jsonrpc.backends.json.PythonJsonSerializer"
+        assert "BrokenJsonSerializer doesn't pass conformance checks" in caplog.text
+
+    def test_invalid_kwargs_ignored(self):
+        candidates = [
+            "tests.helpers.BrokenJsonSerializer",
+            "modernrpc.jsonrpc.backends.json.PythonJsonSerializer",
+        ]
+        selected = select_backend(candidates, {"dump_kwargs": {}}, JSON_SERIALIZER_PROBE)
+        assert selected == "modernrpc.jsonrpc.backends.json.PythonJsonSerializer"
+
+    def test_no_candidate_available(self):
+        candidates = [
+            "modernrpc.jsonrpc.backends.not_installed.Serializer",
+            "tests.helpers.BrokenJsonSerializer",
+        ]
+        with pytest.raises(ImproperlyConfigured, match="Unable to auto-select a backend"):
+            select_backend(candidates, {}, JSON_SERIALIZER_PROBE)
+
+    def test_selection_is_cached(self, monkeypatch):
+        candidates = ["modernrpc.jsonrpc.backends.json.PythonJsonSerializer"]
+        calls = []
+        original = backends._select_backend  # noqa: SLF001
+
+        def wrapper(*args):
+            calls.append(args)
+            return original(*args)
+
+        monkeypatch.setattr(backends, "_select_backend", wrapper)
+
+        select_backend(candidates, {}, JSON_SERIALIZER_PROBE)
+        select_backend(candidates, {}, JSON_SERIALIZER_PROBE)
+
+        assert len(calls) == 1
+
+    def test_unhashable_kwargs_not_cached(self, monkeypatch):
+        candidates = ["modernrpc.jsonrpc.backends.json.PythonJsonSerializer"]
+        calls = []
+
+        def fake_select_backend(*args):
+            calls.append(args)
+            return candidates[0]
+
+        monkeypatch.setattr(backends, "_select_backend", fake_select_backend)
+
+        kwargs = {"dump_kwargs": {"values": {1, 2}}}
+        assert select_backend(candidates, kwargs, JSON_SERIALIZER_PROBE) == candidates[0]
+        assert select_backend(candidates, kwargs, JSON_SERIALIZER_PROBE) == candidates[0]
+
+        assert len(calls) == 2
+
+    def test_calibration(self, settings, monkeypatch, caplog):
+        settings.MODERNRPC_BACKENDS_CALIBRATION = True
+        monkeypatch.setattr(backends, "CALIBRATION_NUMBER", 2)
+        candidates = [
+            "modernrpc.xmlrpc.backends.xmlrpc.PythonXmlRpcSerializer",
+            "modernrpc.xmlrpc.backends.etree.EtreeSerializer",
+        ]
+        with caplog.at_level(logging.INFO, logger="modernrpc.backends"):
+            selected = select_backend(candidates, {}, XML_SERIALIZER_PROBE)
+
+        assert selected in candidates
+        assert "auto-selected after calibration" in caplog.text
+        for dotted_path in candidates:
+            assert dotted_path in caplog.text
+
+
+@pytest.mark.parametrize("dotted_path", JsonRpcHandler.deserializer_candidates)
+def test_json_deserializer_candidates_conformance(dotted_path):
+    pytest.importorskip(dotted_path.rsplit(".", 1)[0])
+    assert select_backend([dotted_path], {}, JSON_DESERIALIZER_PROBE) == dotted_path
+
+
+@pytest.mark.parametrize("dotted_path", JsonRpcHandler.serializer_candidates)
+def test_json_serializer_candidates_conformance(dotted_path):
+    pytest.importorskip(dotted_path.rsplit(".", 1)[0])
+    assert select_backend([dotted_path], {}, JSON_SERIALIZER_PROBE) == dotted_path
+
+
+@pytest.mark.parametrize("dotted_path", XmlRpcHandler.deserializer_candidates)
+def test_xml_deserializer_candidates_conformance(dotted_path):
+    pytest.importorskip(dotted_path.rsplit(".", 1)[0])
+    assert select_backend([dotted_path], {}, XML_DESERIALIZER_PROBE) == dotted_path
+
+
+@pytest.mark.parametrize("dotted_path", XmlRpcHandler.serializer_candidates)
+def test_xml_serializer_candidates_conformance(dotted_path):
+    pytest.importorskip(dotted_path.rsplit(".", 1)[0])
+    assert select_backend([dotted_path], {}, XML_SERIALIZER_PROBE) == dotted_path
+
+
+def test_handlers_auto_settings(settings):
+    settings.MODERNRPC_JSON_DESERIALIZER = {"class": "auto"}
+    settings.MODERNRPC_JSON_SERIALIZER = {"class": "auto"}
+    settings.MODERNRPC_XML_DESERIALIZER = {"class": "auto"}
+    settings.MODERNRPC_XML_SERIALIZER = {"class": "auto"}
+
+    json_handler = JsonRpcHandler()
+    xml_handler = XmlRpcHandler()
+
+    assert f"{type(json_handler.deserializer).__module__}.{type(json_handler.deserializer).__name__}" in (
+        JsonRpcHandler.deserializer_candidates
+    )
+    assert f"{type(xml_handler.serializer).__module__}.{type(xml_handler.serializer).__name__}" in (
+        XmlRpcHandler.serializer_candidates
+    )
@@ -1,14 +1,22 @@
 import base64
 import inspect
+import threading
 import xmlrpc.client
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from tempfile import SpooledTemporaryFile
 
+import lxml.etree
 import pytest
 from helpers import assert_xml_data_are_equal
 from pytest_asyncio import fixture
 
 from modernrpc.exceptions import RPCInvalidRequest, RPCMarshallingError, RPCParseError
+from modernrpc.xmlrpc.backends.etree import EtreeDeserializer, EtreeSerializer
+from modernrpc.xmlrpc.backends.lxml import LxmlDeserializer, LxmlIterparseDeserializer
+from modernrpc.xmlrpc.backends.spooling import SpooledBase64Decoder, decode_base64
+from modernrpc.xmlrpc.backends.stringbuilder import StringBuilderSerializer
 from modernrpc.xmlrpc.handler import XmlRpcErrorResult, XmlRpcHandler, XmlRpcRequest, XmlRpcSuccessResult
 
 
@@ -321,6 +329,23 @@ class TestXmlRpcDeserializer:
         with pytest.raises(RPCInvalidRequest):
             xml_deserializer.loads(inspect.cleandoc(payload))
 
+    def test_struct_name_outside_member(self, xml_deserializer):
+        payload = """
+            <?xml version="1.0"?>
+            <methodCall>
+              <methodName>foo.bar</methodName>
+              <params>
+                <param><value><struct><name>x</name></struct></value></param>
+              </params>
+            </methodCall>
+        """
+        # Element tree based deserializers only look for member children, the name is ignored. Others reject it
+        if isinstance(xml_deserializer, (EtreeDeserializer, LxmlDeserializer)):
+            assert xml_deserializer.loads(inspect.cleandoc(payload)).args == [{}]
+        else:
+            with pytest.raises(RPCInvalidRequest):
+                xml_deserializer.loads(inspect.cleandoc(payload))
+
     @pytest.mark.parametrize("val", [5, True, False, -3, -1, "null", "true", "false"])
     def test_invalid_bool_value(self, xml_deserializer, val):
         payload = f"""
@@ -367,6 +392,8 @@ class TestXmlRpcDeserializerKwargs:
             "modernrpc.xmlrpc.backends.xmltodict.XmlToDictDeserializer",
             "modernrpc.xmlrpc.backends.etree.EtreeDeserializer",
             "modernrpc.xmlrpc.backends.lxml.LxmlDeserializer",
+            "modernrpc.xmlrpc.backends.expat.ExpatDeserializer",
+            "modernrpc.xmlrpc.backends.lxml.LxmlIterparseDeserializer",
         ],
     )
     def test_nil_disallowed(self, settings, deserializer):
@@ -391,6 +418,328 @@ class TestXmlRpcDeserializerKwargs:
         with pytest.raises(RPCInvalidRequest, match="cannot unmarshal <nil/> unless allow_none is enabled"):
             deserializer.loads(inspect.cleandoc(payload))
 
+    @pytest.mark.parametrize(
+        "deserializer",
+        [
+            "modernrpc.xmlrpc.backends.xmlrpc.PythonXmlRpcDeserializer",
+            "modernrpc.xmlrpc.backends.expat.ExpatDeserializer",
+            "modernrpc.xmlrpc.backends.lxml.LxmlIterparseDeserializer",
+        ],
+    )
+    def test_untyped_value(self, settings, deserializer):
+        settings.MODERNRPC_XML_DESERIALIZER = {"class": deserializer}
+
+        deserializer = XmlRpcHandler().deserializer
+        payload = """
+            <?xml version="1.0"?>
+            <methodCall>
+              <methodName>foo.bar</methodName>
+              <params>
+                <param><value>lorem ipsum</value></param>
+                <param><value><array><data><value>dolor</value></data></array></value></param>
+              </params>
+            </methodCall>
+        """
+
+        request = deserializer.loads(inspect.cleandoc(payload))
+
+        assert request.args == ["lorem ipsum", ["dolor"]]
+
+
+BINARY_DATA = bytes(range(256)) * 40
+
+
+class TestBase64Spooling:
+    @pytest.fixture(
+        params=[
+            ("modernrpc.xmlrpc.backends.xmlrpc.PythonXmlRpcDeserializer", False),
+            ("modernrpc.xmlrpc.backends.xmltodict.XmlToDictDeserializer", True),
+            ("modernrpc.xmlrpc.backends.etree.EtreeDeserializer", True),
+            ("modernrpc.xmlrpc.backends.lxml.LxmlDeserializer", True),
+            ("modernrpc.xmlrpc.backends.expat.ExpatDeserializer", True),
+            ("modernrpc.xmlrpc.backends.lxml.LxmlIterparseDeserializer", True),
+        ],
+        ids=lambda param: param[0].rsplit(".", 1)[-1],
+    )
+    def spooling_deserializer(self, request, settings):
+        klass, uses_unmarshaller = request.param
+        kwargs = {"base64_max_memory_size": 1000}
+        settings.MODERNRPC_XML_DESERIALIZER = {
+            "class": klass,
+            "kwargs": {"unmarshaller_kwargs": kwargs} if uses_unmarshaller else kwargs,
+        }
+        return XmlRpcHandler().deserializer
+
+    @staticmethod
+    def build_payload(*encoded_values: str) -> str:
+        params = "".join(f"<param><value><base64>{value}</base64></value></param>" for value in encoded_values)
+        return f"<?xml version='1.0'?><methodCall><methodName>upload</methodName><params>{params}</params></methodCall>"
+
+    def test_large_value_spooled(self, spooling_deserializer):
+        # Line breaks are inserted every 76 characters
+        payload = self.build_payload(base64.encodebytes(BINARY_DATA).decode())
+
+        (value,) = spooling_deserializer.loads(payload).args
+
+        assert isinstance(value, SpooledTemporaryFile)
+        assert value.read() == BINARY_DATA
+        value.close()
+
+    def test_small_value_in_memory(self, spooling_deserializer):
+        payload = self.build_payload(base64.b64encode(BINARY_DATA[:1000]).decode(), "AAAA")
+
+        assert spooling_deserializer.loads(payload).args == [BINARY_DATA[:1000], b"\x00\x00\x00"]
+
+    def test_invalid_value(self, spooling_deserializer):
+        payload = self.build_payload(base64.b64encode(BINARY_DATA).decode()[:-1])
+
+        with pytest.raises(RPCInvalidRequest):
+            spooling_deserializer.loads(payload)
+
+
+class TestSpooledBase64Decoder:
+    @pytest.mark.parametrize("feed_size", [1, 3, 7, 4096])
+    @pytest.mark.parametrize("chunk_size", [4, 10, 1024])
+    def test_chunks_boundaries(self, feed_size, chunk_size):
+        text = base64.encodebytes(BINARY_DATA).decode()
+        decoder = SpooledBase64Decoder(max_memory_size=100, chunk_size=chunk_size)
+
+        for start in range(0, len(text), feed_size):
+            decoder.feed(text[start : start + feed_size])
+
+        with decoder.result() as result:
+            assert result.read() == BINARY_DATA
+
+    def test_disk_rollover(self):
+        decoder = SpooledBase64Decoder(max_memory_size=100)
+        decoder.feed(base64.b64encode(BINARY_DATA[:100]).decode())
+        assert not decoder.file._rolled  # noqa: SLF001
+
+        decoder.feed(base64.b64encode(BINARY_DATA[:3]).decode())
+        assert decoder.file._rolled  # noqa: SLF001
+        decoder.result().close()
+
+    @pytest.mark.parametrize("max_memory_size", [None, 10, 10_000])
+    def test_same_result_as_b64decode(self, max_memory_size):
+        text = "SGVs bG8g\nd29y bGQh\t!!"
+
+        result = decode_base64(text, max_memory_size)
+
+        if not isinstance(result, bytes):
+            with result:
+                result = result.read()
+        assert result == base64.b64decode(text)
+
+
+class TestStructureLimits:
+    @pytest.fixture(
+        params=[
+            ("modernrpc.xmlrpc.backends.xmlrpc.PythonXmlRpcDeserializer", False),
+            ("modernrpc.xmlrpc.backends.xmltodict.XmlToDictDeserializer", True),
+            ("modernrpc.xmlrpc.backends.etree.EtreeDeserializer", True),
+            ("modernrpc.xmlrpc.backends.lxml.LxmlDeserializer", True),
+            ("modernrpc.xmlrpc.backends.expat.ExpatDeserializer", True),
+            ("modernrpc.xmlrpc.backends.lxml.LxmlIterparseDeserializer", True),
+        ],
+        ids=lambda param: param[0].rsplit(".", 1)[-1],
+    )
+    def deserializer_factory(self, request, settings):
+        klass, uses_unmarshaller = request.param
+
+        def factory(**limits):
+            kwargs = {"limits": limits}
+            settings.MODERNRPC_XML_DESERIALIZER = {
+                "class": klass,
+                "kwargs": {"unmarshaller_kwargs": kwargs} if uses_unmarshaller else kwargs,
+            }
+            return XmlRpcHandler().deserializer
+
+        return factory
+
+    @staticmethod
+    def build_payload(value: str) -> str:
+        return (
+            "<?xml version='1.0'?><methodCall><methodName>foo</methodName>"
+            f"<params><param><value>{value}</value></param></params></methodCall>"
+        )
+
+    @staticmethod
+    def nested_arrays(depth: int) -> str:
+        return "<array><data><value>" * depth + "<int>1</int>" + "</value></data></array>" * depth
+
+    @staticmethod
+    def struct(size: int, value: str = "x") -> str:
+        members = "".join(
+            f"<member><name>m{i}</name><value><string>{value}</string></value></member>" for i in range(size)
+        )
+        return f"<struct>{members}</struct>"
+
+    def test_default_max_depth(self, deserializer_factory):
+        deserializer = deserializer_factory()
+
+        assert deserializer.loads(self.build_payload(self.nested_arrays(64))).method_name == "foo"
+        with pytest.raises(RPCInvalidRequest, match=r"maximum nesting depth exceeded \(64\)"):
+            deserializer.loads(self.build_payload(self.nested_arrays(65)))
+
+    def test_disabled_limits(self, deserializer_factory):
+        deserializer = deserializer_factory(max_depth=None)
+
+        # lxml refuses documents deeper than 256 elements, regardless of structure limits
+        assert deserializer.loads(self.build_payload(self.nested_arrays(80))).method_name == "foo"
+
+    def test_max_depth_with_structs(self, deserializer_factory):
+        value = "<struct><member><name>a</name><value>" + self.nested_arrays(2) + "</value></member></struct>"
+
+        assert deserializer_factory(max_depth=3).loads(self.build_payload(value)).args == [{"a": [[1]]}]
+        with pytest.raises(RPCInvalidRequest, match="maximum nesting depth exceeded"):
+            deserializer_factory(max_depth=2).loads(self.build_payload(value))
+
+    def test_max_values(self, deserializer_factory):
+        # The struct itself, and its 5 member values
+        payload = self.build_payload(self.struct(5))
+
+        assert deserializer_factory(max_values=6).loads(payload).args[0]["m4"] == "x"
+        with pytest.raises(RPCInvalidRequest, match=r"maximum number of values exceeded \(5\)"):
+            deserializer_factory(max_values=5).loads(payload)
+
+    def test_max_array_length(self, deserializer_factory):
+        items = "".join(f"<value><int>{i}</int></value>" for i in range(3))
+        payload = self.build_payload(f"<array><data>{items}</data></array>")
+
+        assert deserializer_factory(max_array_length=3).loads(payload).args == [[0, 1, 2]]
+        with pytest.raises(RPCInvalidRequest, match=r"maximum array length exceeded \(2\)"):
+            deserializer_factory(max_array_length=2).loads(payload)
+
+    def test_max_struct_members(self, deserializer_factory):
+        payload = self.build_payload(self.struct(10))
+
+        assert len(deserializer_factory(max_struct_members=10).loads(payload).args[0]) == 10
+        with pytest.raises(RPCInvalidRequest, match=r"maximum number of struct members exceeded \(9\)"):
+            deserializer_factory(max_struct_members=9).loads(payload)
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "<string>" + "x" * 11 + "</string>",
+            "<struct><member><name>" + "x" * 11 + "</name><value><int>1</int></value></member></struct>",
+        ],
+        ids=["string", "member name"],
+    )
+    def test_max_string_length(self, deserializer_factory, value):
+        payload = self.build_payload(value)
+
+        assert deserializer_factory(max_string_length=11).loads(payload)
+        with pytest.raises(RPCInvalidRequest, match=r"maximum string length exceeded \(10\)"):
+            deserializer_factory(max_string_length=10).loads(payload)
+
+
+class TestLxmlDeserializerThreads:
+    @staticmethod
+    def build_payload(index: int) -> str:
+        values = "".join(f"<value><int>{i}</int></value>" for i in range(index % 50))
+        return (
+            f"<?xml version='1.0'?><methodCall><methodName>method_{index}</methodName><params>"
+            f"<param><value><string>{'x' * index}</string></value></param>"
+            f"<param><value><array><data>{values}</data></array></value></param>"
+            "</params></methodCall>"
+        )
+
+    def test_parser_per_thread(self):
+        deserializer = LxmlDeserializer()
+        barrier = threading.Barrier(4)
+
+        def get_parser(index: int) -> lxml.etree.XMLParser:
+            if index < 4:
+                # Ensure the first calls are executed from 4 different threads
+                barrier.wait()
+            return deserializer.get_parser()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            parsers = set(executor.map(get_parser, range(100)))
+
+        assert len(parsers) == 4
+        assert deserializer.get_parser() is deserializer.get_parser()
+        assert deserializer.get_parser() not in parsers
+
+    def test_concurrent_loads(self):
+        deserializer = LxmlDeserializer()
+        barrier = threading.Barrier(8)
+
+        def load(index: int) -> XmlRpcRequest:
+            if index < 8:
+                # Ensure all threads are started and parse at the same time
+                barrier.wait()
+            if index % 10 == 0:
+                with pytest.raises(RPCParseError):
+                    deserializer.loads(self.build_payload(index)[:-10])
+            return deserializer.loads(self.build_payload(index))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            requests = list(executor.map(load, range(500)))
+
+        for index, request in enumerate(requests):
+            assert request.method_name == f"method_{index}"
+            assert request.args == ["x" * index, list(range(index % 50))]
+
+    def test_custom_parser(self):
+        parser = lxml.etree.XMLParser()
+        deserializer = LxmlDeserializer(load_kwargs={"parser": parser})
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            assert set(executor.map(lambda _: deserializer.get_parser(), range(10))) == {parser}
+        assert deserializer.loads(self.build_payload(3)).method_name == "method_3"
+
+
+class TestLxmlIterparseDeserializer:
+    def test_tree_size_bounded(self, monkeypatch):
+        deserializer = LxmlIterparseDeserializer(chunk_size=1024)
+        members = "".join(
+            f"<member><name>key{i}</name><value><array><data><value><int>{i}</int></value></data></array></value></member>"
+            for i in range(5000)
+        )
+        payload = (
+            "<methodCall><methodName>foo</methodName>"
+            f"<params><param><value><struct>{members}</struct></value></param></params>"
+            "</methodCall>"
+        )
+
+        # Count elements in the tree each time an event has been processed
+        tree_sizes = []
+        iter_events = deserializer.iter_events
+
+        def counting_iter_events(data):
+            for event, element in iter_events(data):
+                yield event, element
+                tree_sizes.append(sum(1 for _ in element.getroottree().iter()))
+
+        monkeypatch.setattr(deserializer, "iter_events", counting_iter_events)
+
+        request = deserializer.loads(payload)
+
+        assert request.args == [{f"key{i}": [i] for i in range(5000)}]
+        # The document contains 55k elements, but only those of the current chunk are kept in the tree
+        assert max(tree_sizes) < 100
+
+    @pytest.mark.parametrize(
+        "value",
+        ["<struct><name>x</name></struct>", "<array><data><name>x</name></data></array>", "<name>x</name>"],
+    )
+    def test_name_outside_member(self, value):
+        payload = (
+            "<methodCall><methodName>foo</methodName>"
+            f"<params><param><value>{value}</value></param></params>"
+            "</methodCall>"
+        )
+
+        with pytest.raises(RPCInvalidRequest, match="name found outside of struct member"):
+            LxmlIterparseDeserializer().loads(payload)
+
+    def test_dtd_allowed(self):
+        deserializer = LxmlIterparseDeserializer(forbid_dtd=False)
+        payload = "<!DOCTYPE methodCall><methodCall><methodName>foo</methodName></methodCall>"
+
+        assert deserializer.loads(payload).method_name == "foo"
+
 
 class TestXmlRpcSerializer:
     @pytest.mark.parametrize(
@@ -632,6 +981,7 @@ class TestXmlRpcSerializerKwargs:
             "modernrpc.xmlrpc.backends.xmltodict.XmlToDictSerializer",
             "modernrpc.xmlrpc.backends.etree.EtreeSerializer",
             "modernrpc.xmlrpc.backends.lxml.LxmlSerializer",
+            "modernrpc.xmlrpc.backends.stringbuilder.StringBuilderSerializer",
         ],
     )
     @pytest.mark.parametrize("data_with_none", [None, {"foo": None}, [15, None, 16]])
@@ -646,3 +996,44 @@ class TestXmlRpcSerializerKwargs:
 
         with pytest.raises(RPCMarshallingError, match="cannot marshal None unless allow_none is enabled"):
             serializer.dumps(XmlRpcSuccessResult(request=dummy_xmlrpc_request, data=data_with_none))
+
+
+class TestStringBuilderSerializer:
+    @pytest.mark.parametrize(
+        "data",
+        [
+            None,
+            True,
+            -999,
+            9.6,
+            "",
+            "a & b <c> \"d\" 'e'\r\n\t é",
+            b"",
+            bytearray(b"\x00\xff"),
+            datetime(5, 1, 2, 3, 4, 5),
+            [],
+            (),
+            {},
+            [[], {}, ""],
+            {"": 1, "k&<>": [1, {"x": None}], 1: "int", None: "none"},
+            OrderedDict(foo="bar"),
+        ],
+    )
+    def test_identical_to_etree(self, dummy_xmlrpc_request, data):
+        result = XmlRpcSuccessResult(request=dummy_xmlrpc_request, data=data)
+
+        assert StringBuilderSerializer().dumps(result) == EtreeSerializer().dumps(result)
+
+    @pytest.mark.parametrize("message", ["", "foo & <bar>"])
+    def test_error_identical_to_etree(self, dummy_xmlrpc_request, message):
+        result = XmlRpcErrorResult(request=dummy_xmlrpc_request, code=-65000, message=message)
+
+        assert StringBuilderSerializer().dumps(result) == EtreeSerializer().dumps(result)
+
+    @pytest.mark.parametrize("key_cache_size", [0, 1, 1024])
+    def test_key_cache(self, dummy_xmlrpc_request, key_cache_size):
+        serializer = StringBuilderSerializer(marshaller_kwargs={"key_cache_size": key_cache_size})
+        result = XmlRpcSuccessResult(request=dummy_xmlrpc_request, data=[{"a&b": 1, "c": 2}, {"a&b": 3, 4: 5}])
+
+        assert serializer.dumps(result) == serializer.dumps(result) == EtreeSerializer().dumps(result)
+        assert len(serializer.marshaller.member_prefixes) == min(key_cache_size, 2)
@@ -1,22 +1,205 @@
+import tracemalloc
+import xmlrpc.client
+from concurrent.futures import ThreadPoolExecutor
+
+import defusedxml.ElementTree
+import lxml.etree
 import pytest
+import xmltodict
+
+from modernrpc.jsonrpc.backends.json import PythonJsonDeserializer
+from modernrpc.jsonrpc.backends.msgspec import MsgspecDeserializer, MsgspecSerializer
+from modernrpc.jsonrpc.backends.orjson import OrjsonDeserializer
+from modernrpc.msgpack.backends.msgpack import MsgpackDeserializer, MsgpackSerializer
+from modernrpc.xmlrpc.backends.etree import EtreeDeserializer
+from modernrpc.xmlrpc.backends.expat import ExpatDeserializer
+from modernrpc.xmlrpc.backends.lxml import LxmlDeserializer
+from modernrpc.xmlrpc.backends.xmlrpc import PythonXmlRpcDeserializer
+from modernrpc.xmlrpc.backends.xmltodict import Unmarshaller, XmlToDictDeserializer
+from modernrpc.xmlrpc.handler import XmlRpcRequest, XmlRpcSuccessResult
 
 
 @pytest.mark.benchmark(group="xml-deserialize")
 def test_xml_deserialize(benchmark, xml_deserializer, xmlrpc_request):
+    measure_peak_memory(benchmark, xml_deserializer.loads, xmlrpc_request)
     benchmark(xml_deserializer.loads, xmlrpc_request)
 
 
+# Note: memory allocated by libxml2 (lxml element trees) is not traced by tracemalloc
+@pytest.mark.benchmark(group="xml-deserialize-large")
+def test_xml_deserialize_large(benchmark, xml_deserializer, xmlrpc_large_request):
+    measure_peak_memory(benchmark, xml_deserializer.loads, xmlrpc_large_request)
+    benchmark.pedantic(xml_deserializer.loads, args=(xmlrpc_large_request,), rounds=3)
+
+
+@pytest.fixture(scope="module")
+def xmlrpc_binary_request() -> str:
+    """A request with a single 8 MB base64 param"""
+    return xmlrpc.client.dumps((xmlrpc.client.Binary(b"\x00\xff" * 4 * 1024 * 1024),), methodname="upload")
+
+
+# Compare the peak memory used to load a large base64 value, decoded in memory or into a temporary file
+@pytest.mark.benchmark(group="xml-deserialize-binary")
+@pytest.mark.parametrize("spooled", [False, True], ids=["in-memory", "spooled"])
+@pytest.mark.parametrize("deserializer_klass", [EtreeDeserializer, ExpatDeserializer])
+def test_xml_deserialize_binary(benchmark, xmlrpc_binary_request, deserializer_klass, spooled):
+    unmarshaller_kwargs = {"base64_max_memory_size": 64 * 1024} if spooled else {}
+    deserializer = deserializer_klass(unmarshaller_kwargs=unmarshaller_kwargs)
+
+    measure_peak_memory(benchmark, deserializer.loads, xmlrpc_binary_request)
+    benchmark.pedantic(deserializer.loads, args=(xmlrpc_binary_request,), rounds=3)
+
+
+NO_LIMITS = {"max_depth": None}
+ALL_LIMITS = {
+    "max_depth": 32,
+    "max_values": 1_000_000,
+    "max_array_length": 100_000,
+    "max_struct_members": 10_000,
+    "max_string_length": 1_000_000,
+    "max_batch_size": 10_000,
+}
+
+
+# Measure the cost of structural limits checks on a normal payload, compared to unchecked deserialization
+@pytest.mark.benchmark(group="xml-deserialize-limits")
+@pytest.mark.parametrize("limits", [NO_LIMITS, ALL_LIMITS], ids=["no-limits", "all-limits"])
+@pytest.mark.parametrize(
+    "deserializer_klass",
+    [PythonXmlRpcDeserializer, ExpatDeserializer, EtreeDeserializer, LxmlDeserializer, XmlToDictDeserializer],
+)
+def test_xml_deserialize_limits(benchmark, xmlrpc_large_request, deserializer_klass, limits):
+    if deserializer_klass is PythonXmlRpcDeserializer:
+        deserializer = deserializer_klass(limits=limits)
+    else:
+        deserializer = deserializer_klass(unmarshaller_kwargs={"limits": limits})
+
+    benchmark.pedantic(deserializer.loads, args=(xmlrpc_large_request,), rounds=10)
+
+
+def xmltodict_defused_roundtrip(data: str):
+    """Previous XmlToDictDeserializer implementation: parse with defusedxml, serialize back and parse with xmltodict"""
+    root = defusedxml.ElementTree.fromstring(data)
+    data = defusedxml.ElementTree.tostring(root, encoding="utf-8").decode("utf-8")
+    return Unmarshaller().dict_to_request(xmltodict.parse(data, force_list=Unmarshaller.do_force_list))
+
+
+# Compare the single pass parsing of XmlToDictDeserializer with the previous implementation
+@pytest.mark.benchmark(group="xmltodict-deserialize")
+@pytest.mark.parametrize("single_pass", [False, True], ids=["defused-roundtrip", "hardened-expat"])
+def test_xmltodict_deserialize(benchmark, xmlrpc_large_request, single_pass):
+    loads = XmlToDictDeserializer().loads if single_pass else xmltodict_defused_roundtrip
+    benchmark.pedantic(loads, args=(xmlrpc_large_request,), rounds=3)
+
+
+# Compare a new lxml parser for each request with the per-thread parser, when requests are parsed concurrently
+@pytest.mark.benchmark(group="lxml-concurrent-deserialize")
+@pytest.mark.parametrize("thread_parser", [False, True], ids=["new-parser", "thread-parser"])
+def test_lxml_concurrent_deserialize(benchmark, xmlrpc_request, thread_parser):
+    deserializer = LxmlDeserializer()
+    if not thread_parser:
+        deserializer.get_parser = lambda: lxml.etree.XMLParser(**deserializer.load_parser_kwargs)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        benchmark(lambda: list(executor.map(deserializer.loads, [xmlrpc_request] * 32)))
+
+
 @pytest.mark.benchmark(group="json-deserialize")
 def test_json_deserialize(benchmark, json_deserializer, jsonrpc_request):
     benchmark(json_deserializer.loads, jsonrpc_request)
 
 
+# Compare MessagePack backends with JSON-RPC backends, on the same data
+@pytest.mark.benchmark(group="json-deserialize")
+def test_msgpack_deserialize(benchmark, msgpackrpc_request):
+    benchmark(MsgpackDeserializer().loads, msgpackrpc_request)
+
+
 @pytest.mark.benchmark(group="xml-serialize")
 def test_xml_serialize(benchmark, xml_serializer, xmlrpc_result):
     res = benchmark(xml_serializer.dumps, xmlrpc_result)
     assert res
 
 
+@pytest.mark.benchmark(group="xml-serialize-rows")
+def test_xml_serialize_rows(benchmark, xml_serializer):
+    """Serialize a result of 10k rows, like a large database query would return"""
+    rows = [
+        {"id": i, "name": f"user {i}", "email": f"user{i}@example.com", "active": i % 2 == 0} for i in range(10_000)
+    ]
+    result = XmlRpcSuccessResult(request=XmlRpcRequest(method_name=""), data=rows)
+
+    measure_peak_memory(benchmark, xml_serializer.dumps, result)
+    benchmark(xml_serializer.dumps, result)
+
+
 @pytest.mark.benchmark(group="json-serialize")
 def test_json_serialize(benchmark, json_serializer, jsonrpc_result):
     benchmark(json_serializer.dumps, jsonrpc_result)
+
+
+@pytest.mark.benchmark(group="json-serialize")
+def test_msgpack_serialize(benchmark, jsonrpc_result):
+    benchmark(MsgpackSerializer().dumps, jsonrpc_result)
+
+
+@pytest.mark.benchmark(group="json-serialize-raw")
+def test_json_serialize_raw(benchmark, json_serializer, jsonrpc_raw_result):
+    benchmark(json_serializer.dumps, jsonrpc_raw_result)
+
+
+@pytest.mark.benchmark(group="json-batch-deserialize")
+def test_json_batch_deserialize(benchmark, json_deserializer, jsonrpc_batch_request):
+    benchmark(json_deserializer.loads, jsonrpc_batch_request)
+
+
+# Measure the cost of structural limits checks on JSON-RPC requests (none are checked by default)
+@pytest.mark.benchmark(group="json-deserialize-limits")
+@pytest.mark.parametrize("limits", [None, ALL_LIMITS], ids=["no-limits", "all-limits"])
+@pytest.mark.parametrize("batch", [False, True], ids=["single", "batch"])
+@pytest.mark.parametrize("deserializer_klass", [PythonJsonDeserializer, OrjsonDeserializer, MsgspecDeserializer])
+def test_json_deserialize_limits(benchmark, jsonrpc_request, jsonrpc_batch_request, deserializer_klass, batch, limits):
+    deserializer = deserializer_klass(limits=limits)
+    benchmark(deserializer.loads, jsonrpc_batch_request if batch else jsonrpc_request)
+
+
+@pytest.mark.benchmark(group="json-batch-serialize")
+def test_json_batch_serialize(benchmark, json_serializer, jsonrpc_batch_result):
+    benchmark(json_serializer.dumps, jsonrpc_batch_result)
+
+
+@pytest.mark.benchmark(group="json-batch-serialize")
+def test_msgpack_batch_serialize(benchmark, jsonrpc_batch_result):
+    benchmark(MsgpackSerializer().dumps, jsonrpc_batch_result)
+
+
+def measure_peak_memory(benchmark, func, *args) -> None:
+    """Store the peak memory allocated (in bytes) during a single call to func in benchmark extra info"""
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["peak_memory"] = peak
+
+
+@pytest.fixture(params=[False, True], ids=["dict", "template"])
+def envelope_json_serializer(request, json_serializer):
+    if request.param:
+        if isinstance(json_serializer, MsgspecSerializer):
+            pytest.skip("MsgspecSerializer already encodes envelopes from structs")
+        return type(json_serializer)(envelope_template=True)
+    return json_serializer
+
+
+@pytest.mark.benchmark(group="json-serialize-envelope")
+def test_json_serialize_envelope(benchmark, envelope_json_serializer, jsonrpc_small_result):
+    measure_peak_memory(benchmark, envelope_json_serializer.dumps, jsonrpc_small_result)
+    benchmark(envelope_json_serializer.dumps, jsonrpc_small_result)
+
+
+@pytest.mark.benchmark(group="json-batch-serialize-envelope")
+def test_json_batch_serialize_envelope(benchmark, envelope_json_serializer, jsonrpc_small_batch_result):
+    measure_peak_memory(benchmark, envelope_json_serializer.dumps, jsonrpc_small_batch_result)
+    benchmark(envelope_json_serializer.dumps, jsonrpc_small_batch_result)
@@ -0,0 +1,63 @@
+import asyncio
+import time
+from http import HTTPStatus
+
+import pytest
+from django.http import StreamingHttpResponse
+
+from modernrpc.server import RpcServer
+
+# One slow call followed by many fast ones: the kind of batch where clients wait the longest for the first result
+SKEWED_LATENCIES = [0.05] + [0.001] * 19
+
+
+@pytest.fixture(params=[False, True], ids=["buffered", "streamed"])
+def skewed_batch_server(request) -> RpcServer:
+    server = RpcServer(stream_batch_responses=request.param)
+
+    @server.register_procedure
+    async def sleep(delay: float) -> float:
+        await asyncio.sleep(delay)
+        return delay
+
+    return server
+
+
+async def read_first_result(server: RpcServer, request) -> bytes:
+    """Return the first chunk containing a result, as soon as the client would receive it"""
+    response = await server.async_view(request)
+    if not isinstance(response, StreamingHttpResponse):
+        return response.content
+    async for chunk in response.streaming_content:
+        if chunk != b"[":
+            return chunk
+    return b""
+
+
+@pytest.mark.benchmark(group="json-batch-time-to-first-result")
+def test_json_batch_time_to_first_result(benchmark, skewed_batch_server, jsonrpc_batch_rf):
+    request = jsonrpc_batch_rf(requests=[("sleep", (delay,), False) for delay in SKEWED_LATENCIES])
+
+    result = benchmark.pedantic(lambda: asyncio.run(read_first_result(skewed_batch_server, request)), rounds=5)
+    assert result
+
+
+@pytest.fixture(params=[1, 8], ids=["sequential", "8-threads"])
+def io_bound_multicall_server(request) -> RpcServer:
+    server = RpcServer(multicall_workers=request.param)
+
+    @server.register_procedure
+    def blocking_sleep(delay: float) -> float:
+        time.sleep(delay)
+        return delay
+
+    return server
+
+
+@pytest.mark.benchmark(group="xml-multicall-io-bound")
+def test_xml_multicall_io_bound(benchmark, io_bound_multicall_server, xmlrpc_rf):
+    calls = [{"methodName": "blocking_sleep", "params": [0.005]} for _ in range(16)]
+    request = xmlrpc_rf(method_name="system.multicall", params=[calls])
+
+    response = benchmark.pedantic(io_bound_multicall_server.view, args=(request,), rounds=5)
+    assert response.status_code == HTTPStatus.OK
@@ -0,0 +1,90 @@
+import json
+from urllib.parse import urlsplit
+
+import pytest
+
+from modernrpc import FileResult
+from modernrpc.server import RpcServer
+from tests.benchmarks.bench_backends import measure_peak_memory
+
+FILE_SIZE = 20 * 1024 * 1024
+
+
+@pytest.fixture(params=["base64", "file_result"])
+def file_server(request, settings, tmp_path) -> RpcServer:
+    settings.MODERNRPC_FILE_RESULT_ROOT = str(tmp_path)
+    path = tmp_path / "large.bin"
+    path.write_bytes(b"\x00\xff" * (FILE_SIZE // 2))
+    server = RpcServer()
+
+    if request.param == "base64":
+
+        @server.register_procedure
+        def get_file():
+            return path.read_bytes()
+
+    else:
+
+        @server.register_procedure
+        def get_file():
+            return FileResult(path)
+
+    return server
+
+
+def download_file(server: RpcServer, xmlrpc_rf, rf) -> int:
+    """Call the procedure, then download the file when a FileResult is returned. Return the number of bytes received"""
+    response = server.view(xmlrpc_rf(method_name="get_file"))
+    if b"<base64>" in response.content:
+        return len(response.content)
+
+    url = urlsplit(response.content.decode().split("<string>")[1].split("</string>")[0].replace("&amp;", "&"))
+    file_response = server.view(rf.get(f"{url.path}?{url.query}"))
+    try:
+        return sum(len(chunk) for chunk in file_response.streaming_content)
+    finally:
+        file_response.close()
+
+
+@pytest.mark.benchmark(group="xml-file-download")
+@pytest.mark.usefixtures("keep_db_connections")
+def test_xml_file_download(benchmark, file_server, xmlrpc_rf, rf):
+    measure_peak_memory(benchmark, download_file, file_server, xmlrpc_rf, rf)
+    assert benchmark.pedantic(download_file, args=(file_server, xmlrpc_rf, rf), rounds=5) >= FILE_SIZE
+
+
+@pytest.fixture(params=[None, 64 * 1024], ids=["in_memory", "spooled"])
+def spool_request_body_size(request, settings):
+    # Django rejects larger bodies read from request.body
+    settings.DATA_UPLOAD_MAX_MEMORY_SIZE = None
+    settings.MODERNRPC_SPOOL_REQUEST_BODY_SIZE = request.param
+
+
+@pytest.fixture(
+    params=[
+        "modernrpc.jsonrpc.backends.json.PythonJsonDeserializer",
+        "modernrpc.jsonrpc.backends.orjson.OrjsonDeserializer",
+    ],
+    ids=["json", "orjson"],
+)
+def large_body_server(request, settings, spool_request_body_size) -> RpcServer:
+    settings.MODERNRPC_JSON_DESERIALIZER = {"class": request.param}
+    server = RpcServer()
+
+    @server.register_procedure
+    def get_size(value):
+        return len(value)
+
+    return server
+
+
+@pytest.mark.benchmark(group="json-large-request-body")
+def test_json_large_request_body(benchmark, large_body_server, jsonrpc_rf):
+    def build_request():
+        return (jsonrpc_rf(method_name="get_size", params=["x" * FILE_SIZE]),), {}
+
+    # Requests are built before each call, the memory they use is not measured
+    (request,), _ = build_request()
+    measure_peak_memory(benchmark, large_body_server.view, request)
+    response = benchmark.pedantic(large_body_server.view, setup=build_request, rounds=5)
+    assert json.loads(response.content)["result"] == FILE_SIZE
@@ -1,9 +1,11 @@
 import inspect
 import json
+import xmlrpc.client
 
+import msgpack
 import pytest
 
-from modernrpc.jsonrpc.handler import JsonRpcRequest, JsonRpcSuccessResult
+from modernrpc.jsonrpc.handler import JsonRpcRequest, JsonRpcSuccessResult, RawJSON
 from modernrpc.types import DictStrAny
 from modernrpc.xmlrpc.handler import XmlRpcRequest, XmlRpcSuccessResult
 
@@ -1766,6 +1768,21 @@ def xmlrpc_request() -> str:
     return inspect.cleandoc(req)
 
 
+@pytest.fixture(scope="session")
+def xmlrpc_large_request() -> str:
+    """A request of about 1.5 MB, with a large array of nested structs"""
+    rows = [
+        {
+            "id": i,
+            "name": f"user {i}",
+            "address": {"street": f"{i} main street", "city": "Paris", "tags": ["a", "b", "c"]},
+            "scores": [1.5, 2.5, 3.5],
+        }
+        for i in range(2_000)
+    ]
+    return xmlrpc.client.dumps((rows,), methodname="foo.bar")
+
+
 @pytest.fixture(scope="session")
 def random_data() -> DictStrAny:
     return {
@@ -2031,11 +2048,54 @@ def jsonrpc_request(random_data) -> str:
     return inspect.cleandoc(req)
 
 
+@pytest.fixture
+def jsonrpc_batch_request(random_data) -> str:
+    batch = [
+        {"id": i, "jsonrpc": "2.0", "method": "foo", "params": [user]}
+        for i, user in enumerate(random_data["users"] * 10)
+    ]
+    return json.dumps(batch)
+
+
+@pytest.fixture
+def jsonrpc_batch_result(random_data) -> list[JsonRpcSuccessResult]:
+    return [
+        JsonRpcSuccessResult(request=JsonRpcRequest(request_id=i, method_name=""), data=user)
+        for i, user in enumerate(random_data["users"] * 10)
+    ]
+
+
 @pytest.fixture
 def jsonrpc_result(random_data) -> JsonRpcSuccessResult:
     return JsonRpcSuccessResult(request=JsonRpcRequest(request_id=500, method_name=""), data=random_data)
 
 
+@pytest.fixture
+def jsonrpc_small_result() -> JsonRpcSuccessResult:
+    request = JsonRpcRequest(request_id=500, method_name="")
+    return JsonRpcSuccessResult(request=request, data={"status": "ok", "count": 3})
+
+
+@pytest.fixture
+def jsonrpc_small_batch_result() -> list[JsonRpcSuccessResult]:
+    return [
+        JsonRpcSuccessResult(request=JsonRpcRequest(request_id=i, method_name=""), data={"status": "ok", "count": i})
+        for i in range(200)
+    ]
+
+
+@pytest.fixture
+def jsonrpc_raw_result(random_data) -> JsonRpcSuccessResult:
+    return JsonRpcSuccessResult(
+        request=JsonRpcRequest(request_id=500, method_name=""), data=RawJSON(json.dumps(random_data))
+    )
+
+
 @pytest.fixture
 def xmlrpc_result(random_data) -> XmlRpcSuccessResult:
     return XmlRpcSuccessResult(request=XmlRpcRequest(method_name=""), data=random_data)
+
+
+@pytest.fixture
+def msgpackrpc_request(random_data) -> bytes:
+    return msgpack.packb({"id": 255, "jsonrpc": "2.0", "method": "foo", "params": random_data})
@@ -1,16 +1,24 @@
+import json
 from collections.abc import Callable
 
 import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.signals import request_finished
+from django.db import close_old_connections
 from django.http import HttpRequest
 
 from modernrpc import RpcServer
+from modernrpc.config import default_settings
 from modernrpc.jsonrpc.backends import JsonRpcDeserializer, JsonRpcSerializer
 from modernrpc.xmlrpc.backends import XmlRpcDeserializer, XmlRpcSerializer
 from tests.helpers import (
+    ADDITIONAL_HANDLERS,
     JSON_DESERIALIZERS_CLASSES,
     JSON_SERIALIZERS_CLASSES,
     XML_DESERIALIZERS_CLASSES,
     XML_SERIALIZERS_CLASSES,
+    BinaryEncoding,
+    build_json_rpc_batch_request_data,
     build_json_rpc_request_data,
     build_xml_rpc_request_data,
 )
@@ -70,15 +78,92 @@ def jsonrpc_rf(rf) -> Callable[..., HttpRequest]:
 @pytest.fixture
 def jsonrpc_batch_rf(rf) -> Callable[..., HttpRequest]:
     def factory(path="/rpc", content_type="application/json", requests: list[tuple[str, tuple, bool]] | None = None):
-        data = [
-            build_json_rpc_request_data(method=method_name, params=params, is_notification=is_notification)
-            for method_name, params, is_notification in requests or []
-        ]
+        data = build_json_rpc_batch_request_data(requests or [])
         return rf.post(path, data=data, content_type=content_type)
 
     return factory
 
 
+@pytest.fixture
+def binary_rf(rf) -> Callable[..., HttpRequest]:
+    def factory(
+        encoding: BinaryEncoding,
+        path="/rpc",
+        content_type=None,
+        method_name="dummy",
+        params=(),
+        is_notif=False,
+        req_id=None,
+        requests: list[tuple[str, tuple, bool]] | None = None,
+    ):
+        """
+        Build a request encoded with the given binary encoding (see tests.helpers.BinaryEncoding). A batch request is
+        built when 'requests' is given (see jsonrpc_batch_rf)
+        """
+        if requests is None:
+            data = build_json_rpc_request_data(
+                method=method_name, params=params, is_notification=is_notif, req_id=req_id
+            )
+        else:
+            data = build_json_rpc_batch_request_data(requests)
+        return rf.post(path, data=encoding.dumps(data), content_type=content_type or encoding.content_type)
+
+    return factory
+
+
+@pytest.fixture
+def ndjson_rf(rf) -> Callable[..., HttpRequest]:
+    def factory(
+        path="/rpc", content_type="application/x-ndjson", lines: list[tuple[str, tuple, bool] | str] | None = None
+    ):
+        """Write one line per (method_name, params, is_notification) tuple in 'lines', str items as is"""
+        body = "".join(
+            line if isinstance(line, str) else json.dumps(build_json_rpc_request_data(*line)) + "\n"
+            for line in lines or []
+        )
+        return rf.post(path, data=body.encode(), content_type=content_type)
+
+    return factory
+
+
+@pytest.fixture
+def multipart_rf(rf) -> Callable[..., HttpRequest]:
+    def factory(
+        path="/rpc",
+        method_name="dummy",
+        params=(),
+        req_id=None,
+        requests: list[tuple[str, tuple, bool]] | None = None,
+        files: dict[str, bytes] | None = None,
+        payload_as_file=False,
+        requested_with: str | None = "XMLHttpRequest",
+    ):
+        """
+        Build a single or a batch request (see binary_rf), sent in a multipart body with the given files. Unless
+        requested_with is None, the X-Requested-With header is sent to pass the handler CSRF protection
+        """
+        if requests is None:
+            data = build_json_rpc_request_data(method=method_name, params=params, req_id=req_id)
+        else:
+            data = build_json_rpc_batch_request_data(requests)
+        payload = json.dumps(data)
+        parts = {name: SimpleUploadedFile(f"{name}.bin", content) for name, content in (files or {}).items()}
+        parts["request"] = SimpleUploadedFile("request.json", payload.encode()) if payload_as_file else payload
+        extra = {} if requested_with is None else {"HTTP_X_REQUESTED_WITH": requested_with}
+        return rf.post(path, data=parts, **extra)
+
+    return factory
+
+
+@pytest.fixture
+def additional_handlers(settings):
+    """
+    Enable handlers not enabled by default. Request it with the "usefixtures" mark, so that it is executed before
+    the server fixture creates the RpcServer instance
+    """
+    settings.MODERNRPC_HANDLERS = [*default_settings.MODERNRPC_HANDLERS, *ADDITIONAL_HANDLERS]
+
+
 # The next 4 fixtures can be used to retrieve an instance of the corresponding backend
 # See 'test_backends_xml.py' and 'test_backends_json.py' for example uses
 @pytest.fixture(scope="session", params=XML_DESERIALIZERS_CLASSES)
@@ -125,3 +210,11 @@ def all_json_deserializers(settings, request):
 def all_json_serializers(settings, request):
     klass = request.param
     settings.MODERNRPC_JSON_SERIALIZER = {"class": f"{klass.__module__}.{klass.__name__}"}
+
+
+@pytest.fixture
+def keep_db_connections():
+    """Like Django test client, don't close database connections when (streaming) responses are closed"""
+    request_finished.disconnect(close_old_connections)
+    yield
+    request_finished.connect(close_old_connections)
@@ -2,11 +2,14 @@ import json
 import xmlrpc.client
 from collections.abc import Callable
 from doctest import Example
+from functools import partial
 from json import JSONDecodeError
-from typing import Any
+from typing import Any, NamedTuple
 from xml.etree import ElementTree as ET
 
+import cbor2
 import jsonrpcclient.sentinels
+import msgpack
 import pytest
 from _pytest.main import Failed
 from django.http import HttpResponse
@@ -14,6 +17,7 @@ from lxml.doctestcompare import PARSE_XML, LXMLOutputChecker  # ty: ignore[unres
 
 from modernrpc import Protocol
 from modernrpc.jsonrpc.backends.json import PythonJsonDeserializer, PythonJsonSerializer
+from modernrpc.jsonrpc.backends.msgspec import MsgspecDeserializer, MsgspecSerializer
 from modernrpc.jsonrpc.backends.orjson import OrjsonDeserializer, OrjsonSerializer
 from modernrpc.jsonrpc.backends.rapidjson import RapidjsonDeserializer, RapidjsonSerializer
 from modernrpc.jsonrpc.backends.simplejson import SimplejsonDeserializer, SimplejsonSerializer
@@ -21,7 +25,9 @@ from modernrpc.jsonrpc.backends.ujson import UjsonDeserializer, UjsonSerializer
 from modernrpc.jsonrpc.handler import RequestIdType
 from modernrpc.types import DictStrAny
 from modernrpc.xmlrpc.backends.etree import EtreeDeserializer, EtreeSerializer
-from modernrpc.xmlrpc.backends.lxml import LxmlDeserializer, LxmlSerializer
+from modernrpc.xmlrpc.backends.expat import ExpatDeserializer
+from modernrpc.xmlrpc.backends.lxml import LxmlDeserializer, LxmlIterparseDeserializer, LxmlSerializer
+from modernrpc.xmlrpc.backends.stringbuilder import StringBuilderSerializer
 from modernrpc.xmlrpc.backends.xmlrpc import PythonXmlRpcDeserializer, PythonXmlRpcSerializer
 from modernrpc.xmlrpc.backends.xmltodict import XmlToDictDeserializer, XmlToDictSerializer
 
@@ -29,14 +35,28 @@ ALL_PROTOCOLS = [Protocol.XML_RPC, Protocol.JSON_RPC]
 # List all backends supported in tests for deserialization (data to request object) and
 # serialization (result to response data). These constants will be used to define some parametrized fixtures
 # to ensure every test is run with all backend combinations
-XML_DESERIALIZERS_CLASSES = [PythonXmlRpcDeserializer, XmlToDictDeserializer, EtreeDeserializer, LxmlDeserializer]
-XML_SERIALIZERS_CLASSES = [PythonXmlRpcSerializer, XmlToDictSerializer, EtreeSerializer, LxmlSerializer]
+XML_DESERIALIZERS_CLASSES = [
+    PythonXmlRpcDeserializer,
+    XmlToDictDeserializer,
+    EtreeDeserializer,
+    LxmlDeserializer,
+    ExpatDeserializer,
+    LxmlIterparseDeserializer,
+]
+XML_SERIALIZERS_CLASSES = [
+    PythonXmlRpcSerializer,
+    XmlToDictSerializer,
+    EtreeSerializer,
+    LxmlSerializer,
+    StringBuilderSerializer,
+]
 JSON_DESERIALIZERS_CLASSES = [
     PythonJsonDeserializer,
     SimplejsonDeserializer,
     OrjsonDeserializer,
     RapidjsonDeserializer,
     UjsonDeserializer,
+    MsgspecDeserializer,
 ]
 JSON_SERIALIZERS_CLASSES = [
     PythonJsonSerializer,
@@ -44,6 +64,28 @@ JSON_SERIALIZERS_CLASSES = [
     OrjsonSerializer,
     RapidjsonSerializer,
     UjsonSerializer,
+    MsgspecSerializer,
+]
+
+
+class BinaryEncoding(NamedTuple):
+    """Functions and content type used to send binary encoded JSON-RPC requests, and read their responses"""
+
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+    content_type: str
+
+
+MSGPACK_ENCODING = BinaryEncoding(
+    partial(msgpack.packb, datetime=True), partial(msgpack.unpackb, timestamp=3), "application/msgpack"
+)
+CBOR_ENCODING = BinaryEncoding(cbor2.dumps, cbor2.loads, "application/cbor")
+# Handlers shipped with the library but not enabled by default. The "additional_handlers" fixture enables all of them
+ADDITIONAL_HANDLERS = [
+    "modernrpc.msgpack.handler.MsgpackRpcHandler",
+    "modernrpc.cbor.handler.CborRpcHandler",
+    "modernrpc.ndjson.handler.NdjsonRpcHandler",
+    "modernrpc.multipart.handler.MultipartRpcHandler",
 ]
 
 
@@ -59,6 +101,13 @@ def build_json_rpc_request_data(
     return jsonrpcclient.request(method=method, params=params, id=req_id or jsonrpcclient.sentinels.NOID)
 
 
+def build_json_rpc_batch_request_data(requests: list[tuple[str, tuple, bool]]) -> list[DictStrAny]:
+    return [
+        build_json_rpc_request_data(method=method_name, params=params, is_notification=is_notification)
+        for method_name, params, is_notification in requests
+    ]
+
+
 def assert_json_data_are_equal(got: str, want: str) -> None:
     # NOTE: At some point, jsondiff may be used for better JSON data comparison. For now,
     #  comparing json.loads() results seems to work well for our use cases
@@ -106,9 +155,9 @@ def extract_xmlrpc_fault_data(response: HttpResponse) -> tuple[int, str]:
     return fault_code_value, fault_string.text
 
 
-def extract_jsonrpc_success_result(response: HttpResponse) -> Any:
+def extract_jsonrpc_success_result(response: HttpResponse, loads: Callable[[bytes], Any] = json.loads) -> Any:
     try:
-        response_data = json.loads(response.content)
+        response_data = loads(response.content)
     except JSONDecodeError:
         pytest.fail(f"Unable to parse JSON payload:\n{response.content.decode()}")
         raise
@@ -122,9 +171,9 @@ def extract_jsonrpc_success_result(response: HttpResponse) -> Any:
     return result
 
 
-def extract_jsonrpc_fault_data(response: HttpResponse) -> tuple[int, str]:
+def extract_jsonrpc_fault_data(response: HttpResponse, loads: Callable[[bytes], Any] = json.loads) -> tuple[int, str]:
     try:
-        response_data = json.loads(response.content)
+        response_data = loads(response.content)
     except JSONDecodeError:
         pytest.fail(f"Unable to parse JSON payload:\n{response.content.decode()}")
         raise
@@ -161,3 +210,10 @@ def params_with_xfail(possible_values: list, condition: Callable, reason: str):
         pytest.param(element, marks=pytest.mark.xfail(reason=reason)) if condition(element) else element
         for element in possible_values
     ]
+
+
+class BrokenJsonSerializer:
+    """A JSON-RPC serializer which doesn't produce valid responses, and doesn't accept any argument"""
+
+    def dumps(self, result) -> str:
+        return "{}"
@@ -1,11 +1,21 @@
 import datetime
 import xmlrpc.client
+from io import BytesIO
 
 import pytest
+from django.core.exceptions import RequestDataTooBig
 
 from modernrpc import Protocol
 from modernrpc.compat import is_union_type, union_str_repr
-from modernrpc.helpers import check_flags_compatibility, ensure_sequence, first, get_builtin_date
+from modernrpc.helpers import (
+    SizeLimitedStream,
+    check_flags_compatibility,
+    ensure_sequence,
+    first,
+    get_builtin_date,
+    make_hashable,
+)
+from modernrpc.spooling import SpooledRequestBody, should_spool_body
 
 
 @pytest.mark.parametrize(
@@ -110,3 +120,126 @@ def test_union_type():
 
 def test_union_str_repr():
     assert union_str_repr(int | str) == "int | str"
+
+
+@pytest.mark.parametrize(
+    ("a", "b"),
+    [
+        (1, 1),
+        ("foo", "foo"),
+        ([1, "a", None], [1, "a", None]),
+        ({"a": 1, "b": [2, 3]}, {"b": [2, 3], "a": 1}),
+        ({"nested": {"x": [{"y": 1.5}]}}, {"nested": {"x": [{"y": 1.5}]}}),
+    ],
+)
+def test_make_hashable_equal(a, b):
+    assert make_hashable(a) == make_hashable(b)
+    assert hash(make_hashable(a)) == hash(make_hashable(b))
+
+
+@pytest.mark.parametrize(
+    ("a", "b"),
+    [
+        (1, True),
+        (1, 1.0),
+        (0, None),
+        ([1, 2], (1, 2)),
+        ({"a": 1}, {"a": True}),
+        ([1, 2], [2, 1]),
+    ],
+)
+def test_make_hashable_different(a, b):
+    assert make_hashable(a) != make_hashable(b)
+
+
+def test_make_hashable_unhashable():
+    with pytest.raises(TypeError):
+        make_hashable([{1, 2}])
+
+
+def test_size_limited_stream():
+    stream = SizeLimitedStream(BytesIO(b"line 1\nline 2\n"), max_size=14)
+
+    assert stream.readline() == b"line 1\n"
+    assert stream.read(3) == b"lin"
+    assert stream.read() == b"e 2\n"
+    assert stream.read() == b""
+
+
+@pytest.mark.parametrize(
+    "read", [lambda stream: stream.read(), lambda stream: stream.readline()], ids=["read", "readline"]
+)
+def test_size_limited_stream_exceeded(read):
+    body = BytesIO(b"x" * 1000)
+    stream = SizeLimitedStream(body, max_size=10)
+
+    with pytest.raises(RequestDataTooBig):
+        read(stream)
+    # The rest of the body is not read
+    assert body.tell() == 11
+
+
+@pytest.mark.parametrize(
+    ("max_memory_size", "content_length", "expected"),
+    [(None, "100", False), (100, "100", False), (99, "100", True), (100, None, True), (100, "invalid", True)],
+)
+def test_should_spool_body(rf, max_memory_size, content_length, expected):
+    request = rf.post("/rpc", data="x" * 100, content_type="application/json")
+    if content_length is None:
+        del request.META["CONTENT_LENGTH"]
+    else:
+        request.META["CONTENT_LENGTH"] = content_length
+
+    assert should_spool_body(request, max_memory_size) is expected
+
+
+def test_spooled_request_body(rf):
+    content = '{"value": "é"}' * 10_000
+    request = rf.post("/rpc", data=content.encode("utf-8"), content_type="application/json")
+
+    body = SpooledRequestBody.from_request(request, "utf-8", chunk_size=1000)
+
+    with body:
+        assert body.is_utf8
+        assert body.buffer[:] == content.encode("utf-8")
+        assert body.read_text() == content
+    assert body.file.closed
+    assert body.buffer.closed
+
+
+@pytest.mark.parametrize(("content_length", "unread_size"), [("200", 200), (None, 99)])
+def test_spooled_request_body_max_size(rf, content_length, unread_size):
+    request = rf.post("/rpc", data=b"x" * 200, content_type="application/json")
+    if content_length is None:
+        del request.META["CONTENT_LENGTH"]
+
+    with pytest.raises(RequestDataTooBig):
+        SpooledRequestBody.from_request(request, "utf-8", chunk_size=30, max_size=100)
+
+    # Body is rejected before being read when Content-Length is known, else as soon as the limit is exceeded
+    assert len(request.read()) == unread_size
+
+
+def test_spooled_request_body_max_size_reached(rf):
+    request = rf.post("/rpc", data=b"x" * 100, content_type="application/json")
+    del request.META["CONTENT_LENGTH"]
+
+    with SpooledRequestBody.from_request(request, "utf-8", chunk_size=30, max_size=100) as body:
+        assert body.read_text() == "x" * 100
+
+
+def test_spooled_request_body_encoding(rf):
+    request = rf.post("/rpc", data="é".encode("latin-1"), content_type="application/json")
+
+    with SpooledRequestBody.from_request(request, "latin-1") as body:
+        assert not body.is_utf8
+        assert body.read_text() == "é"
+
+
+def test_spooled_request_body_empty(rf):
+    request = rf.post("/rpc", data=b"", content_type="application/json")
+
+    with SpooledRequestBody.from_request(request, "utf-8") as body:
+        assert body.buffer == b""
+        assert body.read_text() == ""
+    assert body.file.closed
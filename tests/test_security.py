@@ -26,7 +26,7 @@ class TestXmlBackendSecurity:
             <params></params>
         </methodCall>
         """
-        if "lxml" in xml_deserializer.__class__.__name__.lower():
+        if xml_deserializer.__class__.__name__ == "LxmlDeserializer":
             marker = pytest.mark.xfail(
                 reason="lxml backend allows DTD definition, but enforce fine-grained protections on parsing",
                 strict=True,
@@ -217,6 +217,17 @@ class TestRpcServerRegistration:
         namespace_auth_callback.assert_not_called()
         server_auth_callback.assert_not_called()
 
+    @pytest.mark.parametrize("proto", ALL_PROTOCOLS)
+    def test_namespace_registration_idempotent(self, proto):
+        server = RpcServer()
+
+        namespace = RpcNamespace()
+        namespace.register_procedure(dummy_procedure, idempotent=True)
+        server.register_namespace(namespace, "ns")
+
+        assert server.get_procedure_wrapper("ns.dummy_procedure", proto).idempotent is True
+        assert server.get_procedure_wrapper("system.listMethods", proto).idempotent is False
+
 
 class TestRpcNamespace:
     @pytest.fixture
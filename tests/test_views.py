@@ -1,8 +1,16 @@
+import json
+import mmap
 from http import HTTPStatus
 
 import pytest
+from asgiref.sync import async_to_sync
+from django.utils.module_loading import import_string
 
-from modernrpc import RpcServer
+from modernrpc import Protocol, RpcServer
+from modernrpc.exceptions import RPC_INVALID_PARAMS, RPC_INVALID_REQUEST, RPC_METHOD_NOT_FOUND, RPC_PARSE_ERROR
+from modernrpc.handler import CacheableRpcHandler
+from modernrpc.spooling import SpooledRequestBody
+from tests.helpers import ADDITIONAL_HANDLERS, extract_xmlrpc_success_result
 
 
 class TestNonRpcResponses:
@@ -73,3 +81,323 @@ class TestNonRpcResponsesAsync:
 
         assert response.status_code == HTTPStatus.BAD_REQUEST
         assert response.content == b"Unable to handle your request, unsupported Content-Type text/html."
+
+
+@pytest.mark.parametrize("handler_path", ADDITIONAL_HANDLERS)
+class TestAdditionalHandlers:
+    @pytest.mark.usefixtures("additional_handlers")
+    def test_handler_is_pluggable(self, server, handler_path):
+        assert any(isinstance(handler, import_string(handler_path)) for handler in server.handlers)
+
+    def test_unavailable_by_default(self, rf, server, handler_path):
+        content_type = import_string(handler_path).valid_content_types[0]
+
+        response = server.view(rf.post("/rpc", data=b"payload", content_type=content_type))
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.content == f"Unable to handle your request, unsupported Content-Type {content_type}.".encode()
+
+    def test_get_requests_not_supported(self, handler_path):
+        assert not issubclass(import_string(handler_path), CacheableRpcHandler)
+
+    @pytest.mark.usefixtures("additional_handlers")
+    def test_server_protocol_restriction(self, handler_path):
+        server = RpcServer(supported_protocol=Protocol.XML_RPC)
+
+        assert not any(isinstance(handler, import_string(handler_path)) for handler in server.handlers)
+
+
+class TestCacheableGetRequests:
+    @pytest.fixture
+    def server(self):
+        server = RpcServer()
+
+        @server.register_procedure(cacheable=True, cache_control="public, max-age=60")
+        def add(a: int, b: int):
+            return a + b
+
+        @server.register_procedure(cacheable=True)
+        async def async_add(a: int, b: int):
+            return a + b
+
+        @server.register_procedure
+        def not_cacheable():
+            return 42
+
+        return server
+
+    @pytest.fixture(params=["view", "async_view"])
+    def call(self, request, server, rf, async_rf):
+        """Send a GET request with the given query string to the sync or the async view, and return the response"""
+        if request.param == "view":
+            return lambda data, **headers: server.view(rf.get("/rpc", data=data, headers=headers))
+
+        async def acall(data, **headers):
+            return await server.async_view(async_rf.get("/rpc", data=data, headers=headers))
+
+        return async_to_sync(acall)
+
+    @pytest.mark.parametrize("method_name", ["add", "async_add"])
+    def test_positional_params(self, call, method_name):
+        response = call({"method": method_name, "params": "[5, 9]", "id": "1"})
+
+        assert response.status_code == HTTPStatus.OK
+        assert json.loads(response.content) == {"id": "1", "jsonrpc": "2.0", "result": 14}
+        assert response.headers["ETag"]
+
+    def test_named_params_without_id(self, call):
+        response = call({"method": "add", "params": '{"a": 5, "b": 9}'})
+
+        assert response.status_code == HTTPStatus.OK
+        assert json.loads(response.content) == {"id": None, "jsonrpc": "2.0", "result": 14}
+
+    def test_cache_control(self, call):
+        response = call({"method": "add", "params": "[5, 9]"})
+        assert response.headers["Cache-Control"] == "public, max-age=60"
+
+        response = call({"method": "async_add", "params": "[5, 9]"})
+        assert "Cache-Control" not in response.headers
+
+    def test_if_none_match(self, call):
+        etag = call({"method": "add", "params": "[5, 9]"}).headers["ETag"]
+
+        response = call({"method": "add", "params": "[5, 9]"}, if_none_match=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response.content == b""
+
+        response = call({"method": "add", "params": "[5, 10]"}, if_none_match=etag)
+        assert response.status_code == HTTPStatus.OK
+
+    @pytest.mark.parametrize(
+        ("query", "expected_code"),
+        [
+            ({"method": "not_cacheable"}, RPC_INVALID_REQUEST),
+            ({"method": "unknown"}, RPC_METHOD_NOT_FOUND),
+            ({"method": "add", "params": "[5,"}, RPC_INVALID_REQUEST),
+            ({"method": "add", "params": "5"}, RPC_INVALID_REQUEST),
+            ({"method": "add", "params": "[5]"}, RPC_INVALID_PARAMS),
+            ({"method": ["add", "async_add"], "params": "[5, 9]"}, RPC_INVALID_REQUEST),
+        ],
+    )
+    def test_errors_are_not_cached(self, call, query, expected_code):
+        response = call(query)
+
+        assert response.status_code == HTTPStatus.OK
+        assert json.loads(response.content)["error"]["code"] == expected_code
+        assert "no-cache" in response.headers["Cache-Control"]
+        assert "ETag" not in response.headers
+
+    def test_get_without_method(self, call):
+        response = call({})
+
+        assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+
+
+class TestMaxRequestSize:
+    PAYLOAD = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "echo", "params": ["x" * 100]})
+
+    @pytest.fixture
+    def server_factory(self):
+        def factory(**kwargs):
+            server = RpcServer(**kwargs)
+
+            @server.register_procedure
+            def echo(value):
+                return value
+
+            return server
+
+        return factory
+
+    @pytest.fixture(params=["view", "async_view"])
+    def call(self, request, rf, async_rf):
+        """Send a POST request to the sync or the async view of the given server, and return the response"""
+
+        def call_view(server, data=self.PAYLOAD, content_type="application/json", without_length=False):
+            factory = rf if request.param == "view" else async_rf
+            rpc_request = factory.post("/rpc", data=data, content_type=content_type)
+            if without_length:
+                # Body sent with chunked transfer encoding
+                del rpc_request.META["CONTENT_LENGTH"]
+            if request.param == "view":
+                return server.view(rpc_request)
+            return async_to_sync(server.async_view)(rpc_request)
+
+        return call_view
+
+    def test_unlimited_by_default(self, server_factory, call):
+        assert call(server_factory()).status_code == HTTPStatus.OK
+
+    def test_content_length_exceeded(self, server_factory, call):
+        response = call(server_factory(max_request_size=len(self.PAYLOAD) - 1))
+
+        assert response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+        assert response.content == b"Unable to handle your request, the request body is too large."
+
+    def test_content_length_allowed(self, server_factory, call):
+        response = call(server_factory(max_request_size=len(self.PAYLOAD)))
+
+        assert response.status_code == HTTPStatus.OK
+        assert json.loads(response.content)["result"] == "x" * 100
+
+    @pytest.mark.parametrize(
+        ("max_size_offset", "expected_status"), [(0, HTTPStatus.OK), (-1, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)]
+    )
+    def test_without_content_length(self, server_factory, call, max_size_offset, expected_status):
+        server = server_factory(max_request_size=len(self.PAYLOAD) + max_size_offset)
+
+        assert call(server, without_length=True).status_code == expected_status
+
+    @pytest.mark.parametrize(
+        ("max_request_size", "expected_status"),
+        [
+            ({"application/json": 10}, HTTPStatus.REQUEST_ENTITY_TOO_LARGE),
+            ({"application/json": None, "*": 10}, HTTPStatus.OK),
+            ({"text/xml": 10}, HTTPStatus.OK),
+            ({"text/xml": 10, "*": 10}, HTTPStatus.REQUEST_ENTITY_TOO_LARGE),
+        ],
+    )
+    def test_per_content_type(self, server_factory, call, max_request_size, expected_status):
+        assert call(server_factory(max_request_size=max_request_size)).status_code == expected_status
+
+    def test_default_setting(self, server_factory, call, settings):
+        settings.MODERNRPC_MAX_REQUEST_SIZE = 10
+
+        assert call(server_factory()).status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+        assert call(server_factory(max_request_size=None)).status_code == HTTPStatus.OK
+
+    def test_django_data_upload_limit(self, server_factory, call, settings):
+        settings.DATA_UPLOAD_MAX_MEMORY_SIZE = 10
+
+        assert call(server_factory()).status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+
+class TestSpooledRequestBody:
+    VALUE = "é" * 1000
+
+    @pytest.fixture(autouse=True)
+    def spool_settings(self, settings):
+        settings.MODERNRPC_SPOOL_REQUEST_BODY_SIZE = 100
+
+    @pytest.fixture
+    def server(self):
+        server = RpcServer()
+
+        @server.register_procedure
+        def echo(value):
+            return value
+
+        return server
+
+    @pytest.fixture
+    def spooled_bodies(self, monkeypatch):
+        """Keep track of all spooled bodies built while the test runs"""
+        bodies = []
+        from_request = SpooledRequestBody.from_request.__func__
+
+        def tracked_from_request(cls, *args, **kwargs):
+            body = from_request(cls, *args, **kwargs)
+            bodies.append(body)
+            return body
+
+        monkeypatch.setattr(SpooledRequestBody, "from_request", classmethod(tracked_from_request))
+        return bodies
+
+    @pytest.mark.usefixtures("all_json_deserializers")
+    @pytest.mark.parametrize("view", ["view", "async_view"])
+    def test_jsonrpc(self, server, jsonrpc_rf, spooled_bodies, view):
+        request = jsonrpc_rf(method_name="echo", params=[self.VALUE])
+
+        response = async_to_sync(server.async_view)(request) if view == "async_view" else server.view(request)
+
+        assert json.loads(response.content)["result"] == self.VALUE
+        assert len(spooled_bodies) == 1
+        assert spooled_bodies[0].file.closed
+
+    @pytest.mark.usefixtures("all_xml_deserializers")
+    def test_xmlrpc(self, server, xmlrpc_rf, spooled_bodies):
+        response = server.view(xmlrpc_rf(method_name="echo", params=[self.VALUE]))
+
+        assert extract_xmlrpc_success_result(response) == self.VALUE
+        assert len(spooled_bodies) == 1
+        assert spooled_bodies[0].file.closed
+
+    @pytest.mark.usefixtures("all_json_deserializers")
+    def test_buffer_given_to_deserializer(self, server, jsonrpc_rf):
+        (handler,) = [handler for handler in server.handlers if handler.protocol == Protocol.JSON_RPC]
+        received_types = []
+        loads = handler.deserializer.loads
+        handler.deserializer.loads = lambda data: received_types.append(type(data)) or loads(data)
+
+        server.view(jsonrpc_rf(method_name="echo", params=[self.VALUE]))
+
+        expected_type = mmap.mmap if getattr(handler.deserializer, "accepts_buffer", False) else str
+        assert received_types == [expected_type]
+
+    def test_small_body_not_spooled(self, server, jsonrpc_rf, spooled_bodies, settings):
+        settings.MODERNRPC_SPOOL_REQUEST_BODY_SIZE = 10_000
+
+        response = server.view(jsonrpc_rf(method_name="echo", params=[self.VALUE]))
+
+        assert json.loads(response.content)["result"] == self.VALUE
+        assert spooled_bodies == []
+
+    def test_without_content_length(self, server, jsonrpc_rf, spooled_bodies, settings):
+        settings.MODERNRPC_SPOOL_REQUEST_BODY_SIZE = 10_000
+        request = jsonrpc_rf(method_name="echo", params=["x"])
+        del request.META["CONTENT_LENGTH"]
+
+        response = server.view(request)
+
+        assert json.loads(response.content)["result"] == "x"
+        assert len(spooled_bodies) == 1
+
+    @pytest.mark.usefixtures("all_json_deserializers")
+    def test_other_encoding(self, server, rf):
+        data = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "echo", "params": [self.VALUE]}, ensure_ascii=False)
+        request = rf.post("/rpc", data=data, content_type="application/json; charset=latin-1")
+
+        response = server.view(request)
+
+        assert json.loads(response.content)["result"] == self.VALUE
+
+    @pytest.mark.usefixtures("all_json_deserializers")
+    def test_invalid_payload(self, server, rf):
+        data = '{"jsonrpc": "2.0", "id": 1, "method": "echo", "params": ["x"' + " " * 200
+
+        response = server.view(rf.post("/rpc", data=data, content_type="application/json"))
+
+        assert json.loads(response.content)["error"]["code"] == RPC_PARSE_ERROR
+
+    def test_max_request_size(self, server, jsonrpc_rf, spooled_bodies):
+        server.max_request_size = 100
+        request = jsonrpc_rf(method_name="echo", params=[self.VALUE])
+        del request.META["CONTENT_LENGTH"]
+
+        response = server.view(request)
+
+        assert response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+        assert spooled_bodies == []
+
+    @pytest.mark.parametrize("view", ["view", "async_view"])
+    @pytest.mark.parametrize("content_length", [True, False])
+    def test_data_upload_max_memory_size(self, server, jsonrpc_rf, settings, view, content_length):
+        settings.DATA_UPLOAD_MAX_MEMORY_SIZE = 1000
+        request = jsonrpc_rf(method_name="echo", params=[self.VALUE])
+        if not content_length:
+            del request.META["CONTENT_LENGTH"]
+
+        response = async_to_sync(server.async_view)(request) if view == "async_view" else server.view(request)
+
+        assert response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+    def test_max_request_size_overrides_data_upload_max_memory_size(self, server, jsonrpc_rf, spooled_bodies, settings):
+        settings.DATA_UPLOAD_MAX_MEMORY_SIZE = 1000
+        server.max_request_size = 10_000
+        request = jsonrpc_rf(method_name="echo", params=[self.VALUE])
+        del request.META["CONTENT_LENGTH"]
+
+        response = server.view(request)
+
+        assert json.loads(response.content)["result"] == self.VALUE
+        assert len(spooled_bodies) == 1
@@ -1,10 +1,11 @@
-import importlib
+import datetime as dt
+from collections import Counter
 from unittest.mock import Mock
 
 import pytest
+from asgiref.sync import async_to_sync
 
 from modernrpc import RpcServer
-from modernrpc.constants import SYSTEM_NAMESPACE_DOTTED_PATH
 
 
 @pytest.fixture
@@ -41,29 +42,82 @@ def server(monkeypatch):
     return server
 
 
-@pytest.fixture(params=[True, False])
-def server_using_sync_or_async_multicall(request, settings, server, monkeypatch):
+@pytest.fixture(
+    params=[
+        pytest.param({"async_multicall": False}, id="sync-multicall"),
+        pytest.param({"async_multicall": False, "multicall_workers": 4}, id="threaded-multicall"),
+        pytest.param({"async_multicall": True}, id="async-multicall"),
+    ]
+)
+def server_using_sync_or_async_multicall(request, server, monkeypatch):
     """
     Create a new instance of RpcServer with a mocked 'on_error' method and some fake procedures registered.
-    The fixture is parametrized to run tests with sync and async system.multicall versions.
+    The fixture is parametrized to run tests with sync, threaded and async system.multicall versions.
     """
-    server_should_use_async_multicall = request.param
-
-    if server_should_use_async_multicall:
-        settings.MODERNRPC_XMLRPC_ASYNC_MULTICALL = True
-    else:
-        settings.MODERNRPC_XMLRPC_ASYNC_MULTICALL = False
-
-    # settings.MODERNRPC_XMLRPC_ASYNC_MULTICALL is checked at module level when it is first imported
-    # Reload the imported module the new server instanciation will register the right system.multicall version
-    system_procedures_module, _ = SYSTEM_NAMESPACE_DOTTED_PATH.rsplit(".", 1)
-    importlib.reload(importlib.import_module(system_procedures_module))
-
-    new_server = RpcServer()
+    new_server = RpcServer(**request.param)
     monkeypatch.setattr(new_server, "on_error", Mock(side_effect=new_server.on_error))
 
     for proc in server.procedures.values():
         if "system" not in proc.name:
-            new_server.register_procedure(proc.func_or_coro)
+            new_server.register_procedure(proc.func_or_coro, idempotent=proc.idempotent)
 
     return new_server
+
+
+@pytest.fixture
+def calls_counter(server) -> Counter:
+    """Register some procedures counting their calls into the server. Return the counter"""
+    counter: Counter = Counter()
+
+    @server.register_procedure(idempotent=True)
+    def idempotent_procedure(value: int):
+        counter["idempotent_procedure"] += 1
+        return value * 2
+
+    @server.register_procedure(idempotent=True)
+    async def async_idempotent_procedure(value: int):
+        counter["async_idempotent_procedure"] += 1
+        return value * 2
+
+    @server.register_procedure
+    def regular_procedure(value: int):
+        counter["regular_procedure"] += 1
+        return value * 2
+
+    return counter
+
+
+@pytest.fixture
+def binary_procedures(server):
+    """Register into the server some procedures working with types JSON cannot represent"""
+
+    @server.register_procedure
+    def echo(value):
+        return value
+
+    @server.register_procedure
+    def next_day(date: dt.datetime):
+        return date + dt.timedelta(days=1)
+
+
+@pytest.fixture(params=["view", "async_view"])
+def send(request, server):
+    """Return a function passing the given request to the sync or the async view of the server"""
+    if request.param == "async_view":
+        return async_to_sync(server.async_view)
+    return server.view
+
+
+@pytest.fixture
+def streaming_server(server):
+    """Configure the server to stream JSON-RPC batch responses in completion order"""
+    server.stream_batch_responses = True
+    return server
+
+
+@pytest.fixture
+def incremental_json_deserializer(settings):
+    """Configure the JSON-RPC handler to parse batch requests incrementally"""
+    settings.MODERNRPC_JSON_DESERIALIZER = {
+        "class": "modernrpc.jsonrpc.backends.json.PythonJsonIncrementalDeserializer",
+    }
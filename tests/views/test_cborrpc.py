@@ -0,0 +1,121 @@
+import datetime as dt
+from http import HTTPStatus
+
+import pytest
+
+from modernrpc import Protocol
+from modernrpc.exceptions import RPC_INTERNAL_ERROR, RPC_INVALID_REQUEST, RPC_METHOD_NOT_FOUND, RPC_PARSE_ERROR
+from tests.helpers import CBOR_ENCODING, extract_jsonrpc_fault_data, extract_jsonrpc_success_result
+
+pytestmark = pytest.mark.usefixtures("additional_handlers")
+
+loads = CBOR_ENCODING.loads
+
+
+class TestCborRpcViews:
+    @pytest.mark.parametrize("method_name", ["simple_procedure", "async_simple_procedure"])
+    def test_standard_call(self, send, server, binary_rf, method_name):
+        response = send(binary_rf(CBOR_ENCODING, method_name=method_name, params=["bar", 42], req_id=1))
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["Content-Type"] == "application/cbor"
+        assert loads(response.content) == {"id": 1, "jsonrpc": "2.0", "result": "foo='bar' bar=42"}
+        server.on_error.assert_not_called()
+
+    def test_procedure_exception(self, send, server, binary_rf):
+        response = send(binary_rf(CBOR_ENCODING, method_name="simple_procedure", params=["bar", -2]))
+
+        code, message = extract_jsonrpc_fault_data(response, loads=loads)
+        assert code == RPC_INTERNAL_ERROR
+        assert message == "Internal error: bar cannot be negative"
+        server.on_error.assert_called_once()
+
+    def test_native_bytes(self, send, binary_rf, binary_procedures):
+        data = bytes(range(256))
+
+        response = send(binary_rf(CBOR_ENCODING, method_name="echo", params=[data]))
+
+        assert extract_jsonrpc_success_result(response, loads=loads) == data
+
+    def test_bignum(self, send, binary_rf, binary_procedures):
+        response = send(binary_rf(CBOR_ENCODING, method_name="echo", params=[2**100]))
+
+        assert extract_jsonrpc_success_result(response, loads=loads) == 2**100
+
+    def test_tagged_datetime(self, send, binary_rf, binary_procedures):
+        date = dt.datetime(2024, 2, 28, 12, 30, tzinfo=dt.timezone.utc)
+
+        response = send(binary_rf(CBOR_ENCODING, method_name="next_day", params=[date]))
+
+        result = extract_jsonrpc_success_result(response, loads=loads)
+        assert result == dt.datetime(2024, 2, 29, 12, 30, tzinfo=dt.timezone.utc)
+
+    def test_notification(self, send, server, binary_rf):
+        response = send(binary_rf(CBOR_ENCODING, method_name="simple_procedure", params=["bar", 42], is_notif=True))
+
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert response.content == b""
+        server.on_error.assert_not_called()
+
+    def test_batch(self, send, binary_rf):
+        request = binary_rf(
+            CBOR_ENCODING,
+            requests=[
+                ("simple_procedure", ("bar", 42), False),
+                ("async_simple_procedure", ("bar", 42), True),
+                ("unknown", (), False),
+            ],
+        )
+
+        response = send(request)
+
+        assert response.status_code == HTTPStatus.OK
+        result = loads(response.content)
+        assert len(result) == 2
+        assert result[0]["result"] == "foo='bar' bar=42"
+        assert result[1]["error"]["code"] == RPC_METHOD_NOT_FOUND
+
+    def test_notifications_only_batch(self, send, binary_rf):
+        request = binary_rf(
+            CBOR_ENCODING,
+            requests=[("simple_procedure", ("bar", 42), True), ("async_simple_procedure", ("bar", 42), True)],
+        )
+
+        response = send(request)
+
+        assert response.status_code == HTTPStatus.NO_CONTENT
+
+    def test_invalid_payload(self, send, server, rf):
+        response = send(rf.post("/rpc", data=b"\xff", content_type="application/cbor"))
+
+        assert response.status_code == HTTPStatus.OK
+        assert loads(response.content)["id"] is None
+        code, _ = extract_jsonrpc_fault_data(response, loads=loads)
+        assert code == RPC_PARSE_ERROR
+        server.on_error.assert_called_once()
+
+    def test_invalid_request(self, send, rf):
+        response = send(rf.post("/rpc", data=CBOR_ENCODING.dumps(42), content_type="application/cbor"))
+
+        code, _ = extract_jsonrpc_fault_data(response, loads=loads)
+        assert code == RPC_INVALID_REQUEST
+
+
+async def test_batch_not_streamed(streaming_server, binary_rf):
+    request = binary_rf(CBOR_ENCODING, requests=[("async_simple_procedure", ("bar", 42), False)])
+
+    response = await streaming_server.async_view(request)
+
+    assert not response.streaming
+    assert [result["result"] for result in loads(response.content)] == ["foo='bar' bar=42"]
+
+
+def test_procedure_protocol_restriction(server, binary_rf):
+    @server.register_procedure(protocol=Protocol.XML_RPC)
+    def xml_only():
+        return 42
+
+    response = server.view(binary_rf(CBOR_ENCODING, method_name="xml_only"))
+
+    code, _ = extract_jsonrpc_fault_data(response, loads=loads)
+    assert code == RPC_METHOD_NOT_FOUND
@@ -0,0 +1,185 @@
+import json
+import xmlrpc.client
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from django.core import signing
+
+from modernrpc import FileResult
+from modernrpc.exceptions import RPC_INTERNAL_ERROR
+
+FILE_CONTENT = b"\x00\x01binary content\xff" * 1000
+
+pytestmark = pytest.mark.usefixtures("keep_db_connections", "files_root")
+
+
+@pytest.fixture
+def files_root(settings, tmp_path):
+    settings.MODERNRPC_FILE_RESULT_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def file_procedures(server, tmp_path):
+    """Register procedures returning FileResult instances into the server. Return the path of the returned file"""
+    path = tmp_path / "report.bin"
+    path.write_bytes(FILE_CONTENT)
+
+    @server.register_procedure
+    def get_file():
+        return FileResult(path)
+
+    @server.register_procedure
+    async def async_get_file():
+        return FileResult(path, filename="renamed.bin", content_type="application/x-custom")
+
+    @server.register_procedure
+    def get_missing_file():
+        return FileResult(tmp_path / "missing.bin")
+
+    @server.register_procedure
+    def get_relative_file():
+        return FileResult("report.bin")
+
+    @server.register_procedure
+    def get_outside_file():
+        return FileResult(tmp_path / ".." / "report.bin")
+
+    return path
+
+
+def download(server, rf, url: str) -> tuple:
+    """Send a GET request to the given file URL. Return the response and its content"""
+    parsed_url = urlsplit(url)
+    response = server.view(rf.get(f"{parsed_url.path}?{parsed_url.query}"))
+    content = b"".join(response.streaming_content)
+    response.close()
+    return response, content
+
+
+@pytest.mark.usefixtures("all_json_serializers")
+class TestJsonRpcFileResults:
+    def test_file_url(self, server, jsonrpc_rf, rf, file_procedures):
+        response = server.view(jsonrpc_rf(method_name="get_file", req_id=1))
+
+        result = json.loads(response.content)["result"]
+        assert result["filename"] == "report.bin"
+        assert result["url"].startswith("http://testserver/")
+
+        file_response, content = download(server, rf, result["url"])
+        assert file_response.status_code == HTTPStatus.OK
+        assert content == FILE_CONTENT
+        assert file_response.headers["Content-Length"] == str(len(FILE_CONTENT))
+        assert file_response.headers["Content-Disposition"] == 'attachment; filename="report.bin"'
+
+    async def test_file_url_async(self, server, jsonrpc_rf, rf, file_procedures):
+        response = await server.async_view(jsonrpc_rf(method_name="async_get_file", req_id=1))
+
+        result = json.loads(response.content)["result"]
+        assert result["filename"] == "renamed.bin"
+
+        file_response, _ = download(server, rf, result["url"])
+        assert file_response.headers["Content-Type"] == "application/x-custom"
+        assert file_response.headers["Content-Disposition"] == 'attachment; filename="renamed.bin"'
+
+    def test_missing_file(self, server, jsonrpc_rf, file_procedures):
+        response = server.view(jsonrpc_rf(method_name="get_missing_file", req_id=1))
+
+        error = json.loads(response.content)["error"]
+        assert error["code"] == RPC_INTERNAL_ERROR
+        assert "missing.bin" in error["message"]
+        assert str(file_procedures.parent) not in error["message"]
+
+    def test_relative_path(self, server, jsonrpc_rf, rf, file_procedures):
+        response = server.view(jsonrpc_rf(method_name="get_relative_file", req_id=1))
+
+        result = json.loads(response.content)["result"]
+        assert download(server, rf, result["url"])[1] == FILE_CONTENT
+
+    def test_only_relative_path_signed(self, server, jsonrpc_rf, file_procedures):
+        response = server.view(jsonrpc_rf(method_name="get_file", req_id=1))
+
+        url = json.loads(response.content)["result"]["url"]
+        token = parse_qs(urlsplit(url).query)["file"][0]
+        assert signing.loads(token, salt="modernrpc.files.FileResult:/rpc")["path"] == "report.bin"
+
+    def test_file_outside_root(self, server, jsonrpc_rf, file_procedures):
+        response = server.view(jsonrpc_rf(method_name="get_outside_file", req_id=1))
+
+        error = json.loads(response.content)["error"]
+        assert error["code"] == RPC_INTERNAL_ERROR
+        assert "outside of MODERNRPC_FILE_RESULT_ROOT" in error["message"]
+
+    def test_root_not_configured(self, server, jsonrpc_rf, settings, file_procedures):
+        settings.MODERNRPC_FILE_RESULT_ROOT = None
+
+        response = server.view(jsonrpc_rf(method_name="get_file", req_id=1))
+
+        assert json.loads(response.content)["error"]["code"] == RPC_INTERNAL_ERROR
+
+
+@pytest.mark.usefixtures("all_xml_serializers")
+class TestXmlRpcFileResults:
+    def test_file_url(self, server, xmlrpc_rf, rf, file_procedures):
+        response = server.view(xmlrpc_rf(method_name="get_file"))
+
+        result = xmlrpc.client.loads(response.content)[0][0]
+        assert result["filename"] == "report.bin"
+        assert download(server, rf, result["url"])[1] == FILE_CONTENT
+
+    def test_multicall(self, server, xmlrpc_rf, rf, file_procedures):
+        request = xmlrpc_rf(method_name="system.multicall", params=[[{"methodName": "get_file", "params": []}] * 2])
+
+        response = server.view(request)
+
+        results = xmlrpc.client.loads(response.content)[0][0]
+        assert [result[0]["filename"] for result in results] == ["report.bin", "report.bin"]
+
+
+class TestFileDownload:
+    def test_invalid_token(self, server, rf):
+        response = server.view(rf.get("/rpc", {"file": "forged-token"}))
+
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_expired_token(self, server, rf, settings, tmp_path):
+        settings.MODERNRPC_FILE_RESULT_MAX_AGE = -1
+        token = FileResult(tmp_path / "file.bin").sign("/rpc")
+
+        response = server.view(rf.get("/rpc", {"file": token}))
+
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_token_signed_with_other_salt(self, server, rf, tmp_path):
+        token = signing.dumps({"path": str(tmp_path / "file.bin")}, compress=True)
+
+        response = server.view(rf.get("/rpc", {"file": token}))
+
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_token_signed_for_other_endpoint(self, server, rf, tmp_path):
+        (tmp_path / "file.bin").write_bytes(FILE_CONTENT)
+        token = FileResult(tmp_path / "file.bin").sign("/other-rpc")
+
+        response = server.view(rf.get("/rpc", {"file": token}))
+
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_deleted_file(self, server, rf, tmp_path):
+        token = FileResult(tmp_path / "deleted.bin").sign("/rpc")
+
+        response = server.view(rf.get("/rpc", {"file": token}))
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_inline_file(self, server, rf, tmp_path):
+        path = tmp_path / "picture.png"
+        path.write_bytes(b"png")
+        token = FileResult(path, as_attachment=False).sign("/rpc")
+
+        response = server.view(rf.get("/rpc", {"file": token}))
+
+        assert response.headers["Content-Type"] == "image/png"
+        assert response.headers["Content-Disposition"] == 'inline; filename="picture.png"'
+        response.close()
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import random
 import re
@@ -5,6 +6,7 @@ from http import HTTPStatus
 
 import pytest
 
+from modernrpc import RpcServer
 from modernrpc.exceptions import RPC_INTERNAL_ERROR, RPC_INVALID_PARAMS, RPC_METHOD_NOT_FOUND, RPC_PARSE_ERROR
 from tests.helpers import extract_jsonrpc_fault_data, extract_jsonrpc_success_result
 
@@ -202,3 +204,185 @@ class TestJsonRpcAsyncBatch:
         assert response.status_code == HTTPStatus.NO_CONTENT
         assert response.content == b""
         server.on_error.assert_called()
+
+    async def test_jsonrpc_batch_idempotent_calls(self, jsonrpc_batch_rf, server, calls_counter, asynchronous):
+        method_name = "async_idempotent_procedure" if asynchronous else "idempotent_procedure"
+        request = jsonrpc_batch_rf(
+            requests=[(method_name, (i % 3,), False) for i in range(30)] + [("regular_procedure", (5,), False)] * 4
+        )
+
+        response = await server.async_view(request)
+
+        assert response.status_code == HTTPStatus.OK
+        data = json.loads(response.content)
+        assert [result["result"] for result in data] == [(i % 3) * 2 for i in range(30)] + [10] * 4
+        assert len({result["id"] for result in data}) == 34
+        assert calls_counter == {method_name: 3, "regular_procedure": 4}
+
+    async def test_jsonrpc_batch_idempotent_errors(self, jsonrpc_batch_rf, server, calls_counter, asynchronous):
+        method_name = "async_idempotent_procedure" if asynchronous else "idempotent_procedure"
+        request = jsonrpc_batch_rf(requests=[(method_name, (1, 2), False)] * 3)
+
+        response = await server.async_view(request)
+
+        data = json.loads(response.content)
+        assert len({result["id"] for result in data}) == 3
+        assert {result["error"]["code"] for result in data} == {RPC_INVALID_PARAMS}
+        server.on_error.assert_called_once()
+
+
+@pytest.mark.usefixtures("incremental_json_deserializer")
+@pytest.mark.parametrize("asynchronous", [False, True], ids=["sync", "async"])
+class TestJsonRpcAsyncIncrementalBatch:
+    async def test_jsonrpc_batch_basics(self, jsonrpc_batch_rf, server, asynchronous):
+        method_name = "async_simple_procedure" if asynchronous else "simple_procedure"
+        request = jsonrpc_batch_rf(requests=[(method_name, (chr(i), i), False) for i in range(97, 123)])
+
+        response = await server.async_view(request)
+
+        assert response.status_code == HTTPStatus.OK
+        data = json.loads(response.content)
+        assert [result["result"] for result in data] == [f"foo='{chr(i)}' bar={i}" for i in range(97, 123)]
+        server.on_error.assert_not_called()
+
+    async def test_jsonrpc_batch_all_notif(self, jsonrpc_batch_rf, server, asynchronous):
+        method_name = "async_simple_procedure" if asynchronous else "simple_procedure"
+        request = jsonrpc_batch_rf(requests=[(method_name, (chr(i), i), True) for i in range(97, 123)])
+
+        response = await server.async_view(request)
+
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert response.content == b""
+
+    async def test_jsonrpc_batch_truncated_payload(self, jsonrpc_batch_rf, server, asynchronous):
+        method_name = "async_simple_procedure" if asynchronous else "simple_procedure"
+        request = jsonrpc_batch_rf(requests=[(method_name, ("foo", i), False) for i in range(3)])
+        request._body = request.body[:-10]  # noqa: SLF001
+
+        response = await server.async_view(request)
+
+        assert response.status_code == HTTPStatus.OK
+        data = json.loads(response.content)
+        assert [result.get("result") for result in data] == ["foo='foo' bar=0", "foo='foo' bar=1", None]
+        assert data[-1]["error"]["code"] == RPC_PARSE_ERROR
+        server.on_error.assert_called_once()
+
+    async def test_jsonrpc_batch_window(self, settings, jsonrpc_batch_rf, asynchronous):
+        settings.MODERNRPC_JSON_BATCH_WINDOW_SIZE = 3
+        server = RpcServer()
+        running = 0
+        max_running = 0
+
+        @server.register_procedure
+        async def slow_procedure(value: int):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(running, max_running)
+            await asyncio.sleep(0.001)
+            running -= 1
+            return value
+
+        request = jsonrpc_batch_rf(requests=[("slow_procedure", (i,), False) for i in range(20)])
+
+        response = await server.async_view(request)
+
+        assert [result["result"] for result in json.loads(response.content)] == list(range(20))
+        assert max_running == 3
+
+    async def test_jsonrpc_batch_idempotent_calls(self, jsonrpc_batch_rf, server, calls_counter, asynchronous):
+        method_name = "async_idempotent_procedure" if asynchronous else "idempotent_procedure"
+        request = jsonrpc_batch_rf(requests=[(method_name, (i % 2,), False) for i in range(10)])
+
+        response = await server.async_view(request)
+
+        assert [result["result"] for result in json.loads(response.content)] == [(i % 2) * 2 for i in range(10)]
+        assert calls_counter == {method_name: 2}
+
+
+async def read_streamed_content(response) -> list:
+    assert response.streaming
+    return json.loads(b"".join([chunk async for chunk in response.streaming_content]))
+
+
+@pytest.mark.usefixtures("all_json_deserializers", "all_json_serializers")
+class TestJsonRpcAsyncStreamedBatch:
+    async def test_jsonrpc_batch_basics(self, jsonrpc_batch_rf, streaming_server):
+        request = jsonrpc_batch_rf(
+            requests=[("async_simple_procedure", (chr(i), i - 100), False) for i in range(97, 123)]
+        )
+
+        response = await streaming_server.async_view(request)
+
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Type"] == "application/json"
+        data = await read_streamed_content(response)
+        assert len(data) == 26
+        assert len({result["id"] for result in data}) == 26
+        assert {result["result"] for result in data if "result" in result} == {
+            f"foo='{chr(i)}' bar={i - 100}" for i in range(100, 123)
+        }
+        assert streaming_server.on_error.call_count == 3
+
+    async def test_jsonrpc_batch_with_notifications(self, jsonrpc_batch_rf, streaming_server):
+        request = jsonrpc_batch_rf(requests=[("async_simple_procedure", ("foo", i), i % 2 == 0) for i in range(10)])
+
+        response = await streaming_server.async_view(request)
+
+        data = await read_streamed_content(response)
+        assert sorted(result["result"] for result in data) == [f"foo='foo' bar={i}" for i in (1, 3, 5, 7, 9)]
+
+    async def test_jsonrpc_batch_all_notif(self, jsonrpc_batch_rf, streaming_server):
+        request = jsonrpc_batch_rf(requests=[("async_simple_procedure", ("foo", i), True) for i in range(10)])
+
+        response = await streaming_server.async_view(request)
+
+        assert not response.streaming
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert response.content == b""
+
+    async def test_jsonrpc_batch_invalid_result(self, jsonrpc_batch_rf, streaming_server):
+        request = jsonrpc_batch_rf(
+            requests=[("async_unserializable_result_procedure", (), False), ("async_simple_procedure", ("a", 1), False)]
+        )
+
+        response = await streaming_server.async_view(request)
+
+        data = sorted(await read_streamed_content(response), key=lambda result: result["id"])
+        assert data[0]["error"]["code"] == RPC_INTERNAL_ERROR
+        assert data[1]["result"] == "foo='a' bar=1"
+        streaming_server.on_error.assert_called_once()
+
+
+class TestJsonRpcStreamedBatchOrder:
+    async def test_completion_order(self, jsonrpc_batch_rf):
+        server = RpcServer(stream_batch_responses=True)
+
+        @server.register_procedure
+        async def sleep(delay: float):
+            await asyncio.sleep(delay)
+            return delay
+
+        request = jsonrpc_batch_rf(requests=[("sleep", (delay,), False) for delay in (0.05, 0.02, 0)])
+
+        response = await server.async_view(request)
+
+        chunks = [chunk async for chunk in response.streaming_content]
+        assert [json.loads(chunk.lstrip(b"[,"))["result"] for chunk in chunks[:-1]] == [0, 0.02, 0.05]
+        assert chunks[-1] == b"]"
+
+    async def test_idempotent_calls(self, jsonrpc_batch_rf, streaming_server, calls_counter):
+        request = jsonrpc_batch_rf(requests=[("async_idempotent_procedure", (i % 2,), False) for i in range(10)])
+
+        response = await streaming_server.async_view(request)
+
+        data = sorted(await read_streamed_content(response), key=lambda result: result["id"])
+        assert [result["result"] for result in data] == [(i % 2) * 2 for i in range(10)]
+        assert calls_counter == {"async_idempotent_procedure": 2}
+
+    def test_sync_view_not_streamed(self, jsonrpc_batch_rf, streaming_server):
+        request = jsonrpc_batch_rf(requests=[("simple_procedure", ("foo", i), False) for i in range(3)])
+
+        response = streaming_server.view(request)
+
+        assert not response.streaming
+        assert [result["result"] for result in json.loads(response.content)] == [f"foo='foo' bar={i}" for i in range(3)]
@@ -203,3 +203,82 @@ class TestJsonRpcSyncBatch:
         assert response.status_code == HTTPStatus.NO_CONTENT
         assert response.content == b""
         server.on_error.assert_called()
+
+    def test_jsonrpc_batch_idempotent_calls(self, jsonrpc_batch_rf, server, calls_counter, asynchronous):
+        method_name = "async_idempotent_procedure" if asynchronous else "idempotent_procedure"
+        request = jsonrpc_batch_rf(
+            requests=[(method_name, (i % 3,), False) for i in range(30)] + [("regular_procedure", (5,), False)] * 4
+        )
+
+        response = server.view(request)
+
+        assert response.status_code == HTTPStatus.OK
+        data = json.loads(response.content)
+        assert [result["result"] for result in data] == [(i % 3) * 2 for i in range(30)] + [10] * 4
+        assert len({result["id"] for result in data}) == 34
+        assert calls_counter == {method_name: 3, "regular_procedure": 4}
+
+    def test_jsonrpc_batch_idempotent_errors(self, jsonrpc_batch_rf, server, calls_counter, asynchronous):
+        method_name = "async_idempotent_procedure" if asynchronous else "idempotent_procedure"
+        request = jsonrpc_batch_rf(requests=[(method_name, (1, 2), False)] * 3)
+
+        response = server.view(request)
+
+        data = json.loads(response.content)
+        assert len({result["id"] for result in data}) == 3
+        assert {result["error"]["code"] for result in data} == {RPC_INVALID_PARAMS}
+        server.on_error.assert_called_once()
+
+
+@pytest.mark.usefixtures("incremental_json_deserializer")
+class TestJsonRpcSyncIncrementalBatch:
+    def test_jsonrpc_batch_basics(self, jsonrpc_batch_rf, server):
+        request = jsonrpc_batch_rf(requests=[("simple_procedure", (chr(i), i), False) for i in range(97, 123)])
+
+        response = server.view(request)
+
+        assert response.status_code == HTTPStatus.OK
+        data = json.loads(response.content)
+        assert [result["result"] for result in data] == [f"foo='{chr(i)}' bar={i}" for i in range(97, 123)]
+        server.on_error.assert_not_called()
+
+    def test_jsonrpc_batch_all_notif(self, jsonrpc_batch_rf, server):
+        request = jsonrpc_batch_rf(requests=[("simple_procedure", (chr(i), i), True) for i in range(97, 123)])
+
+        response = server.view(request)
+
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert response.content == b""
+
+    def test_jsonrpc_batch_invalid_payload(self, jsonrpc_batch_rf, server):
+        request = jsonrpc_batch_rf(requests=[("simple_procedure", ("foo", 5), False)])
+        request._body = request.body.replace(b'"', b"**")  # noqa: SLF001
+
+        response = server.view(request)
+
+        assert response.status_code == HTTPStatus.OK
+        code, message = extract_jsonrpc_fault_data(response)
+        assert code == RPC_PARSE_ERROR
+        assert "Parse error, unable to read the request:" in message
+        server.on_error.assert_called_once()
+
+    def test_jsonrpc_batch_truncated_payload(self, jsonrpc_batch_rf, server):
+        request = jsonrpc_batch_rf(requests=[("simple_procedure", ("foo", i), False) for i in range(3)])
+        request._body = request.body[:-10]  # noqa: SLF001
+
+        response = server.view(request)
+
+        assert response.status_code == HTTPStatus.OK
+        data = json.loads(response.content)
+        assert [result.get("result") for result in data] == ["foo='foo' bar=0", "foo='foo' bar=1", None]
+        assert data[-1]["id"] is None
+        assert data[-1]["error"]["code"] == RPC_PARSE_ERROR
+        server.on_error.assert_called_once()
+
+    def test_jsonrpc_batch_idempotent_calls(self, jsonrpc_batch_rf, server, calls_counter):
+        request = jsonrpc_batch_rf(requests=[("idempotent_procedure", (i % 2,), False) for i in range(10)])
+
+        response = server.view(request)
+
+        assert [result["result"] for result in json.loads(response.content)] == [(i % 2) * 2 for i in range(10)]
+        assert calls_counter == {"idempotent_procedure": 2}
@@ -0,0 +1,177 @@
+import hashlib
+import json
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.files.uploadedfile import InMemoryUploadedFile, SimpleUploadedFile, TemporaryUploadedFile
+from django.http import HttpRequest
+from django.middleware.csrf import get_token
+
+from modernrpc.exceptions import RPC_INVALID_PARAMS, RPC_INVALID_REQUEST, RPC_PARSE_ERROR
+from tests.helpers import extract_jsonrpc_fault_data, extract_jsonrpc_success_result
+
+pytestmark = pytest.mark.usefixtures("additional_handlers", "all_json_deserializers", "all_json_serializers")
+
+FILE_CONTENT = bytes(range(256)) * 64
+EXPECTED_CHECKSUM = {"name": "data.bin", "size": len(FILE_CONTENT), "digest": hashlib.sha256(FILE_CONTENT).hexdigest()}
+
+
+@pytest.fixture
+def received_files(server) -> list:
+    """Register into the server some procedures receiving uploaded files. Return the files received by 'checksum'"""
+    files: list = []
+
+    @server.register_procedure
+    def checksum(file, algorithm: str = "sha256"):
+        files.append(file)
+        return {"name": file.name, "size": file.size, "digest": hashlib.new(algorithm, file.read()).hexdigest()}
+
+    @server.register_procedure
+    async def async_sizes(files: list):
+        return [file.size for file in files]
+
+    return files
+
+
+@pytest.mark.parametrize("payload_as_file", [False, True])
+def test_file_param(server, multipart_rf, received_files, payload_as_file):
+    request = multipart_rf(
+        method_name="checksum",
+        params=[{"$file": "data"}],
+        files={"data": FILE_CONTENT},
+        payload_as_file=payload_as_file,
+    )
+
+    response = server.view(request)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"] == "application/json"
+    assert extract_jsonrpc_success_result(response) == EXPECTED_CHECKSUM
+    server.on_error.assert_not_called()
+
+
+def test_named_params(server, multipart_rf, received_files):
+    request = multipart_rf(
+        method_name="checksum",
+        params={"file": {"$file": "data"}, "algorithm": "md5"},
+        files={"data": FILE_CONTENT},
+    )
+
+    response = server.view(request)
+
+    assert extract_jsonrpc_success_result(response)["digest"] == hashlib.md5(FILE_CONTENT).hexdigest()
+
+
+def test_nested_references(server, multipart_rf, received_files):
+    params = [[{"$file": "first"}, {"$file": "second"}, {"$file": "first"}]]
+    request = multipart_rf(method_name="async_sizes", params=params, files={"first": b"a" * 10, "second": b"b" * 20})
+
+    response = server.view(request)
+
+    assert extract_jsonrpc_success_result(response) == [10, 20, 10]
+
+
+async def test_async_view(server, multipart_rf, received_files):
+    request = multipart_rf(method_name="async_sizes", params=[[{"$file": "data"}]], files={"data": FILE_CONTENT})
+
+    response = await server.async_view(request)
+
+    assert extract_jsonrpc_success_result(response) == [len(FILE_CONTENT)]
+
+
+def test_batch_request(server, multipart_rf, received_files):
+    request = multipart_rf(
+        requests=[("checksum", ({"$file": "data"},), False), ("checksum", ({"$file": "unknown"},), False)],
+        files={"data": FILE_CONTENT},
+    )
+
+    response = server.view(request)
+
+    first, second = json.loads(response.content)
+    assert first["result"] == EXPECTED_CHECKSUM
+    assert second["error"]["code"] == RPC_INVALID_PARAMS
+    assert 'file part "unknown" not found in request' in second["error"]["message"]
+
+
+def test_other_objects_are_kept(server, multipart_rf):
+    value = {"$file": "data", "other": 1}
+    request = multipart_rf(method_name="simple_procedure", params=[value, 42], files={"data": FILE_CONTENT})
+
+    response = server.view(request)
+
+    assert extract_jsonrpc_success_result(response) == f"foo={value!r} bar=42"
+
+
+def test_missing_request_part(server, rf):
+    request = rf.post(
+        "/rpc", data={"data": SimpleUploadedFile("data.bin", FILE_CONTENT)}, HTTP_X_REQUESTED_WITH="XMLHttpRequest"
+    )
+
+    response = server.view(request)
+
+    code, _ = extract_jsonrpc_fault_data(response)
+    assert code == RPC_PARSE_ERROR
+
+
+@pytest.mark.parametrize(
+    ("max_memory_size", "expected_type"),
+    [(10 * len(FILE_CONTENT), InMemoryUploadedFile), (len(FILE_CONTENT) - 1, TemporaryUploadedFile)],
+)
+def test_large_files_spooled_to_disk(server, multipart_rf, received_files, settings, max_memory_size, expected_type):
+    settings.FILE_UPLOAD_MAX_MEMORY_SIZE = max_memory_size
+
+    request = multipart_rf(method_name="checksum", params=[{"$file": "data"}], files={"data": FILE_CONTENT})
+
+    response = server.view(request)
+    # Temporary files are closed (and deleted) with the request, Django handlers do this when the response is closed
+    request.close()
+
+    assert extract_jsonrpc_success_result(response) == EXPECTED_CHECKSUM
+    assert isinstance(received_files[0], expected_type)
+
+
+@pytest.mark.parametrize("view", ["view", "async_view"])
+def test_undecodable_request_part(server, rf, view):
+    data = {"request": SimpleUploadedFile("request.json", b'{"method": "\xff"}')}
+    request = rf.post("/rpc", data=data, HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+
+    response = server.view(request) if view == "view" else async_to_sync(server.async_view)(request)
+
+    code, _ = extract_jsonrpc_fault_data(response)
+    assert code == RPC_PARSE_ERROR
+
+
+class TestCsrfProtection:
+    @pytest.mark.parametrize("view", ["view", "async_view"])
+    def test_request_without_header_rejected(self, server, multipart_rf, calls_counter, view):
+        request = multipart_rf(method_name="regular_procedure", params=[1], requested_with=None)
+
+        response = server.view(request) if view == "view" else async_to_sync(server.async_view)(request)
+
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        code, message = extract_jsonrpc_fault_data(response)
+        assert code == RPC_INVALID_REQUEST
+        assert "X-Requested-With" in message
+        assert calls_counter["regular_procedure"] == 0
+
+    def test_request_with_csrf_token(self, server, multipart_rf, calls_counter):
+        token = get_token(HttpRequest())
+        request = multipart_rf(method_name="regular_procedure", params=[1], requested_with=None)
+        request.COOKIES[settings.CSRF_COOKIE_NAME] = token
+        request.META["HTTP_X_CSRFTOKEN"] = token
+
+        response = server.view(request)
+
+        assert extract_jsonrpc_success_result(response) == 2
+        assert calls_counter["regular_procedure"] == 1
+
+    def test_request_with_invalid_csrf_token(self, server, multipart_rf):
+        request = multipart_rf(method_name="regular_procedure", params=[1], requested_with=None)
+        request.COOKIES[settings.CSRF_COOKIE_NAME] = get_token(HttpRequest())
+        request.META["HTTP_X_CSRFTOKEN"] = get_token(HttpRequest())
+
+        response = server.view(request)
+
+        assert response.status_code == HTTPStatus.FORBIDDEN
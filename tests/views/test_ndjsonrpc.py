@@ -0,0 +1,183 @@
+import asyncio
+import json
+from collections import Counter
+from http import HTTPStatus
+
+import pytest
+
+from modernrpc.exceptions import RPC_INVALID_REQUEST, RPC_METHOD_NOT_FOUND, RPC_PARSE_ERROR
+from modernrpc.ndjson.handler import NdjsonRpcHandler
+from tests.helpers import build_json_rpc_request_data
+
+pytestmark = pytest.mark.usefixtures("additional_handlers")
+
+
+@pytest.fixture
+def running_calls(server) -> Counter:
+    """Register into the server a procedure sleeping before returning its value. Return the concurrent calls counter"""
+    counter: Counter = Counter()
+
+    @server.register_procedure
+    async def async_sleep(delay: float, value):
+        counter["running"] += 1
+        counter["max_running"] = max(counter["max_running"], counter["running"])
+        await asyncio.sleep(delay)
+        counter["running"] -= 1
+        return value
+
+    return counter
+
+
+def read_lines(content: bytes) -> list:
+    assert content.endswith(b"\n")
+    return [json.loads(line) for line in content.splitlines()]
+
+
+def line_length(method_name: str, params: tuple) -> int:
+    return len(json.dumps(build_json_rpc_request_data(method=method_name, params=params))) + 1
+
+
+@pytest.mark.parametrize("request_body", ["a\nb\n", b"a\nb\n", iter(["a", "b"])], ids=["str", "bytes", "iterator"])
+def test_iter_lines(request_body):
+    assert list(NdjsonRpcHandler.iter_lines(request_body)) == ["a", "b"]
+
+
+@pytest.mark.usefixtures("all_json_deserializers", "all_json_serializers")
+class TestNdjsonSyncView:
+    @pytest.mark.parametrize("content_type", ["application/x-ndjson", "application/jsonl"])
+    def test_calls(self, server, ndjson_rf, content_type):
+        request = ndjson_rf(
+            content_type=content_type,
+            lines=[("simple_procedure", ("bar", 42), False), ("async_simple_procedure", ("baz", 7), False)],
+        )
+
+        response = server.view(request)
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming
+        assert response.headers["Content-Type"] == "application/x-ndjson"
+        results = read_lines(b"".join(response.streaming_content))
+        assert [result["result"] for result in results] == ["foo='bar' bar=42", "foo='baz' bar=7"]
+        server.on_error.assert_not_called()
+
+    def test_calls_executed_while_streaming(self, server, ndjson_rf, calls_counter):
+        request = ndjson_rf(lines=[("regular_procedure", (1,), False), ("regular_procedure", (2,), False)])
+
+        response = server.view(request)
+        assert calls_counter["regular_procedure"] == 0
+
+        next(iter(response.streaming_content))
+        assert calls_counter["regular_procedure"] == 1
+
+    def test_invalid_lines(self, server, ndjson_rf, calls_counter):
+        request = ndjson_rf(
+            lines=[
+                "\n",
+                "{invalid json\n",
+                json.dumps([build_json_rpc_request_data(method="regular_procedure", params=(1,))]) + "\n",
+                ("unknown", (), False),
+                ("regular_procedure", (2,), True),
+                ("regular_procedure", (3,), False),
+            ]
+        )
+
+        response = server.view(request)
+
+        results = read_lines(b"".join(response.streaming_content))
+        assert len(results) == 4
+        assert results[0]["id"] is None
+        assert results[0]["error"]["code"] == RPC_PARSE_ERROR
+        assert results[1]["id"] is None
+        assert results[1]["error"]["code"] == RPC_INVALID_REQUEST
+        assert results[2]["error"]["code"] == RPC_METHOD_NOT_FOUND
+        assert results[3]["result"] == 6
+        assert calls_counter["regular_procedure"] == 2
+
+    def test_max_request_size_exceeded(self, server, ndjson_rf, calls_counter):
+        request = ndjson_rf(lines=[("regular_procedure", (1,), False), ("regular_procedure", (2,), False)])
+        # Body sent with chunked transfer encoding, the size is checked while lines are read
+        del request.META["CONTENT_LENGTH"]
+        server.max_request_size = line_length("regular_procedure", (1,)) + 10
+
+        response = server.view(request)
+
+        results = read_lines(b"".join(response.streaming_content))
+        assert results[0]["result"] == 2
+        assert results[1]["id"] is None
+        assert results[1]["error"]["code"] == RPC_INVALID_REQUEST
+        assert calls_counter["regular_procedure"] == 1
+
+    def test_notifications_only(self, server, ndjson_rf, calls_counter):
+        request = ndjson_rf(lines=[("regular_procedure", (1,), True), ("regular_procedure", (2,), True)])
+
+        response = server.view(request)
+
+        assert response.status_code == HTTPStatus.OK
+        assert b"".join(response.streaming_content) == b""
+        assert calls_counter["regular_procedure"] == 2
+
+
+@pytest.mark.usefixtures("all_json_deserializers", "all_json_serializers")
+class TestNdjsonAsyncView:
+    @staticmethod
+    async def read_streamed_lines(response) -> list:
+        assert response.streaming
+        return read_lines(b"".join([chunk async for chunk in response.streaming_content]))
+
+    async def test_calls(self, server, ndjson_rf, running_calls):
+        request = ndjson_rf(
+            lines=[
+                ("simple_procedure", ("bar", 42), False),
+                ("simple_procedure", ("bar", 0), True),
+                ("async_sleep", (0, "foo"), False),
+            ]
+        )
+
+        response = await server.async_view(request)
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["Content-Type"] == "application/x-ndjson"
+        results = await self.read_streamed_lines(response)
+        assert sorted(result["result"] for result in results) == ["foo", "foo='bar' bar=42"]
+        server.on_error.assert_not_called()
+
+    async def test_completion_order(self, server, ndjson_rf, running_calls):
+        request = ndjson_rf(lines=[("async_sleep", (0.2, "slow"), False), ("async_sleep", (0, "fast"), False)])
+
+        response = await server.async_view(request)
+
+        results = await self.read_streamed_lines(response)
+        assert [result["result"] for result in results] == ["fast", "slow"]
+
+    async def test_bounded_concurrency(self, settings, server, ndjson_rf, running_calls):
+        settings.MODERNRPC_JSON_BATCH_WINDOW_SIZE = 3
+        server.handlers = [NdjsonRpcHandler()]
+        request = ndjson_rf(lines=[("async_sleep", (0.01, i), False) for i in range(10)])
+
+        response = await server.async_view(request)
+
+        results = await self.read_streamed_lines(response)
+        assert sorted(result["result"] for result in results) == list(range(10))
+        assert running_calls["max_running"] == 3
+
+    async def test_invalid_lines(self, server, ndjson_rf):
+        request = ndjson_rf(lines=["{invalid json\n", ("simple_procedure", ("bar", 42), False)])
+
+        response = await server.async_view(request)
+
+        results = await self.read_streamed_lines(response)
+        assert results[0]["id"] is None
+        assert results[0]["error"]["code"] == RPC_PARSE_ERROR
+        assert results[1]["result"] == "foo='bar' bar=42"
+
+    async def test_max_request_size_exceeded(self, server, ndjson_rf):
+        request = ndjson_rf(lines=[("simple_procedure", ("bar", 42), False), ("simple_procedure", ("baz", 7), False)])
+        del request.META["CONTENT_LENGTH"]
+        server.max_request_size = line_length("simple_procedure", ("bar", 42)) + 10
+
+        response = await server.async_view(request)
+
+        results = await self.read_streamed_lines(response)
+        assert "foo='bar' bar=42" in [result.get("result") for result in results]
+        assert [result["error"]["code"] for result in results if result["id"] is None] == [RPC_INVALID_REQUEST]
+        assert len(results) == 2
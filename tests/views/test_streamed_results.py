@@ -0,0 +1,196 @@
+import json
+import xmlrpc.client
+from collections import Counter
+from http import HTTPStatus
+
+import pytest
+
+from modernrpc.exceptions import RPC_INTERNAL_ERROR
+from modernrpc.handler import RpcHandler
+from modernrpc.types import RpcRequest, RpcSuccessResult
+
+
+@pytest.fixture
+def generated_items(server, settings) -> Counter:
+    """Register generator procedures into the server, streamed 3 items at a time. Return a counter of produced items"""
+    settings.MODERNRPC_STREAMED_RESULT_CHUNK_SIZE = 3
+    counter: Counter = Counter()
+
+    @server.register_procedure
+    def generate(count: int, fail_at: int = -1):
+        for i in range(count):
+            if i == fail_at:
+                raise ValueError("generation failed")
+            counter["generate"] += 1
+            yield {"index": i, "label": f"item {i}"}
+
+    @server.register_procedure
+    async def async_generate(count: int, fail_at: int = -1):
+        for i in range(count):
+            if i == fail_at:
+                raise ValueError("generation failed")
+            counter["async_generate"] += 1
+            yield {"index": i, "label": f"item {i}"}
+
+    return counter
+
+
+def expected_items(count: int) -> list:
+    return [{"index": i, "label": f"item {i}"} for i in range(count)]
+
+
+async def read_streamed_content(response) -> bytes:
+    assert response.streaming
+    return b"".join([chunk async for chunk in response.streaming_content])
+
+
+@pytest.mark.usefixtures("all_json_serializers")
+class TestJsonRpcStreamedResults:
+    def test_streamed(self, server, jsonrpc_rf, generated_items):
+        response = server.view(jsonrpc_rf(method_name="generate", params=[10], req_id=5))
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming
+        assert generated_items["generate"] == 3
+        assert json.loads(b"".join(response.streaming_content)) == {
+            "id": 5,
+            "jsonrpc": "2.0",
+            "result": expected_items(10),
+        }
+        assert generated_items["generate"] == 10
+
+    @pytest.mark.parametrize("count", [0, 2])
+    def test_single_chunk_not_streamed(self, server, jsonrpc_rf, generated_items, count):
+        response = server.view(jsonrpc_rf(method_name="generate", params=[count], req_id=5))
+
+        assert not response.streaming
+        assert json.loads(response.content)["result"] == expected_items(count)
+
+    def test_error_in_first_chunk(self, server, jsonrpc_rf, generated_items):
+        response = server.view(jsonrpc_rf(method_name="generate", params=[10, 2], req_id=5))
+
+        assert not response.streaming
+        data = json.loads(response.content)
+        assert data["id"] == 5
+        assert data["error"]["code"] == RPC_INTERNAL_ERROR
+        assert "generation failed" in data["error"]["message"]
+
+    def test_error_while_streaming(self, server, jsonrpc_rf, generated_items):
+        response = server.view(jsonrpc_rf(method_name="generate", params=[10, 7], req_id=5))
+
+        content = b"".join(response.streaming_content)
+
+        # The response is incomplete: only the chunks produced before the error have been sent
+        with pytest.raises(ValueError, match="Expecting"):
+            json.loads(content)
+        assert json.loads(content + b"]}")["result"] == expected_items(6)
+        assert server.on_error.call_count == 1
+
+    def test_async_generator_in_sync_view(self, server, jsonrpc_rf, generated_items):
+        response = server.view(jsonrpc_rf(method_name="async_generate", params=[10], req_id=5))
+
+        assert not response.streaming
+        assert json.loads(response.content)["result"] == expected_items(10)
+
+    def test_notification(self, server, jsonrpc_rf, generated_items):
+        response = server.view(jsonrpc_rf(method_name="generate", params=[10], is_notif=True))
+
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert generated_items["generate"] == 10
+
+    def test_batch_request(self, server, jsonrpc_batch_rf, generated_items):
+        request = jsonrpc_batch_rf(requests=[("generate", (10,), False), ("generate", (10, 4), False)])
+
+        response = server.view(request)
+
+        assert not response.streaming
+        results = json.loads(response.content)
+        assert results[0]["result"] == expected_items(10)
+        assert results[1]["error"]["code"] == RPC_INTERNAL_ERROR
+
+    @pytest.mark.parametrize("method_name", ["generate", "async_generate"])
+    async def test_streamed_async(self, server, jsonrpc_rf, generated_items, method_name):
+        response = await server.async_view(jsonrpc_rf(method_name=method_name, params=[10], req_id=5))
+
+        assert response.status_code == HTTPStatus.OK
+        assert json.loads(await read_streamed_content(response)) == {
+            "id": 5,
+            "jsonrpc": "2.0",
+            "result": expected_items(10),
+        }
+
+    @pytest.mark.parametrize("method_name", ["generate", "async_generate"])
+    async def test_error_in_first_chunk_async(self, server, jsonrpc_rf, generated_items, method_name):
+        response = await server.async_view(jsonrpc_rf(method_name=method_name, params=[10, 2], req_id=5))
+
+        assert not response.streaming
+        assert json.loads(response.content)["error"]["code"] == RPC_INTERNAL_ERROR
+
+    @pytest.mark.parametrize("method_name", ["generate", "async_generate"])
+    async def test_error_while_streaming_async(self, server, jsonrpc_rf, generated_items, method_name):
+        response = await server.async_view(jsonrpc_rf(method_name=method_name, params=[10, 7], req_id=5))
+
+        content = await read_streamed_content(response)
+
+        assert json.loads(content + b"]}")["result"] == expected_items(6)
+        assert server.on_error.call_count == 1
+
+
+@pytest.mark.usefixtures("all_xml_serializers")
+class TestXmlRpcStreamedResults:
+    def test_streamed(self, server, xmlrpc_rf, generated_items):
+        response = server.view(xmlrpc_rf(method_name="generate", params=[10]))
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming
+        assert xmlrpc.client.loads(b"".join(response.streaming_content))[0][0] == expected_items(10)
+
+    def test_error_in_first_chunk(self, server, xmlrpc_rf, generated_items):
+        response = server.view(xmlrpc_rf(method_name="generate", params=[10, 2]))
+
+        assert not response.streaming
+        with pytest.raises(xmlrpc.client.Fault) as exc_info:
+            xmlrpc.client.loads(response.content)
+        assert exc_info.value.faultCode == RPC_INTERNAL_ERROR
+
+    def test_error_while_streaming(self, server, xmlrpc_rf, generated_items):
+        response = server.view(xmlrpc_rf(method_name="generate", params=[10, 7]))
+
+        content = b"".join(response.streaming_content)
+
+        assert b"</methodResponse>" not in content
+        assert server.on_error.call_count == 1
+
+    def test_multicall(self, server, xmlrpc_rf, generated_items):
+        request = xmlrpc_rf(
+            method_name="system.multicall",
+            params=[[{"methodName": "generate", "params": [10]}, {"methodName": "generate", "params": [10, 4]}]],
+        )
+
+        response = server.view(request)
+
+        assert not response.streaming
+        results = xmlrpc.client.loads(response.content)[0][0]
+        assert results[0] == [expected_items(10)]
+        assert results[1]["faultCode"] == RPC_INTERNAL_ERROR
+
+    @pytest.mark.parametrize("method_name", ["generate", "async_generate"])
+    async def test_streamed_async(self, server, xmlrpc_rf, generated_items, method_name):
+        response = await server.async_view(xmlrpc_rf(method_name=method_name, params=[10]))
+
+        assert xmlrpc.client.loads(await read_streamed_content(response))[0][0] == expected_items(10)
+
+
+def test_streaming_not_required_from_custom_handlers():
+    class CustomHandler(RpcHandler):
+        def process_request(self, request_body, context):
+            return ""
+
+        async def aprocess_request(self, request_body, context):
+            return ""
+
+    handler = CustomHandler()
+
+    assert not handler.is_streamed_result(RpcSuccessResult(request=RpcRequest("foo"), data=(item for item in range(3))))
+    with pytest.raises(NotImplementedError):
+        handler.get_streamed_envelope(RpcSuccessResult(request=RpcRequest("foo"), data=[]), "")
@@ -151,6 +151,19 @@ class TestXmlRpcAsyncMulticall:
         ]
         assert server_using_sync_or_async_multicall.on_error.call_count == 2
 
+    async def test_multicall_idempotent_calls(self, xmlrpc_rf, calls_counter, server_using_sync_or_async_multicall):
+        mc_params = [
+            [{"methodName": "async_idempotent_procedure", "params": (i % 2,)} for i in range(6)]
+            + [{"methodName": "regular_procedure", "params": (3,)}] * 2
+        ]
+        request = xmlrpc_rf(method_name="system.multicall", params=mc_params)
+
+        response = await server_using_sync_or_async_multicall.async_view(request)
+
+        assert response.status_code == HTTPStatus.OK
+        assert extract_xmlrpc_success_result(response) == [[0], [2], [0], [2], [0], [2], [6], [6]]
+        assert calls_counter == {"async_idempotent_procedure": 2, "regular_procedure": 2}
+
     async def test_multicall_missing_params(self, xmlrpc_rf, server_using_sync_or_async_multicall):
         """Ensure multicall works when a call entry has no 'params' key."""
         mc_params = [
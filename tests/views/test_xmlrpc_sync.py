@@ -1,8 +1,11 @@
 import re
+import threading
 from http import HTTPStatus
 
 import pytest
+from django.db import connections
 
+from modernrpc import RpcServer
 from modernrpc.exceptions import RPC_INTERNAL_ERROR, RPC_INVALID_PARAMS, RPC_METHOD_NOT_FOUND, RPC_PARSE_ERROR
 from tests.helpers import extract_xmlrpc_fault_data, extract_xmlrpc_success_result
 
@@ -159,6 +162,19 @@ class TestXmlRpcSyncMulticall:
         ]
         assert server_using_sync_or_async_multicall.on_error.call_count == 2
 
+    def test_multicall_idempotent_calls(self, xmlrpc_rf, calls_counter, server_using_sync_or_async_multicall):
+        mc_params = [
+            [{"methodName": "idempotent_procedure", "params": (i % 2,)} for i in range(6)]
+            + [{"methodName": "regular_procedure", "params": (3,)}] * 2
+        ]
+        request = xmlrpc_rf(method_name="system.multicall", params=mc_params)
+
+        response = server_using_sync_or_async_multicall.view(request)
+
+        assert response.status_code == HTTPStatus.OK
+        assert extract_xmlrpc_success_result(response) == [[0], [2], [0], [2], [0], [2], [6], [6]]
+        assert calls_counter == {"idempotent_procedure": 2, "regular_procedure": 2}
+
     def test_multicall_missing_params(self, xmlrpc_rf, server_using_sync_or_async_multicall):
         """Ensure multicall works when a call entry has no 'params' key."""
         mc_params = [
@@ -209,3 +225,54 @@ class TestXmlRpcSyncMulticall:
         assert code == RPC_INVALID_PARAMS
         assert message == "Invalid parameters: system.multicall first argument should be a list, dict given."
         server_using_sync_or_async_multicall.on_error.assert_called_once()
+
+
+@pytest.mark.usefixtures("all_xml_deserializers", "all_xml_serializers")
+class TestXmlRpcThreadedMulticall:
+    @pytest.fixture
+    def threaded_server(self):
+        server = RpcServer(multicall_workers=3)
+
+        barrier = threading.Barrier(3, timeout=5)
+
+        @server.register_procedure
+        def wait_for_others(value: int):
+            # Fails with BrokenBarrierError unless 3 calls are running at the same time
+            barrier.wait()
+            return [value, threading.current_thread().name]
+
+        return server
+
+    def test_calls_run_in_parallel(self, xmlrpc_rf, threaded_server):
+        mc_params = [[{"methodName": "wait_for_others", "params": (i,)} for i in range(3)]]
+        request = xmlrpc_rf(method_name="system.multicall", params=mc_params)
+
+        response = threaded_server.view(request)
+
+        results = extract_xmlrpc_success_result(response)
+        assert [result[0][0] for result in results] == [0, 1, 2]
+        assert all(result[0][1].startswith("modernrpc-multicall") for result in results)
+
+    def test_database_connections_closed(self, xmlrpc_rf, threaded_server, monkeypatch):
+        closed_in: list[str] = []
+        monkeypatch.setattr(connections, "close_all", lambda: closed_in.append(threading.current_thread().name))
+        mc_params = [[{"methodName": "wait_for_others", "params": (i,)} for i in range(3)]]
+        request = xmlrpc_rf(method_name="system.multicall", params=mc_params)
+
+        threaded_server.view(request)
+
+        assert len(closed_in) == 3
+        assert all(name.startswith("modernrpc-multicall") for name in closed_in)
+
+    @pytest.mark.parametrize(
+        ("server_kwargs", "expected_procedure"),
+        [
+            ({}, "__system_multicall"),
+            ({"async_multicall": True}, "__system_async_multicall"),
+            ({"async_multicall": False, "multicall_workers": 8}, "__system_multicall"),
+        ],
+    )
+    def test_multicall_version_per_server(self, server_kwargs, expected_procedure):
+        server = RpcServer(**server_kwargs)
+
+        assert server.procedures["system.multicall"].func_or_coro.__name__ == expected_procedure